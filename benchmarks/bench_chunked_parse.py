@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""分块并行解析基准测试：顺序状态机 vs 在样地边界处分块、多进程解析
+
+先把工作表的所有行读入内存，只比较解析部分的耗时，并核对结果与顺序解析完全一致。
+
+用法: python benchmarks/bench_chunked_parse.py [--rows 1000000] [--workers 1 2 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.chunked import parse_rows_chunked  # noqa: E402
+from plant_matrix.plots import PlotSpeciesParser, iter_sheet_rows  # noqa: E402
+from bench_streaming_read import make_workbook  # noqa: E402
+
+
+def parse_sequential(rows):
+    parser = PlotSpeciesParser()
+    for row in rows:
+        parser.feed(row)
+    return parser.to_matrix()
+
+
+def assert_same(expected, actual):
+    assert expected.species == actual.species and expected.plots == actual.plots, "物种/样地不一致"
+    for name in ('row_idx', 'col_idx', 'values', 'kinds'):
+        assert np.array_equal(getattr(expected, name), getattr(actual, name)), f"{name} 不一致"
+    assert expected.plot_counter == actual.plot_counter and expected.species_counter == actual.species_counter
+
+
+def run(n_rows, worker_counts, chunk_rows):
+    path = os.path.join(tempfile.gettempdir(), f"bench_species_{n_rows}.xlsx")
+    if not os.path.exists(path):
+        make_workbook(path, n_rows)
+
+    _, rows = iter_sheet_rows(path)
+    rows = list(rows)
+
+    start = time.perf_counter()
+    expected = parse_sequential(rows)
+    sequential_s = time.perf_counter() - start
+    print(f"{'方式':<12} {'进程数':>6} {'耗时(s)':>10} {'加速比':>8}")
+    print(f"{'顺序解析':<12} {1:>6} {sequential_s:>10.2f} {1:>8.2f}")
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        matrix = parse_rows_chunked(iter(rows), workers=workers, chunk_rows=chunk_rows)
+        elapsed = time.perf_counter() - start
+        assert_same(expected, matrix)
+        print(f"{'分块解析':<12} {workers:>6} {elapsed:>10.2f} {sequential_s / elapsed:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="测试文件行数")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="并行进程数")
+    parser.add_argument('--chunk-rows', type=int, default=50000, help="每块的目标行数")
+    args = parser.parse_args()
+    run(args.rows, args.workers, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""列式输出基准测试：xlsx（流式写出）vs Parquet / Feather / NPZ
+
+生成稀疏的物种×样地矩阵，按输出扩展名分别写出，报告写出耗时和文件大小，
+并核对 NPZ 读回的矩阵与原矩阵一致。未安装 pyarrow 时跳过 Parquet/Feather。
+
+用法: python benchmarks/bench_columnar_output.py [--scales 500x1000 2000x5000]
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.plots import plot_key  # noqa: E402
+from plant_matrix.sparse import SpeciesPlotMatrix  # noqa: E402
+from plant_matrix.writers import write_columnar, write_species_plot_matrix  # noqa: E402
+
+
+def make_matrix(n_species, n_plots, density=0.05):
+    rng = random.Random(0)
+    species = [f"物种{k:05d}" for k in range(n_species)]
+    plots = [f"{p // 100 + 1}-{p // 10 % 10 + 1}-{p % 10 + 1}" for p in range(n_plots)]
+    per_plot = max(1, int(n_species * density))
+    plot_data = {plot: {s: rng.randint(1, 20) for s in rng.sample(species, per_plot)} for plot in plots}
+    return SpeciesPlotMatrix.from_dict(plot_data, plot_sort_key=plot_key)
+
+
+def check_npz(matrix, path):
+    loaded = SpeciesPlotMatrix.load_npz(path)
+    assert loaded.species == matrix.species and loaded.plots == matrix.plots, "物种/样地不一致"
+    for name in ('row_idx', 'col_idx', 'values', 'kinds'):
+        assert np.array_equal(getattr(loaded, name), getattr(matrix, name)), f"{name} 不一致"
+
+
+def run(scales):
+    has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+    if not has_pyarrow:
+        print("未安装 pyarrow，跳过 Parquet/Feather")
+
+    print(f"{'物种x样地':>12} {'格式':<10} {'耗时(s)':>10} {'文件(MB)':>10} {'相对xlsx':>10}")
+    for n_species, n_plots in scales:
+        matrix = make_matrix(n_species, n_plots)
+        base = os.path.join(tempfile.gettempdir(), f"bench_columnar_{n_species}x{n_plots}")
+
+        cases = [('.xlsx', lambda path: write_species_plot_matrix(matrix, path, streaming=True))]
+        if has_pyarrow:
+            cases += [('.parquet', lambda path: write_columnar(matrix, path)),
+                      ('.feather', lambda path: write_columnar(matrix, path))]
+        cases.append(('.npz', lambda path: write_columnar(matrix, path)))
+
+        xlsx_s = None
+        for extension, write in cases:
+            path = base + extension
+            start = time.perf_counter()
+            write(path)
+            elapsed = time.perf_counter() - start
+            xlsx_s = xlsx_s or elapsed
+            if extension == '.npz':
+                check_npz(matrix, path)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            os.remove(path)
+            print(f"{n_species:>5}x{n_plots:<6} {extension[1:]:<10} {elapsed:>10.2f} {size_mb:>10.2f} "
+                  f"{xlsx_s / elapsed:>9.1f}x")
+
+
+def parse_scale(text):
+    n_species, n_plots = text.lower().split('x')
+    return int(n_species), int(n_plots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="列式输出基准测试")
+    parser.add_argument('--scales', nargs='+', type=parse_scale, default=[(500, 1000), (2000, 5000)])
+    args = parser.parse_args()
+    run(args.scales)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""子表格数据提取基准测试：逐行逐单元格解析 vs 按块向量化提取
+
+用法: python benchmarks/bench_extract_tables.py [--sizes 2000x200 10000x200 ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.tables import extract_table_block, locate_species_tables  # noqa: E402
+from plant_matrix.taxonomy import DEFAULT_NAMES  # noqa: E402
+from bench_locate_tables import make_frame, parse_size  # noqa: E402
+
+
+def legacy_extract(df, start_row, start_col, end_row):
+    """原 process_excel_file 中的逐行逐单元格提取"""
+    header_row = df.iloc[start_row, start_col:]
+    headers = []
+    for j in range(len(header_row)):
+        cell_val = str(header_row.iloc[j])
+        if pd.isna(header_row.iloc[j]) or cell_val == 'nan' or not cell_val.strip():
+            break
+        headers.append(cell_val)
+
+    table_data = {}
+    for i in range(start_row + 1, end_row):
+        if df.iloc[i].isna().all() or (df.iloc[i].astype(str) == '').all():
+            continue
+
+        species_cell = str(df.iloc[i, start_col])
+        if not species_cell or species_cell == 'nan' or species_cell.strip() == '':
+            continue
+
+        # 原实现为 split()[0]；物种名称规范化与 extract_table_block 相同（见 taxonomy 模块），只比较提取方式
+        species_name = DEFAULT_NAMES.table_cell(species_cell)
+
+        values = []
+        for j in range(start_col + 1, start_col + len(headers)):
+            if j >= len(df.columns):
+                values.append(0)
+                continue
+
+            cell_val = df.iloc[i, j]
+            if pd.isna(cell_val) or str(cell_val).strip() == '':
+                values.append(0)
+            else:
+                try:
+                    num_val = float(cell_val)
+                    values.append(int(num_val) if num_val.is_integer() else num_val)
+                except (ValueError, TypeError):
+                    values.append(0)
+
+        expected_values = len(headers) - 1
+        if len(values) < expected_values:
+            values.extend([0] * (expected_values - len(values)))
+        elif len(values) > expected_values:
+            values = values[:expected_values]
+
+        table_data[species_name] = values
+    return headers, table_data
+
+
+def extract_all(df, extract):
+    return [extract(df, *block) for block in locate_species_tables(df)]
+
+
+def run(sizes, legacy_limit):
+    print(f"{'规模':>12} {'原实现(s)':>12} {'按块提取(s)':>12} {'加速比':>10}")
+    for n_rows, n_cols in sizes:
+        df = make_frame(n_rows, n_cols)
+
+        start = time.perf_counter()
+        tables = extract_all(df, extract_table_block)
+        fast = time.perf_counter() - start
+
+        if n_rows * n_cols <= legacy_limit:
+            start = time.perf_counter()
+            expected = extract_all(df, legacy_extract)
+            slow = time.perf_counter() - start
+            assert tables == expected, "提取结果与原实现不一致"
+            print(f"{n_rows:>6}x{n_cols:<5} {slow:>12.3f} {fast:>12.4f} {slow / fast:>9.0f}x")
+        else:
+            print(f"{n_rows:>6}x{n_cols:<5} {'-':>12} {fast:>12.4f} {'-':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="子表格数据提取基准测试")
+    parser.add_argument('--sizes', nargs='+', type=parse_size,
+                        default=[(1000, 200), (5000, 200), (50000, 200)])
+    parser.add_argument('--legacy-limit', type=int, default=1_000_000,
+                        help="超过该单元格数时跳过原实现（太慢）")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_limit)
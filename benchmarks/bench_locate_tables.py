@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""表头定位基准测试：逐单元格 iloc 扫描 vs 向量化扫描
+
+用法: python benchmarks/bench_locate_tables.py [--sizes 2000x200 10000x200 ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.tables import locate_species_tables  # noqa: E402
+
+
+def legacy_locate(df):
+    """原 process_excel_file 中的逐单元格扫描"""
+    species_positions = []
+    for i in range(len(df)):
+        for j in range(len(df.columns)):
+            cell_value = str(df.iloc[i, j])
+            if '物种' in cell_value and cell_value.strip() == '物种':
+                species_positions.append((i, j))
+    return species_positions
+
+
+def make_frame(n_rows, n_cols, table_rows=50, seed=0):
+    """生成带有多个"物种"子表格的合成数据"""
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 5, size=(n_rows, n_cols)).astype(object)
+    data[rng.random((n_rows, n_cols)) < 0.7] = np.nan
+    for start in range(0, n_rows, table_rows):
+        data[start, 0] = '物种'
+        data[start, 1:] = [f'1-{start // table_rows + 1}-{k}' for k in range(1, n_cols)]
+        data[start + 1:start + table_rows, 0] = [f'SP{k:04d} 物种{k}' for k in range(1, min(table_rows, n_rows - start))]
+    return pd.DataFrame(data)
+
+
+def run(sizes, legacy_limit):
+    print(f"{'规模':>12} {'原实现(s)':>12} {'向量化(s)':>12} {'加速比':>10}")
+    for n_rows, n_cols in sizes:
+        df = make_frame(n_rows, n_cols)
+
+        start = time.perf_counter()
+        blocks = locate_species_tables(df)
+        fast = time.perf_counter() - start
+
+        if n_rows * n_cols <= legacy_limit:
+            start = time.perf_counter()
+            expected = legacy_locate(df)
+            slow = time.perf_counter() - start
+            assert [(r, c) for r, c, _ in blocks] == expected, "定位结果与原实现不一致"
+            print(f"{n_rows:>6}x{n_cols:<5} {slow:>12.3f} {fast:>12.4f} {slow / fast:>9.0f}x")
+        else:
+            print(f"{n_rows:>6}x{n_cols:<5} {'-':>12} {fast:>12.4f} {'-':>10}")
+
+
+def parse_size(text):
+    rows, cols = text.lower().split('x')
+    return int(rows), int(cols)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="表头定位基准测试")
+    parser.add_argument('--sizes', nargs='+', type=parse_size,
+                        default=[(2000, 200), (10000, 200), (50000, 200)])
+    parser.add_argument('--legacy-limit', type=int, default=2_000_000,
+                        help="超过该单元格数时跳过原实现（太慢）")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_limit)
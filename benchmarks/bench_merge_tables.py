@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""子表格合并基准测试：逐物种逐样方查找 vs 索引合并
+
+原算法（legacy_merge）及合并结果完全一致（列顺序、数据类型和"先出现的表格优先"规则）
+的回归测试见 tests/test_merge_tables.py。
+
+用法: python benchmarks/bench_merge_tables.py [--scales 200x500x10 ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+
+from plant_matrix.sparse import CodeBook, value_kind  # noqa: E402
+from plant_matrix.tables import merge_tables  # noqa: E402
+
+
+def make_tables(n_species, n_quadrats, n_tables, seed=0):
+    """生成子表格数据：样方在表格间有重叠，物种为各表格的随机子集"""
+    rng = np.random.default_rng(seed)
+    quadrats = [f'{i // 100 + 1}-{i // 10 % 10 + 1}-{i % 10 + 1}' for i in range(n_quadrats)]
+    species = [f'SP{k:04d}' for k in range(n_species)]
+    per_table = max(1, n_quadrats // n_tables)
+
+    all_tables_data = {}
+    for t in range(n_tables):
+        # 每个表格额外包含上一个表格的部分样方，用于检验先出现的表格优先
+        lo = max(0, t * per_table - per_table // 4)
+        headers = ['物种'] + quadrats[lo:(t + 1) * per_table]
+        chosen = rng.choice(n_species, size=max(1, n_species // 2), replace=False)
+        data = {}
+        for k in chosen:
+            values = rng.integers(0, 4, size=len(headers) - 1).astype(object)
+            values[rng.random(len(values)) < 0.1] = 0.5
+            data[species[k]] = values.tolist()
+        all_tables_data[f'Table_{t + 1}'] = {'headers': headers, 'data': data}
+    return all_tables_data
+
+
+def encode_tables(all_tables_data):
+    """{物种: 数值列表} 形式的子表格 -> merge_tables 使用的编码形式（见 encode_table_block）"""
+    species = CodeBook()
+    encoded = {}
+    for table_key, table_info in all_tables_data.items():
+        rows = list(table_info['data'].values())
+        shape = (len(rows), len(table_info['headers']) - 1)
+        encoded[table_key] = {
+            'headers': table_info['headers'],
+            'species': np.array([species.code(name) for name in table_info['data']], dtype=np.int64),
+            'values': np.array(rows, dtype=float).reshape(shape),
+            'kinds': np.array([[value_kind(value) for value in row] for row in rows], dtype=np.int8).reshape(shape),
+            'species_names': species.names,
+        }
+    return encoded
+
+
+def run(scales):
+    # 原算法与回归测试放在一起（测试模块导入本模块的数据生成函数）
+    from test_merge_tables import legacy_merge
+
+    print(f"{'物种x样方x表格':>18} {'原实现(s)':>12} {'索引合并(s)':>12} {'加速比':>10}")
+    for n_species, n_quadrats, n_tables in scales:
+        tables = make_tables(n_species, n_quadrats, n_tables)
+        encoded = encode_tables(tables)
+
+        start = time.perf_counter()
+        merge_tables(encoded)
+        fast = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy_merge(tables)
+        slow = time.perf_counter() - start
+
+        label = f"{n_species}x{n_quadrats}x{n_tables}"
+        print(f"{label:>18} {slow:>12.3f} {fast:>12.4f} {slow / fast:>9.0f}x")
+
+
+def parse_scale(text):
+    n_species, n_quadrats, n_tables = text.lower().split('x')
+    return int(n_species), int(n_quadrats), int(n_tables)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="子表格合并基准测试")
+    parser.add_argument('--scales', nargs='+', type=parse_scale,
+                        default=[(50, 100, 4), (200, 500, 10), (300, 1000, 20)])
+    args = parser.parse_args()
+    run(args.scales)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""解析缓存基准测试：首次解析（读取XML并写入缓存） vs 再次处理（直接读取缓存）
+
+用法: python benchmarks/bench_parse_cache.py [--rows 200000 500000 ...]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.cache import ParseCache  # noqa: E402
+from plant_matrix.plots import build_species_plot_matrix  # noqa: E402
+from bench_streaming_read import make_workbook  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(row_counts):
+    cache_dir = tempfile.mkdtemp(prefix="bench_parse_cache_")
+    try:
+        print(f"{'行数':>10} {'无缓存(s)':>10} {'首次+写缓存(s)':>15} {'命中缓存(s)':>12} {'缓存大小(KB)':>13}")
+        for n_rows in row_counts:
+            path = os.path.join(tempfile.gettempdir(), f"bench_species_{n_rows}.xlsx")
+            if not os.path.exists(path):
+                make_workbook(path, n_rows)
+
+            cache = ParseCache(cache_dir)
+            cache.clear()
+            expected, plain_s = timed(build_species_plot_matrix, path)
+            _, first_s = timed(build_species_plot_matrix, path, cache=cache)
+            cached, hit_s = timed(build_species_plot_matrix, path, cache=cache)
+
+            assert list(cached.rows()) == list(expected.rows()), "缓存结果与直接解析不一致"
+            print(f"{n_rows:>10} {plain_s:>10.2f} {first_s:>15.2f} {hit_s:>12.3f} "
+                  f"{cache.total_bytes() / 1024:>13.0f}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[50000, 200000], help="测试文件行数")
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""分阶段基准测试：读取 / 解析 / 合并 / 写出，两种输入格式分别计时
+
+用 synthetic.py 生成指定规模的合成工作簿（缓存在临时目录），每个阶段重复
+--repeat 次取最短耗时，并核对两种格式得到的物种×样地矩阵一致。
+
+--save 把结果保存为 JSON 基线；--baseline 与已保存的基线比较，任一阶段慢于
+基线的 (1 + --tolerance) 倍时以退出码1结束，可用于发现性能回退（CI 中与 PR 的基准提交比较）；
+--min-seconds 忽略比基线慢得不多于该秒数的阶段（毫秒级的阶段受计时误差影响）。
+
+用法: python benchmarks/bench_pipeline.py [--scales 500x2000x0.02 2000x10000x0.01] [--save 基线.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.plots import PlotSpeciesParser, iter_sheet_rows  # noqa: E402
+from plant_matrix.tables import merge_tables_sparse, read_quadrat_tables, read_sheet  # noqa: E402
+from plant_matrix.writers import write_quadrat_matrix, write_species_plot_matrix  # noqa: E402
+from synthetic import make_workbook  # noqa: E402
+
+STAGES = ('read', 'parse', 'merge', 'write')
+
+
+def blocks_pipeline(path, output_path, engine):
+    """物种数据整理工具：逐行读取 -> 状态机解析 -> 合并为矩阵 -> 写出"""
+    _, rows = iter_sheet_rows(path, engine=engine)
+    rows = list(rows)
+    yield 'read', None
+
+    parser = PlotSpeciesParser()
+    for row in rows:
+        parser.feed(row)
+    parser.flush()
+    yield 'parse', None
+
+    matrix = parser.to_matrix()
+    yield 'merge', matrix
+
+    write_species_plot_matrix(matrix, output_path, streaming=True)
+    yield 'write', matrix
+
+
+def tables_pipeline(path, output_path, engine):
+    """样方表格整合工具：读取工作表 -> 识别子表格 -> 合并为矩阵 -> 写出"""
+    df = read_sheet(path, engine=engine)
+    yield 'read', None
+
+    all_tables_data = read_quadrat_tables(df)
+    yield 'parse', None
+
+    matrix = merge_tables_sparse(all_tables_data)
+    yield 'merge', matrix
+
+    write_quadrat_matrix(matrix, output_path, streaming=True)
+    yield 'write', matrix
+
+
+PIPELINES = {'blocks': blocks_pipeline, 'tables': tables_pipeline}
+
+
+def time_pipeline(pipeline, path, engine):
+    """运行一次流水线，返回 ({阶段: 耗时}, 矩阵)"""
+    output_path = os.path.join(tempfile.gettempdir(), "bench_pipeline_output.xlsx")
+    timings = {}
+    matrix = None
+    start = time.perf_counter()
+    for stage, matrix in pipeline(path, output_path, engine):
+        now = time.perf_counter()
+        timings[stage] = now - start
+        start = now
+    os.remove(output_path)
+    return timings, matrix
+
+
+def triplets(matrix):
+    return {(species, str(plot)): float(value) for species, plot, value in matrix.triplets()}
+
+
+def run(scales, layouts, engine, repeat):
+    results = {}
+    print(f"{'物种x样地x密度':<20} {'格式':<8} " + " ".join(f"{stage + '(s)':>10}" for stage in STAGES)
+          + f" {'合计(s)':>10}")
+    for n_species, n_plots, density in scales:
+        scale = f"{n_species}x{n_plots}x{density:g}"
+        matrices = {}
+        for layout in layouts:
+            path = os.path.join(tempfile.gettempdir(), f"bench_pipeline_{layout}_{scale}.xlsx")
+            if not os.path.exists(path):
+                make_workbook(path, layout, n_species, n_plots, density=density)
+
+            best = dict.fromkeys(STAGES, float('inf'))
+            for _ in range(repeat):
+                timings, matrices[layout] = time_pipeline(PIPELINES[layout], path, engine)
+                best = {stage: min(best[stage], timings[stage]) for stage in STAGES}
+
+            results[f"{layout}/{scale}"] = best
+            print(f"{scale:<20} {layout:<8} " + " ".join(f"{best[stage]:>10.3f}" for stage in STAGES)
+                  + f" {sum(best.values()):>10.3f}")
+
+        if len(matrices) == 2:
+            assert triplets(matrices['blocks']) == triplets(matrices['tables']), f"{scale}: 两种格式的矩阵不一致"
+    return results
+
+
+def compare(results, baseline, tolerance, min_seconds=0.0):
+    """与基线比较，返回变慢超过容差（且超过 min_seconds 秒）的 [(名称, 阶段, 基线耗时, 当前耗时)]"""
+    regressions = []
+    for name, timings in results.items():
+        for stage, elapsed in timings.items():
+            expected = baseline.get(name, {}).get(stage)
+            if expected is not None and elapsed > max(expected * (1 + tolerance), expected + min_seconds):
+                regressions.append((name, stage, expected, elapsed))
+    return regressions
+
+
+def parse_scale(text):
+    n_species, n_plots, density = text.lower().split('x')
+    return int(n_species), int(n_plots), float(density)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分阶段基准测试")
+    parser.add_argument('--scales', nargs='+', type=parse_scale, default=[(500, 2000, 0.02), (2000, 10000, 0.01)],
+                        help="物种数x样地数x密度")
+    parser.add_argument('--layouts', nargs='+', choices=tuple(PIPELINES), default=list(PIPELINES))
+    parser.add_argument('--engine', default='auto', help="读取后端")
+    parser.add_argument('--repeat', type=int, default=3, help="每个阶段重复次数（取最短耗时）")
+    parser.add_argument('--save', help="保存结果为 JSON 基线")
+    parser.add_argument('--baseline', help="与已保存的 JSON 基线比较")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="允许比基线慢的比例")
+    parser.add_argument('--min-seconds', type=float, default=0.0, help="允许比基线慢的秒数（忽略计时误差）")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.layouts, args.engine, args.repeat)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds)
+        for name, stage, expected, elapsed in regressions:
+            print(f"性能回退: {name} {stage} {expected:.3f}s -> {elapsed:.3f}s")
+        if regressions:
+            sys.exit(1)
+        print("未发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""样地编号基准测试：每次排序重新拆分字符串 vs 驻留的 PlotId（缓存排序键）
+
+生成 --plots 个不同的层级编号，比较原 natural_sort_key / plot_key（每次排序都重新拆分字符串）
+与 PlotId（读取时解析一次，之后排序直接用缓存的排序键）排序 --sorts 次的耗时，
+核对排序结果一致，并演示原 plot_key 无法排序数字与非数字混合的编号。
+
+用法: python benchmarks/bench_plot_ids.py [--plots 100000] [--sorts 3]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.plotid import PlotId, plot_sort_key  # noqa: E402
+
+
+def legacy_natural_sort_key(s):
+    """原 plant_matrix_tool 中的 natural_sort_key"""
+    return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', s)]
+
+
+def legacy_plot_key(plot):
+    """原 species_processor 中的 plot_key（数字与非数字编号混在一起时排序会出错）"""
+    parts = plot.split('-')
+    try:
+        return tuple(int(part) for part in parts)
+    except ValueError:
+        return tuple(part for part in parts)
+
+
+def make_plot_ids(n_plots, seed=0):
+    """层级编号 区-样方-小样方，顺序打乱"""
+    rng = random.Random(seed)
+    ids = [f"{p // 1000 + 1}-{p // 10 % 100 + 1}-{p % 10 + 1}" for p in range(n_plots)]
+    rng.shuffle(ids)
+    return ids
+
+
+sort_key = attrgetter('sort_key')
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(n_plots, sorts):
+    ids = make_plot_ids(n_plots)
+    # 读取时每个编号都是新的字符串对象
+    texts = [''.join(plot) for plot in ids]
+    print(f"{n_plots} 个样地编号，排序 {sorts} 次（如合并多个工作表、分块结果时）")
+
+    print(f"{'方式':<28} {'解析(s)':>10} {'每次排序(s)':>12} {'合计(s)':>10}")
+    for label, key in (("natural_sort_key（原）", legacy_natural_sort_key), ("plot_key（原）", legacy_plot_key)):
+        sort_s, expected = timed(lambda: [sorted(texts, key=key) for _ in range(sorts)][-1])
+        print(f"{label:<28} {0:>10.3f} {sort_s / sorts:>12.3f} {sort_s:>10.3f}")
+
+    PlotId._interned.clear()
+    create_s, plots = timed(lambda: [PlotId(text) for text in texts])
+    sort_s, actual = timed(lambda: [sorted(plots, key=sort_key) for _ in range(sorts)][-1])
+    print(f"{'PlotId':<28} {create_s:>10.3f} {sort_s / sorts:>12.3f} {create_s + sort_s:>10.3f}")
+
+    assert actual == expected, "排序结果不一致"
+    assert all(PlotId(text) is plot for text, plot in zip(texts, plots)), "编号未驻留"
+
+    # 原 plot_key 在数字与非数字编号混合时无法排序
+    mixed = ids[:1000] + ["A1", "B-2"]
+    try:
+        sorted(mixed, key=legacy_plot_key)
+        legacy_ok = "正常"
+    except TypeError as e:
+        legacy_ok = f"TypeError: {e}"
+    sorted(mixed, key=plot_sort_key)
+    print(f"\n混合编号排序: plot_key（原）{legacy_ok}；PlotId 正常")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plots', type=int, default=100_000, help="不同样地编号的数量")
+    parser.add_argument('--sorts', type=int, default=3, help="排序次数")
+    args = parser.parse_args()
+    run(args.plots, args.sorts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""读取后端基准测试：openpyxl 只读模式 vs 直接解析工作表 XML vs calamine（已安装时）
+
+生成指定大小（约数，MB）的"物种名称 <样地>"格式工作簿，每行除物种和数量外
+附带若干列调查属性（随机小数，使文件大小接近实际数据），用各后端逐行读取全部单元格，
+核对各后端读到的行完全一致后报告耗时。
+
+用法: python benchmarks/bench_readers.py [--sizes 10 100] [--keep]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.readers import available_engines, open_sheet_rows  # noqa: E402
+
+# Excel 工作表的最大行数
+MAX_ROWS = 1_048_576
+
+
+def write_workbook(path, n_rows, extra_columns, species_per_plot=20, seed=0):
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    written = 0
+    plot = 0
+    while written < n_rows:
+        plot += 1
+        sheet.append([f"物种名称 {plot // 100 + 1}-{plot // 10 % 10 + 1}-{plot % 10 + 1}", None])
+        written += 1
+        for k in range(species_per_plot):
+            extra = [round(rng.random() * 100, 2) for _ in range(extra_columns)]
+            sheet.append([f"物种{(plot * 7 + k) % 2000:04d}", (plot + k) % 9 + 1] + extra)
+            written += 1
+    wb.save(path)
+
+
+def make_sized_workbook(path, size_mb):
+    """按样本文件的每行字节数估算行数/列数，生成约 size_mb 大小的工作簿"""
+    sample_rows = 20000
+    extra_columns = 4
+    sample_path = path + ".sample.xlsx"
+    write_workbook(sample_path, sample_rows, extra_columns)
+    bytes_per_row = os.path.getsize(sample_path) / sample_rows
+    os.remove(sample_path)
+
+    n_rows = int(size_mb * 1024 * 1024 / bytes_per_row)
+    if n_rows > MAX_ROWS - 1000:
+        # 超过工作表行数上限时增加列数
+        extra_columns = int(extra_columns * n_rows / (MAX_ROWS - 1000)) + 1
+        n_rows = MAX_ROWS - 1000
+    write_workbook(path, n_rows, extra_columns)
+    return n_rows, extra_columns
+
+
+def read_all(path, engine):
+    start = time.perf_counter()
+    _, rows = open_sheet_rows(path, engine=engine)
+    # 去掉行尾的空单元格后比较（calamine 不按表格尺寸补齐行）
+    result = []
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] is None:
+            end -= 1
+        result.append(row[:end])
+    return result, time.perf_counter() - start
+
+
+def run(sizes, keep):
+    engines = available_engines()
+    print(f"可用后端: {', '.join(engines)}")
+    print(f"{'文件(MB)':>9} {'行数':>9} {'列数':>5} " + " ".join(f"{engine + '(s)':>13}" for engine in engines))
+
+    for size_mb in sizes:
+        path = os.path.join(tempfile.gettempdir(), f"bench_readers_{size_mb}mb.xlsx")
+        if not os.path.exists(path):
+            make_sized_workbook(path, size_mb)
+
+        timings = []
+        expected = None
+        for engine in engines:
+            rows, elapsed = read_all(path, engine)
+            if expected is None:
+                expected = rows
+            else:
+                assert rows == expected, f"{engine} 读取的结果与 {engines[0]} 不一致"
+            timings.append(elapsed)
+
+        width = max(len(row) for row in expected)
+        print(f"{os.path.getsize(path) / 1024 / 1024:>9.1f} {len(expected):>9} {width:>5} "
+              + " ".join(f"{elapsed:>13.2f}" for elapsed in timings))
+        if not keep:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[10, 100], help="测试文件大小（MB，约数）")
+    parser.add_argument('--keep', action='store_true', help="保留生成的测试文件")
+    args = parser.parse_args()
+    run(args.sizes, args.keep)
+
+
+if __name__ == "__main__":
+    main()
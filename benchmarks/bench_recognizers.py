@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""样地行 / 数量单元格识别微基准：逐个 re.search 三种格式 vs 预编译的单次扫描，逐格 vs 整列转换
+
+语料为实际数据中出现过的样地行和数量单元格写法；先校验新旧实现结果一致，再给出每行耗时。
+
+用法: python benchmarks/bench_recognizers.py [--repeat 20000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.numeric import coerce_numbers, parse_count  # noqa: E402
+from plant_matrix.recognizers import find_plot_id, is_plot_header  # noqa: E402
+
+LEGACY_PLOT_PATTERNS = [
+    r'[0-9]+-[0-9]+-[0-9]+',
+    r'[0-9]+-[0-9]+',
+    r'[0-9]+'
+]
+
+HEADER_CORPUS = [
+    "物种名称\t1-1-1",
+    "物种名称 12-3-45",
+    "物种名称（样地 3-2）",
+    "物种名称 样方7",
+    "物种名称",
+    "物种名称 2023年 1-4-2",
+    "物种名称 2023-06 样地5-1-3",
+    "物种名称 1-2-3-4",
+    "物种名称 1--2-3",
+    "物种名称 No.８-1",
+    "  物种名称：10-10-10  ",
+    "物种名称 A区-3",
+]
+
+COUNT_CORPUS = [None, 3, 2.5, True, "4", " 7 ", "1.5", "3株", "约12", "1.5%", "２", "３株", "x", "",
+                "2-3", "1e3", "inf", "..", "5.5.5"]
+
+
+def legacy_find_plot_id(text):
+    """原实现：依次用三种格式 re.search"""
+    for pattern in LEGACY_PLOT_PATTERNS:
+        plot_match = re.search(pattern, str(text))
+        if plot_match:
+            return plot_match.group()
+    return None
+
+
+def legacy_parse_count(value):
+    """原实现：float 转换失败后用未编译的正则提取数字"""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value))
+    except (ValueError, TypeError):
+        num_str = re.search(r'[\d.]+', str(value))
+        if num_str:
+            try:
+                return float(num_str.group())
+            except ValueError:
+                return 0
+        return 0
+
+
+def check():
+    for text in HEADER_CORPUS:
+        assert is_plot_header(text)
+        assert find_plot_id(text) == legacy_find_plot_id(text), text
+    for value in COUNT_CORPUS:
+        expected, actual = legacy_parse_count(value), parse_count(value)
+        assert repr(expected) == repr(actual) and type(expected) is type(actual), value
+
+
+def per_call_ns(func, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in corpus:
+            func(value)
+    return (time.perf_counter() - start) / (repeat * len(corpus)) * 1e9
+
+
+def run(repeat):
+    check()
+    print("识别结果与原实现一致")
+    print(f"{'语料':>10} {'条数':>6} {'原实现(ns/行)':>14} {'预编译(ns/行)':>14} {'加速比':>8}")
+    for name, corpus, legacy, current in [
+        ("样地行", HEADER_CORPUS, legacy_find_plot_id, find_plot_id),
+        ("数量单元格", COUNT_CORPUS, legacy_parse_count, parse_count),
+    ]:
+        legacy_ns = per_call_ns(legacy, corpus, repeat)
+        current_ns = per_call_ns(current, corpus, repeat)
+        print(f"{name:>10} {len(corpus):>6} {legacy_ns:>14.0f} {current_ns:>14.0f} "
+              f"{legacy_ns / current_ns:>7.1f}x")
+
+    # 整列转换：纯数值列与含文本的列
+    for name, column in [
+        ("纯数值列", [1, 2.5, None, 3] * 25000),
+        ("混合列", COUNT_CORPUS * 5000),
+        # 实际数据中常见：大部分为数字，少量 "3株" 之类的文本
+        ("少量文本列", ([1, 2.5, None, 3] * 4 + ["3株", "约12"]) * 5000),
+    ]:
+        start = time.perf_counter()
+        expected = [legacy_parse_count(value) for value in column]
+        legacy_ns = (time.perf_counter() - start) / len(column) * 1e9
+
+        start = time.perf_counter()
+        numbers, _ = coerce_numbers(column)
+        current_ns = (time.perf_counter() - start) / len(column) * 1e9
+
+        assert numbers.tolist() == [float(value) for value in expected], name
+        print(f"{name:>10} {len(column):>6} {legacy_ns:>14.0f} {current_ns:>14.0f} "
+              f"{legacy_ns / current_ns:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000, help="每条语料重复次数")
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""物种字典编码的内存基准测试
+
+用 synthetic.py 的调查记录（默认 2000 个物种 × 10000 个样地）比较各阶段数据结构
+保留的内存（tracemalloc）：
+
+- 子表格：{物种名称: 数值列表}（extract_table_block）vs 共用物种字典的整数编码 + 数组（read_quadrat_tables）；
+- 样地记录：{样地: {物种: 数量}} 嵌套字典 vs 整数编码的稀疏累加器（PlotSpeciesParser）；
+- 结果矩阵：稠密的 物种×样地 数组 vs 稀疏矩阵（物种名称只在导出时使用）。
+
+并核对两种子表格形式合并后的矩阵一致。
+
+用法: python benchmarks/bench_species_encoding.py [--species 2000] [--plots 10000] [--density 0.01]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plant_matrix.plots import PlotSpeciesParser  # noqa: E402
+from plant_matrix.tables import extract_table_block, locate_species_tables, merge_tables_sparse  # noqa: E402
+from plant_matrix.tables import read_quadrat_tables  # noqa: E402
+from bench_merge_tables import encode_tables  # noqa: E402
+from synthetic import make_survey  # noqa: E402
+
+
+def retained_mb(build):
+    """build() 返回的对象保留的内存（MB）及该对象"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024 / 1024, result
+
+
+def tables_frame(plots, records, plots_per_table=10):
+    """与 synthetic.write_tables_workbook 相同布局的 DataFrame（读取工作表后的形式）"""
+    rows = []
+    for start in range(0, len(plots), plots_per_table):
+        table_plots = plots[start:start + plots_per_table]
+        counts = {}
+        for col, plot in enumerate(table_plots):
+            for name, count in records[plot]:
+                row = counts.setdefault(name, [''] * len(table_plots))
+                row[col] = (row[col] or 0) + count
+        rows.append(["物种", *table_plots])
+        rows.extend([name, *counts[name]] for name in sorted(counts))
+        rows.append([])
+    return pd.DataFrame(rows).fillna('')
+
+
+def legacy_tables(df):
+    """原来的子表格形式：每个表格一个 {物种名称: 数值列表}"""
+    all_tables_data = {}
+    for idx, block in enumerate(locate_species_tables(df)):
+        headers, table_data = extract_table_block(df, *block)
+        if table_data:
+            all_tables_data[f'Table_{idx + 1}'] = {'headers': headers, 'data': table_data}
+    return all_tables_data
+
+
+def legacy_plot_data(plots, records):
+    """原来的样地记录形式：{样地: {物种: 数量}}，重复记录的数量相加"""
+    plot_data = {}
+    for plot in plots:
+        species_counts = plot_data.setdefault(''.join(plot), {})
+        for name, count in records[plot]:
+            # 读取工作表时每个单元格都是新的字符串对象
+            name = ''.join(name)
+            species_counts[name] = species_counts.get(name, 0) + count
+    return plot_data
+
+
+def parse_records(plots, records):
+    parser = PlotSpeciesParser()
+    for plot in plots:
+        parser.feed((f"物种名称 {plot}", None))
+        for name, count in records[plot]:
+            parser.feed((''.join(name), count))
+    parser.flush()
+    return parser
+
+
+def report(label, legacy_mb, encoded_mb):
+    print(f"{label:<16} {legacy_mb:>12.1f} {encoded_mb:>12.1f} {legacy_mb - encoded_mb:>12.1f} "
+          f"{legacy_mb / encoded_mb:>8.1f}x")
+
+
+def run(n_species, n_plots, density):
+    species, plots, records = make_survey(n_species, n_plots, density=density)
+    n_records = sum(len(plot_records) for plot_records in records.values())
+    print(f"{n_species} 个物种 × {n_plots} 个样地，{n_records} 条记录")
+    print(f"{'阶段':<16} {'原形式(MB)':>12} {'编码后(MB)':>12} {'节省(MB)':>12} {'倍数':>9}")
+
+    df = tables_frame(plots, records)
+    legacy_mb, legacy = retained_mb(lambda: legacy_tables(df))
+    encoded_mb, encoded = retained_mb(lambda: read_quadrat_tables(df))
+    report("子表格", legacy_mb, encoded_mb)
+
+    expected = merge_tables_sparse(encode_tables(legacy))
+    matrix = merge_tables_sparse(encoded)
+    assert expected.species == matrix.species and expected.plots == matrix.plots, "物种/样地不一致"
+    assert np.array_equal(expected.values, matrix.values), "合并结果不一致"
+    del legacy, encoded
+
+    legacy_mb, _ = retained_mb(lambda: legacy_plot_data(plots, records))
+    encoded_mb, parser = retained_mb(lambda: parse_records(plots, records))
+    report("样地记录", legacy_mb, encoded_mb)
+
+    dense_mb, _ = retained_mb(lambda: matrix.to_dense())
+    sparse_mb, _ = retained_mb(lambda: parser.to_matrix())
+    report("结果矩阵", dense_mb, sparse_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="物种字典编码的内存基准测试")
+    parser.add_argument('--species', type=int, default=2000, help="物种数")
+    parser.add_argument('--plots', type=int, default=10000, help="样地数")
+    parser.add_argument('--density', type=float, default=0.01, help="每个样地出现的物种比例")
+    args = parser.parse_args()
+    run(args.species, args.plots, args.density)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""图形界面启动基准测试：导入耗时分解和首个窗口出现的时间
+
+1. 在子进程中用 ``python -X importtime`` 导入界面模块，解析输出，按顶层包汇总
+   导入耗时，并列出最慢的模块，检查启动时是否加载了 pandas/numpy/openpyxl；
+2. 在子进程中运行界面的 main()，窗口第一次完成绘制后立即退出，记录从启动
+   解释器到窗口出现的时间（没有图形显示环境时跳过）。
+
+每项测试运行 --repeat 次取最短时间。--max-import-ms 设置导入耗时上限，超过时
+以退出码1结束，可用于发现启动性能回退。
+
+用法: python benchmarks/bench_startup.py [--modules plant_matrix_tool species_processor] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动时不应加载的重量级依赖
+HEAVY_PACKAGES = ('pandas', 'numpy', 'openpyxl')
+
+# 窗口完成第一次绘制后输出 "ready" 并退出，不进入事件循环
+WINDOW_CHILD_CODE = '''
+import sys, tkinter
+sys.path.insert(0, sys.argv[1])
+
+def mainloop(self, n=0):
+    self.update()
+    print("ready", flush=True)
+    self.destroy()
+
+tkinter.Tk.mainloop = mainloop
+module = __import__(sys.argv[2])
+module.main()
+'''
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 的输出，返回 [(模块名, 自身耗时us, 累计耗时us, 层级)]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return entries
+
+
+def measure_imports(module):
+    """导入一次界面模块，返回 (总耗时ms, [(模块名, 自身us, 累计us, 层级)])"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    )
+    entries = parse_importtime(result.stderr)
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+    return total_us / 1000, entries
+
+
+def summarize_packages(entries):
+    """按顶层包汇总各模块的自身耗时，返回 [(包名, 耗时ms)]，从慢到快"""
+    totals = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(((package, us / 1000) for package, us in totals.items()), key=lambda item: -item[1])
+
+
+def measure_window(module):
+    """运行界面 main()，返回从启动子进程到窗口出现的耗时（秒），无法显示窗口时返回 None"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", WINDOW_CHILD_CODE, ROOT, module],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0 or "ready" not in result.stdout:
+        return None
+    return elapsed
+
+
+def report(module, repeat, top):
+    import_runs = [measure_imports(module) for _ in range(repeat)]
+    import_ms, entries = min(import_runs, key=lambda run: run[0])
+    loaded = {name.split(".")[0] for name, _, _, _ in entries}
+
+    print(f"== {module}")
+    print(f"导入耗时: {import_ms:.1f} ms（{len(entries)} 个模块）")
+    heavy = [package for package in HEAVY_PACKAGES if package in loaded]
+    print(f"启动时加载的重量级依赖: {', '.join(heavy) if heavy else '无'}")
+
+    print(f"\n{'顶层包':<28} {'耗时(ms)':>10}")
+    for package, ms in summarize_packages(entries)[:top]:
+        print(f"{package:<28} {ms:>10.1f}")
+
+    print(f"\n{'最慢的模块':<40} {'自身(ms)':>10} {'累计(ms)':>10}")
+    for name, self_us, cumulative_us, _ in sorted(entries, key=lambda entry: -entry[1])[:top]:
+        print(f"{name:<40} {self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}")
+
+    window_runs = [measure_window(module) for _ in range(repeat)]
+    if None in window_runs:
+        print("\n首个窗口出现: 跳过（没有可用的图形显示环境）")
+    else:
+        print(f"\n首个窗口出现: {min(window_runs) * 1000:.0f} ms（含解释器启动）")
+    print()
+    return import_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图形界面启动基准测试")
+    parser.add_argument('--modules', nargs='+', default=['plant_matrix_tool', 'species_processor'],
+                        help="界面模块")
+    parser.add_argument('--repeat', type=int, default=3, help="重复次数（取最短时间）")
+    parser.add_argument('--top', type=int, default=10, help="列出最慢的包/模块数")
+    parser.add_argument('--max-import-ms', type=float, help="导入耗时上限（毫秒），超过时退出码为1")
+    args = parser.parse_args()
+
+    slow = []
+    for module in args.modules:
+        import_ms = report(module, args.repeat, args.top)
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            slow.append((module, import_ms))
+
+    for module, import_ms in slow:
+        print(f"启动性能回退: {module} 导入耗时 {import_ms:.1f} ms > {args.max_import_ms:.1f} ms")
+    if slow:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
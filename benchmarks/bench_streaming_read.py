@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""读取内存基准测试：openpyxl 完整模式 vs 只读流式模式
+
+生成"物种名称 <样地>"格式的合成工作簿，分别在独立子进程中以两种模式
+读取并逐行遍历，报告耗时和峰值内存（RSS）。
+
+用法: python benchmarks/bench_streaming_read.py [--rows 500000] [--keep]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+CHILD_CODE = '''
+import resource, sys, time
+import openpyxl
+start = time.perf_counter()
+wb = openpyxl.load_workbook(sys.argv[1], read_only=sys.argv[2] == "1", data_only=True)
+rows = sum(1 for _ in wb.active.iter_rows(values_only=True))
+wb.close()
+elapsed = time.perf_counter() - start
+print(rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def make_workbook(path, n_rows, species_per_plot=20):
+    """生成合成的样地-物种数据工作簿"""
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    written = 0
+    plot = 0
+    while written < n_rows:
+        plot += 1
+        sheet.append([f"物种名称 {plot // 100 + 1}-{plot // 10 % 10 + 1}-{plot % 10 + 1}", None])
+        written += 1
+        for k in range(species_per_plot):
+            sheet.append([f"物种{(plot * 7 + k) % 2000:04d}", (plot + k) % 9 + 1])
+            written += 1
+    wb.save(path)
+
+
+def measure(path, streaming):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, path, "1" if streaming else "0"],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    rows, elapsed, max_rss_kb = int(output[0]), float(output[1]), int(output[2])
+    return rows, elapsed, max_rss_kb / 1024
+
+
+def run(n_rows, keep):
+    path = os.path.join(tempfile.gettempdir(), f"bench_species_{n_rows}.xlsx")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        make_workbook(path, n_rows)
+        print(f"生成 {n_rows} 行测试文件: {path} ({time.perf_counter() - start:.1f}s, "
+              f"{os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+    print(f"{'模式':<10} {'行数':>10} {'耗时(s)':>10} {'峰值内存(MB)':>14}")
+    for label, streaming in (("完整模式", False), ("流式模式", True)):
+        rows, elapsed, peak_mb = measure(path, streaming)
+        print(f"{label:<10} {rows:>10} {elapsed:>10.2f} {peak_mb:>14.1f}")
+
+    if not keep:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="openpyxl 读取内存基准测试")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--keep', action='store_true', help="保留生成的测试文件")
+    args = parser.parse_args()
+    run(args.rows, args.keep)
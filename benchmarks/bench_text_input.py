@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""文本输入基准测试：CSV/TSV（及 gzip 压缩）逐行读取并解析为物种×样地矩阵
+
+生成"物种名称\\t<样地>"格式的制表符分隔文本，分别在独立子进程中解析，
+报告耗时、每秒行数和峰值内存（RSS）。文本逐行读取，读取部分的内存与文件大小无关，
+峰值内存主要来自累积的 (物种, 样地, 数量) 记录。
+
+用法: python benchmarks/bench_text_input.py [--rows 1000000 5000000] [--gzip] [--keep]
+"""
+import argparse
+import gzip
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_CODE = '''
+import resource, sys, time
+sys.path.insert(0, sys.argv[2])
+from plant_matrix.plots import build_species_plot_matrix
+start = time.perf_counter()
+matrix = build_species_plot_matrix(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(matrix.species_counter, matrix.nnz, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def make_text(path, n_rows, species_per_plot=20):
+    """生成合成的样地-物种制表符分隔文本（.gz 结尾时压缩）"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8', newline='') as f:
+        written = 0
+        plot = 0
+        while written < n_rows:
+            plot += 1
+            f.write(f"物种名称\t{plot // 100 + 1}-{plot // 10 % 10 + 1}-{plot % 10 + 1}\n")
+            written += 1
+            for k in range(species_per_plot):
+                f.write(f"物种{(plot * 7 + k) % 2000:04d}\t{(plot + k) % 9 + 1}\n")
+                written += 1
+
+
+def measure(path):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, path, REPO_ROOT],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    records, nnz, elapsed, max_rss_kb = int(output[0]), int(output[1]), float(output[2]), int(output[3])
+    return records, nnz, elapsed, max_rss_kb / 1024
+
+
+def run(row_counts, compress, keep):
+    print(f"{'行数':>10} {'文件(MB)':>9} {'记录数':>10} {'非零格':>8} {'耗时(s)':>8} {'行/秒':>10} {'峰值内存(MB)':>13}")
+    for n_rows in row_counts:
+        path = os.path.join(tempfile.gettempdir(), f"bench_species_{n_rows}.tsv" + (".gz" if compress else ""))
+        if not os.path.exists(path):
+            make_text(path, n_rows)
+
+        records, nnz, elapsed, peak_mb = measure(path)
+        print(f"{n_rows:>10} {os.path.getsize(path) / 1024 / 1024:>9.1f} {records:>10} {nnz:>8} "
+              f"{elapsed:>8.2f} {n_rows / elapsed:>10.0f} {peak_mb:>13.1f}")
+        if not keep:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000], help="测试文件行数")
+    parser.add_argument('--gzip', action='store_true', help="测试 gzip 压缩的文本")
+    parser.add_argument('--keep', action='store_true', help="保留生成的测试文件")
+    args = parser.parse_args()
+    run(args.rows, args.gzip, args.keep)
+
+
+if __name__ == "__main__":
+    main()
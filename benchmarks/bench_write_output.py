@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""结果写出基准测试：openpyxl 完整模式 vs 只写流式模式
+
+在独立子进程中生成稀疏的物种×样地矩阵并分别以两种模式写出，报告耗时、
+峰值内存（RSS）和文件大小。
+
+用法: python benchmarks/bench_write_output.py [--scales 500x1000 2000x5000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_CODE = '''
+import resource, sys, time, random
+sys.path.insert(0, sys.argv[1])
+from plant_matrix.plots import plot_key
+from plant_matrix.sparse import SpeciesPlotMatrix
+from plant_matrix.writers import write_species_plot_matrix
+
+n_species, n_plots, streaming, path = int(sys.argv[2]), int(sys.argv[3]), sys.argv[4] == "1", sys.argv[5]
+rng = random.Random(0)
+species = [f"物种{k:05d}" for k in range(n_species)]
+plots = [f"{p // 100 + 1}-{p // 10 % 10 + 1}-{p % 10 + 1}" for p in range(n_plots)]
+plot_data = {plot: {s: rng.randint(1, 20) for s in rng.sample(species, max(1, n_species // 20))} for plot in plots}
+matrix = SpeciesPlotMatrix.from_dict(plot_data, plot_sort_key=plot_key)
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+write_species_plot_matrix(matrix, path, streaming=streaming)
+elapsed = time.perf_counter() - start
+print(elapsed, base_rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def measure(n_species, n_plots, streaming):
+    path = os.path.join(tempfile.gettempdir(), f"bench_write_{n_species}x{n_plots}_{int(streaming)}.xlsx")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, ROOT, str(n_species), str(n_plots), "1" if streaming else "0", path],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    elapsed, base_kb, peak_kb = float(output[0]), int(output[1]), int(output[2])
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    os.remove(path)
+    return elapsed, (peak_kb - base_kb) / 1024, size_mb
+
+
+def run(scales):
+    print(f"{'物种x样地':>12} {'模式':<8} {'耗时(s)':>10} {'写出内存增量(MB)':>18} {'文件(MB)':>10}")
+    for n_species, n_plots in scales:
+        for label, streaming in (("完整模式", False), ("流式模式", True)):
+            elapsed, extra_mb, size_mb = measure(n_species, n_plots, streaming)
+            print(f"{n_species:>5}x{n_plots:<6} {label:<8} {elapsed:>10.2f} {extra_mb:>18.1f} {size_mb:>10.1f}")
+
+
+def parse_scale(text):
+    n_species, n_plots = text.lower().split('x')
+    return int(n_species), int(n_plots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="结果写出基准测试")
+    parser.add_argument('--scales', nargs='+', type=parse_scale, default=[(500, 1000), (1000, 2000)])
+    args = parser.parse_args()
+    run(args.scales)
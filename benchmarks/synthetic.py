@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""合成外业调查工作簿生成器，输出两种输入格式：
+
+- blocks：每个样地一行"物种名称 <样地>"，其后为 (物种, 数量) 行（物种数据整理工具）；
+- tables：多个"物种"子表格上下排列，表头为样方编号，每行一个物种（样方表格整合工具）。
+
+规模由物种数、样地数和密度（每个样地出现的物种占全部物种的比例）决定，
+相同参数和随机种子生成的文件完全相同。也可作为脚本单独使用：
+
+用法: python benchmarks/synthetic.py blocks 输出.xlsx [--species 2000 --plots 10000 --density 0.01]
+"""
+import argparse
+import random
+
+import openpyxl
+
+
+def make_plot_ids(n_plots):
+    """层级样地编号 1-1-1、1-1-2 …（每级10个）"""
+    return [f"{p // 100 + 1}-{p // 10 % 10 + 1}-{p % 10 + 1}" for p in range(n_plots)]
+
+
+def make_survey(n_species, n_plots, density=0.01, duplicate_rate=0.02, seed=0):
+    """生成调查记录，返回 (物种列表, 样地列表, {样地: [(物种, 数量), ...]})
+
+    每个样地约有 n_species * density 个物种；duplicate_rate 比例的记录在同一样地中
+    重复出现一次（物种数据整理工具会把数量相加）。
+    """
+    rng = random.Random(seed)
+    species = [f"物种{k:05d}" for k in range(n_species)]
+    plots = make_plot_ids(n_plots)
+    per_plot = max(1, round(n_species * density))
+
+    records = {}
+    for plot in plots:
+        plot_records = [(name, rng.randint(1, 20)) for name in rng.sample(species, min(per_plot, n_species))]
+        plot_records += [(name, rng.randint(1, 5)) for name, _ in plot_records if rng.random() < duplicate_rate]
+        records[plot] = plot_records
+    return species, plots, records
+
+
+def _split_sheets(plots, n_sheets):
+    size = -(-len(plots) // n_sheets)
+    return [plots[k:k + size] for k in range(0, len(plots), size)]
+
+
+def write_blocks_workbook(path, plots, records, n_sheets=1):
+    """写出"物种名称 <样地>"格式的工作簿（样地平均分到 n_sheets 个工作表）"""
+    wb = openpyxl.Workbook(write_only=True)
+    for index, sheet_plots in enumerate(_split_sheets(plots, n_sheets), 1):
+        sheet = wb.create_sheet(f"样区{index}")
+        for plot in sheet_plots:
+            sheet.append([f"物种名称 {plot}", None])
+            for name, count in records[plot]:
+                sheet.append([name, count])
+    wb.save(path)
+
+
+def write_tables_workbook(path, plots, records, plots_per_table=10, n_sheets=1):
+    """写出多个"物种"子表格的工作簿
+
+    每 plots_per_table 个样方组成一个子表格，子表格之间空一行；表格只包含在其样方中
+    出现过的物种，未出现的格子留空。同一样方中的重复记录数量相加。
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for index, sheet_plots in enumerate(_split_sheets(plots, n_sheets), 1):
+        sheet = wb.create_sheet(f"样区{index}")
+        for start in range(0, len(sheet_plots), plots_per_table):
+            table_plots = sheet_plots[start:start + plots_per_table]
+            counts = {}
+            for col, plot in enumerate(table_plots):
+                for name, count in records[plot]:
+                    row = counts.setdefault(name, [None] * len(table_plots))
+                    row[col] = (row[col] or 0) + count
+
+            sheet.append(["物种", *table_plots])
+            for name in sorted(counts):
+                sheet.append([name, *counts[name]])
+            sheet.append([])
+    wb.save(path)
+
+
+def make_workbook(path, layout, n_species, n_plots, density=0.01, n_sheets=1, seed=0):
+    """生成指定格式（'blocks' 或 'tables'）的合成工作簿，返回记录条数"""
+    _, plots, records = make_survey(n_species, n_plots, density=density, seed=seed)
+    if layout == 'blocks':
+        write_blocks_workbook(path, plots, records, n_sheets=n_sheets)
+    else:
+        write_tables_workbook(path, plots, records, n_sheets=n_sheets)
+    return sum(len(plot_records) for plot_records in records.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成外业调查工作簿生成器")
+    parser.add_argument('layout', choices=('blocks', 'tables'), help="blocks: 物种名称 <样地>；tables: 多个物种子表格")
+    parser.add_argument('output', help="输出的 .xlsx 文件")
+    parser.add_argument('--species', type=int, default=2000, help="物种数")
+    parser.add_argument('--plots', type=int, default=10000, help="样地数")
+    parser.add_argument('--density', type=float, default=0.01, help="每个样地出现的物种比例")
+    parser.add_argument('--sheets', type=int, default=1, help="工作表数（样地平均分配）")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+    n_records = make_workbook(args.output, args.layout, args.species, args.plots, density=args.density,
+                              n_sheets=args.sheets, seed=args.seed)
+    print(f"已生成 {args.output}: {args.species} 个物种, {args.plots} 个样地, {n_records} 条记录")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 # build.py
+import argparse
 import platform
 import subprocess
 import sys
 import os
 import shutil
+import time
 from pathlib import Path
 
 # 全局常量定义
@@ -11,6 +13,39 @@ APP_NAME = "SpeciesProcessor"
 FINAL_APP_NAME = "物种数据整理工具"
 MAIN_SCRIPT = "plant_matrix_tool.py"
 
+# 程序中用不到的子模块、测试包及可选依赖（会被 pandas 等的打包钩子顺带收集）
+FAST_START_EXCLUDES = [
+    'pandas.tests', 'numpy.tests', 'numpy.f2py', 'numpy.distutils', 'openpyxl.tests',
+    'matplotlib', 'scipy', 'IPython', 'jinja2', 'pytest', 'sqlalchemy', 'numba',
+    'tkinter.test', 'lib2to3', 'pydoc_data', 'setuptools', 'pkg_resources',
+]
+
+# 打包配置
+BUILD_PROFILES = {
+    # 单文件：分发方便，但每次启动都要把全部依赖解压到临时目录
+    'default': {
+        'layout': "--onefile",
+        'distpath': "dist",
+        'excludes': [],
+        'optimize': None,
+        'strip': False,
+        'openpyxl_data': True,
+    },
+    # 快速启动：目录形式（启动时不解压），排除用不到的模块，字节码优化（去除文档字符串），
+    # 去除二进制文件的调试符号（Windows 上不适用）；需要 PyInstaller 6.0 及以上版本
+    'fast-start': {
+        'layout': "--onedir",
+        'distpath': os.path.join("dist", "fast-start"),
+        'excludes': FAST_START_EXCLUDES,
+        'optimize': 2,
+        'strip': True,
+        'openpyxl_data': False,
+    },
+}
+
+# 设置该环境变量时，界面在窗口第一次绘制完成后立即退出（用于测量启动时间）
+STARTUP_EXIT_ENV = "PLANT_MATRIX_EXIT_AFTER_START"
+
 
 def check_requirements():
     """检查必要的依赖"""
@@ -75,16 +110,18 @@ def check_pyinstaller_available():
     return False
 
 
-def build_app():
-    """构建应用程序"""
+def build_app(profile_name="default"):
+    """按指定配置构建应用程序"""
     if not check_requirements():
         return False
 
     if not check_pyinstaller_available():
         return False
 
+    profile = BUILD_PROFILES[profile_name]
     current_os = platform.system()
     print(f"检测到操作系统: {current_os}")
+    print(f"打包配置: {profile_name}")
 
     # 尝试不同的 PyInstaller 调用方式
     pyinstaller_commands = [
@@ -94,10 +131,10 @@ def build_app():
 
     # 基本参数
     base_args = [
-        "--onefile",
+        profile['layout'],
         "--windowed",
         "--name", APP_NAME,
-        "--distpath", "dist",
+        "--distpath", profile['distpath'],
         "--workpath", "build",
         "--specpath", ".",
         "--clean",
@@ -117,11 +154,22 @@ def build_app():
         'pkg_resources.py2_warn'
     ]
 
+    if 'pkg_resources' in profile['excludes']:
+        hidden_imports.remove('pkg_resources.py2_warn')
+
     for imp in hidden_imports:
         base_args.extend(["--hidden-import", imp])
 
+    # 排除的模块、字节码优化和去除调试符号
+    for module in profile['excludes']:
+        base_args.extend(["--exclude-module", module])
+    if profile['optimize'] is not None:
+        base_args.extend(["--optimize", str(profile['optimize'])])
+    if profile['strip'] and current_os != "Windows":
+        base_args.append("--strip")
+
     # 添加数据文件
-    data_files = get_data_files()
+    data_files = get_data_files() if profile['openpyxl_data'] else []
     for src, dest in data_files:
         sep = ";" if current_os == "Windows" else ":"
         base_args.extend(["--add-data", f"{src}{sep}{dest}"])
@@ -167,7 +215,7 @@ def build_app():
             traceback.print_exc()
 
     if success:
-        return rename_final_app(current_os)
+        return rename_final_app(current_os, profile['distpath'])
     else:
         print("\n所有打包尝试都失败了，请检查:")
         print("1. PyInstaller 是否正确安装")
@@ -209,12 +257,21 @@ def get_data_files():
     return data_files
 
 
-def rename_final_app(current_os):
-    """重命名最终应用程序"""
+def rename_final_app(current_os, distpath="dist"):
+    """重命名最终应用程序（目录形式的打包结果重命名整个目录）"""
     try:
+        onedir_path = Path(distpath) / APP_NAME
+        if current_os != "Darwin" and onedir_path.is_dir():
+            final_path = Path(distpath) / FINAL_APP_NAME
+            if final_path.exists():
+                shutil.rmtree(final_path)
+            onedir_path.rename(final_path)
+            print(f"✅ 重命名为: {final_path}")
+            return True
+
         if current_os == "Darwin":
-            original_path = Path("dist") / f"{APP_NAME}.app"
-            final_path = Path("dist") / f"{FINAL_APP_NAME}.app"
+            original_path = Path(distpath) / f"{APP_NAME}.app"
+            final_path = Path(distpath) / f"{FINAL_APP_NAME}.app"
 
             if original_path.exists():
                 if final_path.exists():
@@ -227,8 +284,8 @@ def rename_final_app(current_os):
                 return False
 
         elif current_os == "Windows":
-            original_path = Path("dist") / f"{APP_NAME}.exe"
-            final_path = Path("dist") / f"{FINAL_APP_NAME}.exe"
+            original_path = Path(distpath) / f"{APP_NAME}.exe"
+            final_path = Path(distpath) / f"{FINAL_APP_NAME}.exe"
 
             if original_path.exists():
                 if final_path.exists():
@@ -241,8 +298,8 @@ def rename_final_app(current_os):
                 return False
 
         else:
-            original_path = Path("dist") / APP_NAME
-            final_path = Path("dist") / FINAL_APP_NAME
+            original_path = Path(distpath) / APP_NAME
+            final_path = Path(distpath) / FINAL_APP_NAME
 
             if original_path.exists():
                 if final_path.exists():
@@ -283,44 +340,128 @@ def clean_build():
                 print(f"⚠️ 清理 {item} 失败: {str(e)}")
 
 
-def show_final_instructions(current_os):
+def show_final_instructions(current_os, distpath="dist"):
     """显示最终使用说明"""
     print("\n" + "=" * 50)
     print("🎉 打包完成！")
     print("=" * 50)
 
     if current_os == "Darwin":
-        app_path = Path("dist") / f"{FINAL_APP_NAME}.app"
+        app_path = Path(distpath) / f"{FINAL_APP_NAME}.app"
         if app_path.exists():
-            print(f"macOS 用户:")
+            print("macOS 用户:")
             print(f"  1. 将 '{app_path.name}' 拖到'应用程序'文件夹")
-            print(f"  2. 在Launchpad或应用程序文件夹中打开")
+            print("  2. 在Launchpad或应用程序文件夹中打开")
         else:
             print("⚠️ 警告: 未找到生成的应用程序文件")
 
+    elif current_os == "Windows" and (Path(distpath) / FINAL_APP_NAME).is_dir():
+        app_path = Path(distpath) / FINAL_APP_NAME
+        print("Windows 用户:")
+        print(f"  1. 将整个 '{app_path.name}' 文件夹发送给用户（可压缩为zip）")
+        print(f"  2. 用户双击其中的 {APP_NAME}.exe 即可运行，无需安装Python")
+
     elif current_os == "Windows":
-        exe_path = Path("dist") / f"{FINAL_APP_NAME}.exe"
+        exe_path = Path(distpath) / f"{FINAL_APP_NAME}.exe"
         if exe_path.exists():
             size_mb = os.path.getsize(exe_path) / (1024 * 1024)
-            print(f"Windows 用户:")
+            print("Windows 用户:")
             print(f"  1. 将 '{exe_path.name}' 发送给用户")
-            print(f"  2. 用户双击即可运行，无需安装Python")
+            print("  2. 用户双击即可运行，无需安装Python")
             print(f"  文件大小: {size_mb:.1f} MB")
         else:
             print("⚠️ 警告: 未找到生成的应用程序文件")
 
     else:
-        app_path = Path("dist") / FINAL_APP_NAME
+        app_path = Path(distpath) / FINAL_APP_NAME
         if app_path.exists():
-            print(f"Linux/其他系统用户:")
+            print("Linux/其他系统用户:")
             print(f"  可执行文件: {app_path}")
             print(f"  可能需要执行: chmod +x {app_path}")
 
-    print(f"\n输出目录: {Path('dist').absolute()}")
+    print(f"\n输出目录: {Path(distpath).absolute()}")
+    print("=" * 50)
+
+
+def bundle_size(path):
+    """打包结果的总大小（字节），目录形式为目录中所有文件之和"""
+    path = Path(path)
+    if path.is_dir():
+        return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+    return path.stat().st_size
+
+
+def drop_page_cache():
+    """清空系统文件缓存（Linux，需要root权限），成功时返回 True"""
+    try:
+        subprocess.run(["sync"], check=True)
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def launch_time(executable):
+    """启动程序直到窗口第一次绘制完成后退出，返回耗时（秒），无法启动时返回 None"""
+    env = dict(os.environ, **{STARTUP_EXIT_ENV: "1"})
+    start = time.perf_counter()
+    try:
+        result = subprocess.run([str(executable)], env=env, capture_output=True, timeout=120)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    elapsed = time.perf_counter() - start
+    return elapsed if result.returncode == 0 else None
+
+
+def measure_launch(executable, drop_caches=False, warm_runs=3):
+    """测量启动时间，返回 (冷启动秒数, 热启动秒数, 是否清空了文件缓存)
+
+    drop_caches=True 时先清空系统文件缓存（会影响整台机器，需要root权限），
+    之后的第一次启动为冷启动；否则（或清空失败时）不测量冷启动，冷启动为 None。
+    热启动取几次启动的最短时间，任一次启动失败时为 None。
+    """
+    dropped = drop_caches and drop_page_cache()
+    cold = launch_time(executable) if dropped else None
+    warm = [launch_time(executable) for _ in range(warm_runs)]
+    warm = None if (dropped and cold is None) or None in warm else min(warm)
+    return cold, warm, dropped
+
+
+def report_profiles(results):
+    """输出各打包配置的大小和启动时间"""
+    print("\n" + "=" * 50)
+    print(f"{'配置':<12} {'大小(MB)':>10} {'冷启动(s)':>10} {'热启动(s)':>10}")
+    notes = set()
+    for profile_name, size, cold, warm, dropped in results:
+        cold_text = f"{cold:.2f}" if cold is not None else "-"
+        warm_text = f"{warm:.2f}" if warm is not None else "-"
+        print(f"{profile_name:<12} {size / (1024 * 1024):>10.1f} {cold_text:>10} {warm_text:>10}")
+        if warm is None:
+            notes.add("启动失败或没有图形显示环境，未测量启动时间")
+        elif not dropped:
+            notes.add("未清空文件缓存（需要 --drop-caches 和root权限）：只测量了热启动")
+    for note in sorted(notes):
+        print(f"⚠️ {note}")
     print("=" * 50)
 
 
+def linux_app_paths(distpath):
+    """Linux 上的 (打包结果, 可执行文件)：单文件时两者相同，目录形式时可执行文件在目录中"""
+    bundle = Path(distpath) / FINAL_APP_NAME
+    executable = bundle / APP_NAME if bundle.is_dir() else bundle
+    return bundle, executable
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="打包应用程序")
+    parser.add_argument("--profile", choices=[*BUILD_PROFILES, "all"], default="default",
+                        help="打包配置：default 为单文件；fast-start 为快速启动的目录形式；all 依次构建全部配置")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="测量冷启动前清空系统文件缓存（Linux，需要root权限，影响整台机器）")
+    args = parser.parse_args()
+    profile_names = list(BUILD_PROFILES) if args.profile == "all" else [args.profile]
+
     print("开始打包应用程序...")
     print(f"应用程序名称: {FINAL_APP_NAME}")
     print(f"主脚本: {MAIN_SCRIPT}")
@@ -331,11 +472,22 @@ if __name__ == "__main__":
     # 清理旧构建
     clean_build()
 
-    # 开始打包
-    success = build_app()
+    results = []
+    for profile_name in profile_names:
+        # 开始打包
+        success = build_app(profile_name)
+        distpath = BUILD_PROFILES[profile_name]['distpath']
 
-    if success:
-        show_final_instructions(current_os)
-    else:
-        print("\n❌ 打包失败，请检查上面的错误信息")
-        sys.exit(1)
\ No newline at end of file
+        if success:
+            show_final_instructions(current_os, distpath)
+        else:
+            print("\n❌ 打包失败，请检查上面的错误信息")
+            sys.exit(1)
+
+        # Linux 上测量打包结果的大小和启动时间
+        if current_os == "Linux":
+            bundle, executable = linux_app_paths(distpath)
+            results.append((profile_name, bundle_size(bundle), *measure_launch(executable, args.drop_caches)))
+
+    if results:
+        report_profiles(results)
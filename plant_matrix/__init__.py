@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""植物样方数据整理核心库（不依赖界面）
+
+- merge_quadrat_tables(path): 合并Excel中的多个"物种"子表格，返回物种×样方 DataFrame
+- build_species_plot_matrix(path): 解析"物种名称 <样地>"数据块，返回物种×样地矩阵
+- SpeciesNames.load(path): 读取同义名表，作为 species_names 参数传入，物种名称读取时转换为接受名
+
+命令行用法见 ``python -m plant_matrix --help``。
+"""
+from .errors import DataFormatError, ProcessingCancelled
+
+__all__ = [
+    'DataFormatError',
+    'ProcessingCancelled',
+    'PlotSpeciesParser',
+    'SpeciesPlotMatrix',
+    'SpeciesNames',
+    'build_species_plot_matrix',
+    'write_species_plot_matrix',
+    'merge_quadrat_tables',
+]
+
+
+# 其余公开接口所在的子模块。按需导入：numpy/openpyxl/pandas 只在第一次使用时加载，
+# 使图形界面可以先显示窗口；表格合并依赖 pandas，只安装 openpyxl 的环境也能使用样地矩阵功能
+_LAZY_ATTRIBUTES = {
+    'PlotSpeciesParser': 'plots',
+    'build_species_plot_matrix': 'plots',
+    'SpeciesPlotMatrix': 'sparse',
+    'SpeciesNames': 'taxonomy',
+    'write_species_plot_matrix': 'writers',
+    'merge_quadrat_tables': 'tables',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        from importlib import import_module
+
+        value = getattr(import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""批量合并：对目录/通配符匹配到的多个样方工作簿并行执行子表格合并
+
+每个文件在独立进程中完成 读取 -> 识别 -> 合并 -> 写出，主进程只收集摘要，
+吞吐量随CPU核数近似线性增长。
+"""
+import csv
+import glob
+import os
+import time
+from functools import partial
+
+from .tasks import ignore, run_tasks, worker_count
+
+OUTPUT_SUFFIX = "_植物矩阵"
+
+REPORT_FIELDS = ['file', 'status', 'tables', 'species', 'quadrats',
+                 'read_s', 'parse_s', 'write_s', 'total_s', 'output', 'error']
+
+
+def collect_input_files(source):
+    """目录 -> 其中所有Excel文件；否则按通配符匹配。跳过已生成的结果文件和Excel临时文件"""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "*.xlsx")) + glob.glob(os.path.join(source, "*.xls"))
+    else:
+        paths = glob.glob(source)
+
+    return sorted(
+        path for path in paths
+        if os.path.isfile(path)
+        and OUTPUT_SUFFIX not in os.path.basename(path)
+        and not os.path.basename(path).startswith("~$")
+    )
+
+
+def merge_one_file(file_path, streaming_output=False, use_cache=False, engine='auto', output_extension='.xlsx',
+                   species_names=None):
+    """合并单个工作簿并写出结果，返回该文件的摘要（在工作进程中执行）
+
+    use_cache=True 时命中缓存的文件读取和解析耗时记为0；species_names 为同义名表（taxonomy.SpeciesNames）。
+    """
+    from .cache import ParseCache
+    from .tables import default_output_path, merge_tables_sparse, read_quadrat_tables, read_sheet
+    from .taxonomy import cache_kind
+    from .writers import is_columnar_output, write_columnar, write_quadrat_matrix
+
+    summary = {'file': file_path, 'status': 'ok', 'error': ''}
+    start = time.perf_counter()
+    try:
+        cache = ParseCache() if use_cache else None
+        kind = cache_kind('tables', species_names)
+        cached = cache.load(file_path, kind) if cache is not None else None
+        if cached:
+            matrix, meta = cached
+            n_tables = meta['tables']
+            read_done = parse_done = time.perf_counter()
+        else:
+            df = read_sheet(file_path, engine=engine)
+            read_done = time.perf_counter()
+
+            all_tables_data = read_quadrat_tables(df, species_names=species_names)
+            matrix = merge_tables_sparse(all_tables_data)
+            n_tables = len(all_tables_data)
+            if cache is not None:
+                cache.store(file_path, kind, matrix, {'tables': n_tables})
+            parse_done = time.perf_counter()
+
+        output_path = default_output_path(file_path, extension=output_extension)
+        if is_columnar_output(output_path):
+            write_columnar(matrix, output_path)
+        else:
+            write_quadrat_matrix(matrix, output_path, streaming=streaming_output)
+        write_done = time.perf_counter()
+
+        summary.update(
+            tables=n_tables,
+            species=len(matrix.species),
+            quadrats=len(matrix.plots),
+            read_s=read_done - start,
+            parse_s=parse_done - read_done,
+            write_s=write_done - parse_done,
+            output=output_path,
+        )
+    except Exception as e:
+        summary.update(status='failed', error=str(e))
+
+    summary['total_s'] = time.perf_counter() - start
+    return summary
+
+
+def merge_files(file_paths, workers=None, log=None, streaming_output=False, use_cache=False, engine='auto',
+                output_extension='.xlsx', species_names=None):
+    """用进程池并行合并多个工作簿，按输入顺序返回每个文件的摘要
+
+    workers 默认为CPU核数；workers=1 时在当前进程中顺序执行。
+    """
+    log = log or ignore
+    merge_one = partial(merge_one_file, streaming_output=streaming_output, use_cache=use_cache, engine=engine,
+                        output_extension=output_extension, species_names=species_names)
+    workers = worker_count(workers, len(file_paths))
+
+    results = [None] * len(file_paths)
+    for k, summary in run_tasks(merge_one, file_paths, workers):
+        results[k] = summary
+        log(format_summary_line(summary))
+    return results
+
+
+def format_summary_line(summary):
+    name = os.path.basename(summary['file'])
+    if summary['status'] != 'ok':
+        return f"✗ {name}: {summary['error']}"
+    return (f"✓ {name}: {summary['tables']} 个表格, {summary['species']} 个物种, "
+            f"{summary['quadrats']} 个样方, {summary['total_s']:.2f}s")
+
+
+def format_report(results, elapsed=None):
+    """生成批量处理的文字报告"""
+    lines = [f"{'文件':<30} {'状态':<6} {'表格':>5} {'物种':>6} {'样方':>6} "
+             f"{'读取(s)':>8} {'解析(s)':>8} {'写出(s)':>8} {'合计(s)':>8}"]
+    for summary in results:
+        name = os.path.basename(summary['file'])
+        if summary['status'] != 'ok':
+            lines.append(f"{name:<30} {'失败':<6} {summary['error']}")
+            continue
+        lines.append(f"{name:<30} {'成功':<6} {summary['tables']:>5} {summary['species']:>6} "
+                     f"{summary['quadrats']:>6} {summary['read_s']:>8.2f} {summary['parse_s']:>8.2f} "
+                     f"{summary['write_s']:>8.2f} {summary['total_s']:>8.2f}")
+
+    succeeded = sum(1 for summary in results if summary['status'] == 'ok')
+    busy = sum(summary['total_s'] for summary in results)
+    lines.append(f"共 {len(results)} 个文件，成功 {succeeded} 个，失败 {len(results) - succeeded} 个，"
+                 f"累计处理时间 {busy:.2f}s")
+    if elapsed:
+        lines.append(f"实际耗时 {elapsed:.2f}s，平均并行度 {busy / elapsed:.1f}")
+    return "\n".join(lines)
+
+
+def write_report_csv(results, report_path):
+    """将每个文件的摘要写入CSV报告"""
+    with open(report_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""解析结果的磁盘缓存
+
+同一工作簿重复处理时（例如只调整输出选项），直接读取上次解析得到的稀疏矩阵，
+跳过 openpyxl 的 XML 解析。
+
+- 缓存项以 npz 格式保存（不使用 pickle），按文件内容哈希命名，相同内容的文件共用缓存；
+- 文件路径+大小+修改时间 -> 内容哈希 的对应关系单独记录，文件未变化时无需重新计算哈希；
+- 缓存总大小超过上限时，按最近使用时间淘汰最旧的缓存项（LRU）。
+
+缓存目录默认为 ~/.cache/plant_matrix（Windows 为 %LOCALAPPDATA%\\plant_matrix），
+可用环境变量 PLANT_MATRIX_CACHE_DIR 指定。缓存默认关闭（命令行 --cache，图形界面中勾选后使用）。
+numpy 只在读写缓存项时导入，图形界面显示缓存位置时不加载。
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+# 缓存格式或解析逻辑变化时递增，旧缓存自动失效
+CACHE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def default_cache_dir():
+    if os.environ.get('PLANT_MATRIX_CACHE_DIR'):
+        return os.environ['PLANT_MATRIX_CACHE_DIR']
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return os.path.join(os.environ['LOCALAPPDATA'], 'plant_matrix')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'plant_matrix')
+
+
+def describe_cache(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """缓存位置和大小上限的说明（显示在界面中）"""
+    return f"{cache_dir or default_cache_dir()}，最多 {max_bytes // (1024 * 1024)} MB"
+
+
+def file_content_hash(file_path):
+    """文件内容的 BLAKE2b 哈希"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """按工作簿内容缓存解析得到的 SpeciesPlotMatrix
+
+    kind 区分不同的解析方式（如 'tables' 为子表格合并，'plots' 为样地数据整理；
+    使用同义名表时附加其指纹，见 taxonomy.cache_kind），
+    meta 为随矩阵一起保存的少量统计信息（可 JSON 序列化的 dict）。
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def content_hash(self, file_path):
+        """由 路径+大小+修改时间 查找内容哈希，找不到时计算并记录"""
+        stat = os.stat(file_path)
+        stat_key = hashlib.sha1(
+            f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8')
+        ).hexdigest()
+        stat_path = os.path.join(self.cache_dir, f"stat-{stat_key}")
+
+        if os.path.exists(stat_path):
+            with open(stat_path, encoding='ascii') as f:
+                content_hash = f.read().strip()
+            if content_hash:
+                _touch(stat_path)
+                return content_hash
+
+        content_hash = file_content_hash(file_path)
+        self._write_atomic(stat_path, content_hash.encode('ascii'))
+        return content_hash
+
+    def entry_path(self, file_path, kind):
+        return os.path.join(self.cache_dir, f"{kind}-{self.content_hash(file_path)}-v{CACHE_VERSION}.npz")
+
+    def load(self, file_path, kind):
+        """返回 (矩阵, meta)，没有缓存或缓存损坏时返回 None"""
+        import numpy as np
+
+        from .sparse import SpeciesPlotMatrix
+
+        if not os.path.isdir(self.cache_dir):
+            return None
+
+        entry_path = self.entry_path(file_path, kind)
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            with np.load(entry_path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                matrix = SpeciesPlotMatrix(
+                    species=data['species'].tolist(),
+                    plots=data['plots'].tolist(),
+                    rows=data['rows'],
+                    cols=data['cols'],
+                    values=data['values'],
+                    kinds=data['kinds'],
+                    plot_counter=meta.pop('plot_counter', 0),
+                    species_counter=meta.pop('species_counter', 0),
+                )
+        except (OSError, ValueError, KeyError):
+            # 缓存损坏：删除后按未命中处理
+            _remove(entry_path)
+            return None
+
+        _touch(entry_path)
+        return matrix, meta
+
+    def store(self, file_path, kind, matrix, meta=None):
+        """保存矩阵，然后按总大小淘汰最旧的缓存项"""
+        import numpy as np
+
+        meta = dict(meta or {}, plot_counter=matrix.plot_counter, species_counter=matrix.species_counter)
+        entry_path = self.entry_path(file_path, kind)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    species=np.array(matrix.species, dtype=str),
+                    plots=np.array(matrix.plots, dtype=str),
+                    rows=matrix.row_idx,
+                    cols=matrix.col_idx,
+                    values=matrix.values,
+                    kinds=matrix.kinds,
+                    meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                )
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            _remove(temp_path)
+            raise
+
+        self.evict()
+
+    def entries(self):
+        """所有缓存文件，按最近使用时间从旧到新排列：[(路径, 大小, 使用时间)]"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """淘汰最久未使用的缓存项，直到总大小不超过上限"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            _remove(path)
+
+    def _write_atomic(self, path, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+
+def _touch(path):
+    # 记录最近使用时间，用于 LRU 淘汰
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""单个大工作表的分块并行解析
+
+"物种名称 <样地>" 格式的数据由相互独立的样地数据块组成，分两步处理：
+
+1. 顺序读取工作表（只保留前两列），同时记录每个开始新样地的行的位置；
+2. 在样地边界处把行切分为若干块，用进程池并行解析，再按块的顺序合并各块的记录。
+
+合并时各块的记录按原来的行顺序首尾相接，重复记录的数量按相同的顺序相加，
+结果与顺序解析（PlotSpeciesParser 逐行处理整张工作表）完全一致。
+读取工作表仍是顺序的，并行的是识别样地/物种和转换数量的部分。
+"""
+from functools import partial
+
+import numpy as np
+
+from .errors import DataFormatError, ProcessingCancelled
+from .plots import PlotSpeciesParser, plot_key, starts_plot
+from .sparse import CodeBook, SparseAccumulator
+from .tasks import ignore, run_tasks, worker_count
+
+# 每块的目标行数（块只在样地边界处切分，实际行数略多）
+CHUNK_ROWS = 50000
+
+
+def index_plot_rows(rows, should_stop=None):
+    """第一步：读取所有行（只保留前两列），返回 (行列表, 开始新样地的行下标列表)"""
+    kept = []
+    starts = []
+    for row in rows:
+        if should_stop and should_stop():
+            raise ProcessingCancelled()
+        # 解析只用到前两列
+        row = row[:2]
+        if starts_plot(row):
+            starts.append(len(kept))
+        kept.append(row)
+    return kept, starts
+
+
+def split_blocks(starts, n_rows, chunk_rows=CHUNK_ROWS):
+    """在样地边界处把 [第一个样地, n_rows) 切分为约 chunk_rows 行一块的 [(起始行, 结束行)]"""
+    blocks = []
+    begin = starts[0]
+    for start in starts[1:]:
+        if start - begin >= chunk_rows:
+            blocks.append((begin, start))
+            begin = start
+    blocks.append((begin, n_rows))
+    return blocks
+
+
+def parse_block(rows, species_names=None):
+    """第二步：解析一块行（在工作进程中执行），返回 (累加器, 样地数, 物种记录数, 最后的样地)"""
+    parser = PlotSpeciesParser(species_names=species_names)
+    for row in rows:
+        parser.feed(row)
+    parser.flush()
+    return parser.accumulator, parser.plot_counter, parser.species_counter, parser.current_plot
+
+
+def reduce_blocks(results):
+    """按块的顺序合并各块的记录，生成物种×样地矩阵"""
+    species = CodeBook()
+    plots = CodeBook()
+    arrays = []
+    for accumulator, _, _, _ in results:
+        # 块内编码 -> 全局编码
+        species_map = np.array([species.code(name) for name in accumulator.species.names], dtype=np.int64)
+        plot_map = np.array([plots.code(name) for name in accumulator.plots.names], dtype=np.int64)
+        species_codes, plot_codes, values, kinds = accumulator.arrays()
+        arrays.append((species_map[species_codes], plot_map[plot_codes], values, kinds))
+
+    species_codes, plot_codes, values, kinds = (np.concatenate(column) for column in zip(*arrays))
+    accumulator = SparseAccumulator.from_arrays(species.names, plots.names, species_codes, plot_codes, values, kinds)
+    return accumulator.to_matrix(
+        plot_sort_key=plot_key,
+        plot_counter=sum(result[1] for result in results),
+        species_counter=sum(result[2] for result in results),
+    )
+
+
+def parse_rows_chunked(rows, workers=None, chunk_rows=CHUNK_ROWS, log=None, progress=None, should_stop=None,
+                       species_names=None):
+    """分块并行解析逐行的样地/物种记录，返回物种×样地矩阵
+
+    workers 默认为CPU核数；workers=1 时在当前进程中依次解析各块。
+    species_names 为同义名表（taxonomy.SpeciesNames），随每块传给工作进程。
+    """
+    log = log or ignore
+    progress = progress or ignore
+
+    rows, starts = index_plot_rows(rows, should_stop)
+    if not starts:
+        raise DataFormatError("未找到样地数据！请检查文件格式")
+
+    blocks = split_blocks(starts, len(rows), chunk_rows)
+    workers = worker_count(workers, len(blocks))
+    log(f"共 {len(rows)} 行、{len(starts)} 个样地，分为 {len(blocks)} 块，使用 {workers} 个进程解析")
+    progress(50, "正在解析数据...")
+
+    results = [None] * len(blocks)
+    chunks = (rows[begin:end] for begin, end in blocks)
+    parse = partial(parse_block, species_names=species_names)
+    for done, (k, result) in enumerate(run_tasks(parse, chunks, workers, should_stop), 1):
+        results[k] = result
+        progress(50 + int(30 * done / len(blocks)), f"已解析 {done}/{len(blocks)} 块")
+
+    # 与顺序解析一致：最后一个样地编号为空时视为没有样地数据
+    if not results[-1][3]:
+        raise DataFormatError("未找到样地数据！请检查文件格式")
+    return reduce_blocks(results)
+
+
+def build_species_plot_matrix_chunked(input_path, streaming=True, workers=None, chunk_rows=CHUNK_ROWS, log=None,
+                                      progress=None, should_stop=None, engine='auto', species_names=None):
+    """读取Excel文件（活动工作表），分块并行解析后生成物种×样地矩阵"""
+    from .plots import iter_sheet_rows
+
+    log = log or ignore
+    progress = progress or ignore
+
+    log("读取Excel文件...")
+    progress(5, "正在读取文件...")
+    _, rows = iter_sheet_rows(input_path, streaming=streaming, engine=engine)
+    try:
+        return parse_rows_chunked(rows, workers=workers, chunk_rows=chunk_rows, log=log, progress=progress,
+                                  should_stop=should_stop, species_names=species_names)
+    finally:
+        rows.close()
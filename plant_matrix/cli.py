@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""命令行入口：python -m plant_matrix <命令> ...
+
+  merge    合并Excel中的多个"物种"子表格（同 plant_matrix_tool 界面）
+  batch    对目录/通配符中的所有工作簿并行执行 merge
+  species  整理"物种名称 <样地>"数据并生成物种×样地矩阵（同 SpeciesProcessorApp 界面）
+"""
+import argparse
+import os
+import sys
+import time
+
+from .errors import DataFormatError
+
+CACHE_HELP = "缓存解析结果，同一文件再次处理时跳过读取（缓存目录可用 PLANT_MATRIX_CACHE_DIR 指定）"
+
+SYNONYMS_HELP = ("同义名表（Excel/CSV/TSV）：每行第一列为接受名，其余各列为同义名或代码，"
+                 "物种名称读取时转换为接受名（并拆分\"代码 名称\"）")
+
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'feather', 'npz')
+FORMAT_HELP = "输出格式（parquet/feather 需要安装 pyarrow，npz 为稀疏三元组及物种/样地名称）"
+
+ENGINE_CHOICES = ('auto', 'openpyxl', 'xml', 'calamine', 'text')
+ENGINE_HELP = ("读取后端：openpyxl 只读模式、xml 直接解析工作表XML、calamine（需安装 python-calamine）、"
+               "text（CSV/TSV 文本，可为 .gz）；默认 auto：.csv/.tsv/.txt(.gz) 用 text，"
+               "流式读取 .xlsx 用 xml，其余（--full-load、.xls）已安装 calamine 时用 calamine，否则用 openpyxl")
+
+
+def run_merge(args):
+    from .tables import build_merged_matrix, default_output_path
+    from .writers import is_columnar_output, write_columnar, write_long_format, write_quadrat_matrix
+
+    log = print if args.verbose else None
+    species_names = _species_names(args)
+    if args.all_sheets:
+        from .sheets import build_merged_matrix_sheets
+        matrix, _ = build_merged_matrix_sheets(args.input, sheet_prefix=args.sheet_prefix, workers=args.jobs, log=log,
+                                               engine=args.engine, species_names=species_names)
+    else:
+        matrix, _ = build_merged_matrix(args.input, log=log, cache=_parse_cache(args), engine=args.engine,
+                                        species_names=species_names)
+
+    if args.output and is_columnar_output(args.output):
+        output_path = args.output
+        write_columnar(matrix, output_path, long_format=args.long, log=log)
+    elif args.long:
+        output_path = args.output or default_output_path(args.input, suffix="_植物矩阵_长表")
+        write_long_format(matrix, output_path)
+    else:
+        output_path = args.output or default_output_path(args.input)
+        write_quadrat_matrix(matrix, output_path, streaming=args.streaming_output)
+
+    print(f"{os.path.basename(args.input)}: {len(matrix.species)} 个物种, "
+          f"{len(matrix.plots)} 个样方 -> {output_path}")
+
+
+def run_batch(args):
+    from .batch import collect_input_files, format_report, merge_files, write_report_csv
+
+    file_paths = collect_input_files(args.source)
+    if not file_paths:
+        raise DataFormatError(f"未找到Excel文件: {args.source}")
+
+    species_names = _species_names(args)
+    print(f"共 {len(file_paths)} 个文件，使用 {args.jobs or os.cpu_count()} 个进程")
+    start = time.perf_counter()
+    results = merge_files(file_paths, workers=args.jobs, log=print, streaming_output=args.streaming_output,
+                          use_cache=args.cache, engine=args.engine, output_extension='.' + args.format,
+                          species_names=species_names)
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(format_report(results, elapsed=elapsed))
+    if args.report:
+        write_report_csv(results, args.report)
+        print(f"报告已保存到: {args.report}")
+
+    if any(summary['status'] != 'ok' for summary in results):
+        sys.exit(1)
+
+
+def run_species(args):
+    from .incremental import checkpoint_path_for
+    from .plots import build_species_plot_matrix
+    from .writers import is_columnar_output, write_columnar, write_long_format, write_species_plot_matrix
+
+    if args.output:
+        output_path = args.output
+    else:
+        # data.csv.gz -> data_矩阵.xlsx
+        base = args.input[:-3] if args.input.lower().endswith('.gz') else args.input
+        output_path = os.path.splitext(base)[0] + ("_长表.xlsx" if args.long else "_矩阵.xlsx")
+
+    log = print if args.verbose else None
+    species_names = _species_names(args)
+    if args.all_sheets:
+        from .sheets import build_species_plot_matrix_sheets
+        matrix = build_species_plot_matrix_sheets(args.input, sheet_prefix=args.sheet_prefix, workers=args.jobs,
+                                                  streaming=not args.full_load, log=log, engine=args.engine,
+                                                  species_names=species_names)
+    else:
+        matrix = build_species_plot_matrix(args.input, streaming=not args.full_load, log=log,
+                                           verbose=args.verbose > 1, cache=_parse_cache(args),
+                                           checkpoint_path=checkpoint_path_for(output_path) if args.incremental else None,
+                                           workers=args.jobs or 1, engine=args.engine, species_names=species_names)
+
+    if is_columnar_output(output_path):
+        write_columnar(matrix, output_path, long_format=args.long, log=log)
+    elif args.long:
+        write_long_format(matrix, output_path, log=log)
+    else:
+        write_species_plot_matrix(matrix, output_path, log=log, auto_width=not args.no_auto_width,
+                                  streaming=args.streaming_output)
+
+    print(f"{os.path.basename(args.input)}: {len(matrix.species)} 个物种, "
+          f"{len(matrix.plots)} 个样地, {matrix.species_counter} 条记录 -> {output_path}")
+
+
+def _parse_cache(args):
+    if not args.cache:
+        return None
+    from .cache import ParseCache
+    return ParseCache()
+
+
+def _species_names(args):
+    if not args.synonyms:
+        return None
+    from .taxonomy import SpeciesNames
+    species_names = SpeciesNames.load(args.synonyms)
+    print(f"同义名表: {len(species_names.synonyms)} 个写法 -> "
+          f"{len(set(species_names.synonyms.values()))} 个接受名")
+    return species_names
+
+
+def _add_sheet_arguments(parser, jobs_help="与 --all-sheets 一起使用：并行进程数（默认为CPU核数）"):
+    parser.add_argument('--all-sheets', action='store_true',
+                        help="处理所有工作表（每个工作表在独立进程中解析后合并；不使用缓存/增量处理）")
+    parser.add_argument('--sheet-prefix', action='store_true',
+                        help="与 --all-sheets 一起使用：样地编号加工作表名前缀（<工作表>:<样地>）")
+    parser.add_argument('-j', '--jobs', type=int, help=jobs_help)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m plant_matrix", description="植物样方数据整理工具（命令行）")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    merge = subparsers.add_parser('merge', help="合并多个'物种'子表格为物种×样方矩阵")
+    merge.add_argument('input', help="输入Excel文件（或 CSV/TSV 文本）")
+    merge.add_argument('-o', '--output', help="输出文件（默认为 <输入文件>_植物矩阵.xlsx，不覆盖已有文件）；"
+                                              "扩展名为 .parquet/.feather/.arrow/.npz 时输出对应的列式格式")
+    merge.add_argument('--streaming-output', action='store_true', help="使用只写模式流式写出（低内存）")
+    merge.add_argument('--long', action='store_true',
+                       help="输出长表（物种, 样方, 数量），只包含非零记录；输出文件为 .csv 时写出CSV")
+    merge.add_argument('--cache', action='store_true', help=CACHE_HELP)
+    merge.add_argument('--engine', choices=ENGINE_CHOICES, default='auto', help=ENGINE_HELP)
+    merge.add_argument('--synonyms', metavar='FILE', help=SYNONYMS_HELP)
+    _add_sheet_arguments(merge)
+    merge.add_argument('-v', '--verbose', action='store_true', help="输出详细处理日志")
+    merge.set_defaults(func=run_merge)
+
+    batch = subparsers.add_parser('batch', help="并行合并目录中的所有样方工作簿")
+    batch.add_argument('source', help="输入目录，或通配符（如 'data/*.xlsx'）")
+    batch.add_argument('-j', '--jobs', type=int, help="并行进程数（默认为CPU核数）")
+    batch.add_argument('--report', help="将每个文件的耗时/摘要写入CSV报告")
+    batch.add_argument('--streaming-output', action='store_true', help="使用只写模式流式写出（低内存）")
+    batch.add_argument('--cache', action='store_true', help=CACHE_HELP)
+    batch.add_argument('--engine', choices=ENGINE_CHOICES, default='auto', help=ENGINE_HELP)
+    batch.add_argument('--format', choices=OUTPUT_FORMATS, default='xlsx', help=FORMAT_HELP)
+    batch.add_argument('--synonyms', metavar='FILE', help=SYNONYMS_HELP)
+    batch.set_defaults(func=run_batch)
+
+    species = subparsers.add_parser('species', help="由'物种名称 <样地>'数据生成物种×样地矩阵")
+    species.add_argument('input', help="输入Excel文件，或 CSV/TSV 文本（.csv/.tsv/.txt，可为 .gz 压缩，逐行流式读取）")
+    species.add_argument('-o', '--output', help="输出文件（默认为 <输入文件>_矩阵.xlsx）；"
+                                                "扩展名为 .parquet/.feather/.arrow/.npz 时输出对应的列式格式")
+    species.add_argument('--full-load', action='store_true', help="完整加载工作簿（默认流式只读读取）")
+    species.add_argument('--no-auto-width', action='store_true', help="不自动调整列宽（样地很多时可加快写出）")
+    species.add_argument('--streaming-output', action='store_true', help="使用只写模式流式写出（低内存）")
+    species.add_argument('--long', action='store_true',
+                         help="输出长表（物种, 样地, 数量），只包含有记录的格子；输出文件为 .csv 时写出CSV")
+    species.add_argument('--cache', action='store_true', help=CACHE_HELP)
+    species.add_argument('--engine', choices=ENGINE_CHOICES, default='auto',
+                         help=ENGINE_HELP + "；--full-load 时为 openpyxl 完整模式")
+    species.add_argument('--synonyms', metavar='FILE', help=SYNONYMS_HELP)
+    _add_sheet_arguments(species, jobs_help="并行进程数：与 --all-sheets 一起使用时按工作表并行（默认为CPU核数），"
+                                            "否则大于1时在样地边界处分块并行解析单个工作表（默认顺序解析）")
+    species.add_argument('--incremental', action='store_true',
+                         help="增量处理：在输出文件旁保存检查点，下次只解析新追加的行（已有的行变化时自动完整重建）")
+    species.add_argument('-v', '--verbose', action='count', default=0,
+                         help="输出处理日志（-vv 同时输出逐条物种记录）")
+    species.set_defaults(func=run_species)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except (DataFormatError, ImportError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
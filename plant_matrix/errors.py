@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""解析过程中的异常类型"""
+
+
+class DataFormatError(ValueError):
+    """输入文件格式不符合要求（如找不到表头或样地数据）"""
+
+
+class ProcessingCancelled(Exception):
+    """处理过程被调用方中断"""
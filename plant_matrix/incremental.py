@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""增量处理：在输出文件旁保存解析进度（检查点），下次只解析新追加的行
+
+检查点记录已处理的行数、解析器状态（当前样地、计数器、稀疏累加器）以及
+每 BLOCK_ROWS 行一个的内容哈希。再次处理同一文件时：
+
+- 已处理的行只计算哈希、不再解析，全部一致时从检查点继续解析新增的行；
+- 任一数据块哈希不一致（已有的行被修改/删除）时，放弃检查点完整重新处理。
+
+注意 openpyxl 仍需顺序读取整张工作表，省去的是解析和累加的工作。
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .sparse import SparseAccumulator
+
+CHECKPOINT_VERSION = 3
+
+BLOCK_ROWS = 1000
+
+
+class CheckpointMismatch(Exception):
+    """已处理的行与检查点不一致，需要完整重新处理"""
+
+
+def checkpoint_path_for(output_path):
+    """检查点文件路径：与输出文件同目录、同名"""
+    return os.path.splitext(output_path)[0] + ".checkpoint.npz"
+
+
+class BlockHasher:
+    """按行计算内容哈希，每 BLOCK_ROWS 行为一块"""
+
+    def __init__(self, block_rows=BLOCK_ROWS):
+        self.block_rows = block_rows
+        self.rows = 0
+        self.digests = []
+        self._current = hashlib.blake2b(digest_size=16)
+
+    def update(self, row):
+        # 末尾的空单元格不计入（重新保存工作簿后行宽可能变化）
+        end = len(row)
+        while end and row[end - 1] is None:
+            end -= 1
+        self._current.update(repr(tuple(row[:end])).encode('utf-8', 'surrogatepass'))
+        self._current.update(b'\n')
+        self.rows += 1
+        if self.rows % self.block_rows == 0:
+            self.digests.append(self._current.hexdigest())
+            self._current = hashlib.blake2b(digest_size=16)
+
+    def block_digests(self):
+        """已完成的数据块哈希，加上末尾不满一块的部分（若有）"""
+        if self.rows % self.block_rows:
+            return self.digests + [self._current.hexdigest()]
+        return list(self.digests)
+
+
+class Checkpoint:
+    """已处理部分的解析状态"""
+
+    def __init__(self, input_path, rows, block_digests, parser_state, block_rows=BLOCK_ROWS):
+        self.input_path = input_path
+        self.rows = rows
+        self.block_digests = block_digests
+        self.parser_state = parser_state
+        self.block_rows = block_rows
+
+    def verify(self, hasher):
+        """在已处理的行范围内，每读完一块（或读到检查点末尾）时核对哈希"""
+        if hasher.rows % hasher.block_rows and hasher.rows != self.rows:
+            return
+        digests = hasher.block_digests()
+        if digests[-1] != self.block_digests[len(digests) - 1]:
+            raise CheckpointMismatch(f"第 {hasher.rows} 行之前的数据已变化")
+
+
+def parser_state(parser):
+    """PlotSpeciesParser 中需要保存的状态"""
+    parser.flush()
+    return {
+        'current_plot': parser.current_plot,
+        'plot_counter': parser.plot_counter,
+        'species_counter': parser.species_counter,
+        'accumulator': parser.accumulator,
+    }
+
+
+def restore_parser(parser, state):
+    parser.current_plot = state['current_plot']
+    parser.plot_counter = state['plot_counter']
+    parser.species_counter = state['species_counter']
+    parser.accumulator = state['accumulator']
+    if parser.verbose:
+        # verbose 日志中的累计数量：检查点中不单独保存，由已累加的记录重新合并得到，
+        # 继续处理时已出现过的物种记为"累加物种"
+        parser.totals = {(plot, species): count
+                         for species, plot, count in parser.accumulator.to_matrix().triplets()}
+    return parser
+
+
+def save_checkpoint(path, input_path, hasher, parser, names_fingerprint=''):
+    """原子地写入检查点；names_fingerprint 为解析时所用同义名表的指纹（见 taxonomy 模块）"""
+    state = parser_state(parser)
+    accumulator = state['accumulator']
+    species_codes, plot_codes, values, kinds = accumulator.arrays()
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'input_path': os.path.abspath(input_path),
+        'species_names': names_fingerprint,
+        'rows': hasher.rows,
+        'block_rows': hasher.block_rows,
+        'current_plot': state['current_plot'],
+        'plot_counter': state['plot_counter'],
+        'species_counter': state['species_counter'],
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                block_digests=np.array(hasher.block_digests(), dtype=str),
+                species=np.array(accumulator.species.names, dtype=str),
+                plots=np.array(accumulator.plots.names, dtype=str),
+                species_codes=species_codes,
+                plot_codes=plot_codes,
+                values=values,
+                kinds=kinds,
+            )
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path, input_path, names_fingerprint=''):
+    """读取检查点；不存在、版本不符、对应其他输入文件或同义名表、已损坏时返回 None"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != CHECKPOINT_VERSION or meta['input_path'] != os.path.abspath(input_path):
+                return None
+            if meta.get('species_names', '') != names_fingerprint:
+                # 已累加的物种名称按其他同义名表转换，不能继续使用
+                return None
+
+            accumulator = SparseAccumulator.from_arrays(
+                data['species'].tolist(), data['plots'].tolist(),
+                data['species_codes'], data['plot_codes'], data['values'], data['kinds'],
+            )
+            block_digests = data['block_digests'].tolist()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    state = {
+        'current_plot': meta['current_plot'],
+        'plot_counter': meta['plot_counter'],
+        'species_counter': meta['species_counter'],
+        'accumulator': accumulator,
+    }
+    return Checkpoint(meta['input_path'], meta['rows'], block_digests, state, block_rows=meta['block_rows'])
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""数量单元格 -> 数值的整列转换
+
+输入为一整列单元格（int/float/str/None 混合），一次调用返回 float 数组和有效性掩码：
+数值单元格由 numpy 整体转换；只有文本单元格逐个用预编译正则判断（不依赖异常控制流程），
+同一列中相同的文本只解析一次。
+全角数字、"3株"、"1.5%" 等写法先做 NFKC 规范化，再取其中的数字。
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+# 可直接由 numpy 转换的单元格类型（None 转换为 NaN）
+_PLAIN_TYPES = {int, float, bool, type(None), np.float64, np.float32, np.int64, np.int32, np.bool_}
+
+# 完整的数字文本（与 float() 接受的写法一致，不含下划线分隔）
+FLOAT_RE = re.compile(
+    r'\s*[+-]?(?:\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|inf(?:inity)?|nan)\s*',
+    re.IGNORECASE
+)
+
+# 文本中的第一个数字
+NUMBER_RE = re.compile(r'[\d.]+')
+
+
+def coerce_cell(value, extract=True):
+    """单个单元格 -> float，无法识别时返回 NaN
+
+    extract=True 时从 "3株"、"约12" 等文本中取出第一个数字，否则只接受完整的数字文本。
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value)
+    if not text.isascii():
+        # 全角数字/小数点/百分号 -> 半角
+        text = unicodedata.normalize('NFKC', text)
+
+    if FLOAT_RE.fullmatch(text):
+        return float(text)
+
+    if extract:
+        match = NUMBER_RE.search(text)
+        if match:
+            digits = match.group()
+            # "..", "5.5.5" 之类无法构成数字
+            if digits.count('.') <= 1 and digits != '.':
+                return float(digits)
+    return np.nan
+
+
+def coerce_numbers(values, extract=True):
+    """整列单元格 -> (float64 数组, 有效性掩码)
+
+    无法识别的单元格（含空值和 NaN）在数组中记为0、掩码为 False。
+    """
+    if set(map(type, values)) <= _PLAIN_TYPES:
+        # 没有文本：整列直接转换
+        numbers = np.array(values, dtype=np.float64)
+    else:
+        # 数值单元格整体转换，文本单元格逐个解析（如 "3株" 在一列中反复出现时只解析一次）
+        plain = np.fromiter(map(_PLAIN_TYPES.__contains__, map(type, values)), dtype=bool, count=len(values))
+        cells = np.asarray(values, dtype=object)
+        numbers = np.empty(len(cells), dtype=np.float64)
+        numbers[plain] = cells[plain].astype(np.float64)
+        parsed = {}
+        numbers[~plain] = [parsed[cell] if cell in parsed else parsed.setdefault(cell, coerce_cell(cell, extract))
+                           for cell in cells[~plain]]
+
+    valid = ~np.isnan(numbers)
+    numbers[~valid] = 0
+    return numbers, valid
+
+
+def parse_count(value):
+    """解析单个数量单元格，数值保持原类型，文本转换为 float，无法识别时返回0"""
+    if isinstance(value, (int, float)) and value == value:
+        return value
+
+    number = coerce_cell(value)
+    return 0 if number != number else number
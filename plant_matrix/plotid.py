@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""样地/样方编号
+
+样地编号（如 "1-1-1"）在解析时转换为 PlotId：每个不同的编号只创建一个对象（驻留），
+创建时解析一次排序键，之后排序、合并都直接使用缓存的结果，不再重复拆分字符串。
+驻留表只保存弱引用：处理完一个文件、不再使用的编号随之释放，长时间运行的批处理中不会持续增长。
+PlotId 是 str 的子类，与同名的普通字符串相等、哈希值相同，可以直接写出到表格。
+"""
+import re
+import weakref
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+class PlotId(str):
+    """驻留的样地编号，附带排序键
+
+    sort_key: 自然排序键，文本部分不区分大小写、数字部分按数值比较，
+              任意编号之间都可以比较（纯数字编号 "1-1-2" 按各级编号的数值排序）。
+    """
+
+    __slots__ = ('sort_key', '__weakref__')
+
+    # 编号文本（普通 str，不引用 PlotId 本身）-> PlotId
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, text):
+        plot = cls._interned.get(text)
+        if plot is not None:
+            return plot
+
+        plot = super().__new__(cls, text)
+        # 拆分为 文本, 数字, 文本, ... 交替的片段（首尾总是文本，可能为空）
+        plot.sort_key = tuple([int(piece) if piece.isdecimal() else piece.lower() for piece in _DIGITS.split(plot)])
+        cls._interned[str(plot)] = plot
+        return plot
+
+    def __reduce__(self):
+        # 在进程间传递或缓存时只保存编号文本，读回时重新驻留
+        return PlotId, (str(self),)
+
+
+def plot_sort_key(plot):
+    """任意样地编号（str 或 PlotId）的排序键"""
+    return PlotId(plot).sort_key
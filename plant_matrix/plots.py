@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+""""物种名称 <样地>" 数据块 -> 物种×样地矩阵
+
+输入为逐行的样地/物种记录：每个样地以"物种名称\t样地编号"开头，后跟物种列表。
+只依赖 openpyxl（及可选的读取后端，见 readers 模块），不依赖任何界面库。
+"""
+import numpy as np
+
+from .errors import DataFormatError, ProcessingCancelled
+from .incremental import BlockHasher, CheckpointMismatch, load_checkpoint, restore_parser, save_checkpoint
+from .numeric import coerce_numbers, parse_count
+from .plotid import PlotId
+from .readers import open_sheet_rows
+from .recognizers import find_plot_id, is_plot_header
+from .sparse import KIND_INT, SparseAccumulator, value_kind
+from .tasks import ignore
+from .taxonomy import DEFAULT_NAMES, cache_kind
+
+
+def plot_key(plot):
+    """样地排序键（按数字顺序，见 PlotId.sort_key）
+
+    数字编号与非数字编号（如第二列给出的 "A1"）混在一起时也可以排序。
+    """
+    return PlotId(plot).sort_key
+
+
+def starts_plot(row):
+    """该行是否开始一个新样地（与 PlotSpeciesParser.feed 中切换样地的条件一致）
+
+    含"物种名称"但取不到样地编号的行不切换样地，其后的物种仍属于上一个样地。
+    """
+    if not row or not is_plot_header(row[0]):
+        return False
+    return bool(find_plot_id(row[0]) or (len(row) > 1 and row[1]))
+
+
+class PlotSpeciesParser:
+    """逐行解析样地/物种记录的状态机，累加同一样地中相同物种的数量
+
+    物种记录先缓存原始的数量单元格，每 PENDING_ROWS 行整列转换一次后追加到稀疏累加器
+    （整数编码的物种/样地 + 数量数组），相同物种的数量在生成矩阵时合并。
+    verbose=True 时逐条转换并记录"添加物种/累加物种"日志，否则只记录样地。
+    物种名称读取时经 species_names（taxonomy.SpeciesNames，默认只做规范化）转换为接受名，
+    每个不同的原始写法只转换一次。
+    """
+
+    PENDING_ROWS = 4096
+
+    def __init__(self, log=None, verbose=False, species_names=None):
+        self.log = log or ignore
+        self.verbose = verbose
+        self.canonical = (species_names or DEFAULT_NAMES).canonical
+        self.current_plot = None
+        self.accumulator = SparseAccumulator()  # 存储所有 (物种, 样地, 数量) 记录
+        self.totals = {}  # verbose 模式下用于日志的 (样地, 物种) -> 累计数量
+        self.pending = ([], [], [])  # 尚未转换的 (物种, 样地, 数量单元格)
+        self.plot_counter = 0  # 样地计数器
+        self.species_counter = 0  # 物种记录计数器
+
+    def feed(self, row):
+        """处理一行数据（单元格取值的元组）"""
+        # 跳过空行
+        if not row or all(cell is None for cell in row):
+            return
+
+        # 检查是否为样地行
+        if is_plot_header(row[0]):
+            # 按 1-1-1、1-1、1 的优先级识别样地编号
+            plot = find_plot_id(row[0])
+            if plot:
+                self._start_plot(plot)
+                return
+
+            # 如果第一列包含"物种名称"关键词，尝试从第二列获取样地编号
+            if len(row) > 1 and row[1]:
+                self._start_plot(str(row[1]).strip())
+            return
+
+        # 处理物种数据行
+        if self.current_plot and row[0] and isinstance(row[0], str):
+            species_name = self.canonical(row[0])
+
+            if not species_name or "物种名称" in species_name:
+                return
+
+            # 统计原始数据行数
+            self.species_counter += 1
+
+            count_cell = row[1] if len(row) > 1 else None
+            if not self.verbose:
+                # 数量单元格整列转换，相同物种在生成矩阵时累加
+                pending_species, pending_plots, pending_counts = self.pending
+                pending_species.append(species_name)
+                pending_plots.append(self.current_plot)
+                pending_counts.append(count_cell)
+                if len(pending_counts) >= self.PENDING_ROWS:
+                    self.flush()
+            else:
+                count = parse_count(count_cell)
+                self.accumulator.add(species_name, self.current_plot, count)
+
+                key = (self.current_plot, species_name)
+                if key in self.totals:
+                    self.totals[key] += count
+                    self.log(f"  累加物种: {species_name} + {count} = {self.totals[key]}")
+                else:
+                    self.totals[key] = count
+                    self.log(f"  添加物种: {species_name} = {count}")
+
+    def flush(self):
+        """将缓存的数量单元格整列转换后追加到累加器"""
+        species, plots, counts = self.pending
+        if not counts:
+            return
+
+        numbers, valid = coerce_numbers(counts)
+        # 数值保持原类型，文本转换为 float，无法识别的记为 int 0
+        kinds = np.fromiter(map(value_kind, counts), dtype=np.int8, count=len(counts))
+        kinds[~valid] = KIND_INT
+        self.accumulator.extend(species, plots, numbers, kinds)
+        self.pending = ([], [], [])
+
+    def _start_plot(self, plot):
+        self.current_plot = PlotId(plot)
+        self.log(f"发现样地: {plot}")
+        self.plot_counter += 1
+
+    def to_matrix(self):
+        """生成物种×样地矩阵"""
+        if not self.current_plot:
+            raise DataFormatError("未找到样地数据！请检查文件格式")
+
+        self.flush()
+        return self.accumulator.to_matrix(
+            plot_sort_key=plot_key,
+            plot_counter=self.plot_counter,
+            species_counter=self.species_counter,
+        )
+
+
+def iter_sheet_rows(input_path, streaming=True, sheet_name=None, engine='auto'):
+    """打开工作簿，返回 (总行数, 行迭代器)；迭代结束后自动关闭工作簿
+
+    流式模式下逐行解析，不构建完整的单元格对象；engine 为读取后端（见 readers 模块）。
+    文件未记录表格尺寸时总行数为0。sheet_name 为空时读取活动工作表。
+    """
+    return open_sheet_rows(input_path, sheet_name=sheet_name, engine=engine, streaming=streaming)
+
+
+def build_species_plot_matrix(input_path, streaming=True, log=None, progress=None, should_stop=None,
+                              verbose=False, cache=None, checkpoint_path=None, workers=1, engine='auto',
+                              species_names=None):
+    """读取Excel文件并生成物种×样地矩阵
+
+    log(message) 和 progress(value, message) 为可选的回调；
+    should_stop() 返回 True 时抛出 ProcessingCancelled；
+    verbose=True 时输出逐条物种记录的日志；
+    cache 为 ParseCache 时，同一文件再次处理直接使用缓存的解析结果；
+    checkpoint_path 不为空时增量处理：从检查点继续解析新追加的行，并更新检查点；
+    workers 不为1时在样地边界处分块、用多个进程并行解析（None 为CPU核数，
+    verbose 或增量处理时仍顺序解析）；
+    engine 为读取后端：auto/openpyxl/xml/calamine（见 readers 模块）；
+    species_names 为 taxonomy.SpeciesNames（同义名表），物种名称读取时转换为接受名。
+    """
+    log = log or ignore
+    progress = progress or ignore
+
+    kind = cache_kind('plots', species_names)
+    cached = cache.load(input_path, kind) if cache is not None else None
+    if cached:
+        matrix, _ = cached
+        log("使用缓存的解析结果，跳过读取Excel")
+        progress(80, "已载入缓存")
+    else:
+        if workers != 1 and not verbose and not checkpoint_path:
+            from .chunked import build_species_plot_matrix_chunked
+            matrix = build_species_plot_matrix_chunked(input_path, streaming=streaming, workers=workers, log=log,
+                                                       progress=progress, should_stop=should_stop, engine=engine,
+                                                       species_names=species_names)
+        else:
+            matrix = _parse_workbook(input_path, streaming, log, progress, should_stop, verbose, checkpoint_path,
+                                     engine, species_names)
+        if cache is not None:
+            cache.store(input_path, kind, matrix)
+
+    log(f"发现 {len(matrix.species)} 个唯一物种")
+    log(f"发现 {matrix.plot_counter} 个样地")
+    log(f"处理了 {matrix.species_counter} 条物种记录")
+    return matrix
+
+
+def _parse_workbook(input_path, streaming, log, progress, should_stop, verbose, checkpoint_path=None, engine='auto',
+                    species_names=None):
+    names_fingerprint = species_names.fingerprint if species_names is not None else ''
+    checkpoint = load_checkpoint(checkpoint_path, input_path, names_fingerprint) if checkpoint_path else None
+    try:
+        return _parse_rows(input_path, streaming, log, progress, should_stop, verbose, checkpoint_path, checkpoint,
+                           engine, species_names)
+    except CheckpointMismatch as e:
+        log(f"{e}，重新完整处理...")
+        return _parse_rows(input_path, streaming, log, progress, should_stop, verbose, checkpoint_path, None, engine,
+                           species_names)
+
+
+def _parse_rows(input_path, streaming, log, progress, should_stop, verbose, checkpoint_path, checkpoint,
+                engine='auto', species_names=None):
+    # 读取原始数据
+    log("读取Excel文件...")
+    progress(5, "正在读取文件...")
+    total_rows, rows = iter_sheet_rows(input_path, streaming=streaming, engine=engine)
+
+    # 数据预处理
+    log("解析数据...")
+    progress(10, "正在解析数据...")
+    parser = PlotSpeciesParser(log=log, verbose=verbose, species_names=species_names)
+    hasher = BlockHasher(checkpoint.block_rows) if checkpoint else BlockHasher()
+    skip_rows = 0
+    if checkpoint:
+        restore_parser(parser, checkpoint.parser_state)
+        skip_rows = checkpoint.rows
+        log(f"从检查点继续：跳过已处理的 {skip_rows} 行")
+    processed_rows = 0
+    last_progress = 0
+
+    try:
+        for row_idx, row in enumerate(rows, 1):
+            if should_stop and should_stop():
+                raise ProcessingCancelled()
+
+            processed_rows += 1
+
+            # 更新进度（每5%更新一次）
+            if total_rows:
+                current_progress = 10 + int(70 * min(processed_rows / total_rows, 1))
+                if current_progress > last_progress + 5 or row_idx == total_rows:
+                    progress(current_progress, f"处理中: {processed_rows}/{total_rows} 行")
+                    last_progress = current_progress
+
+            if checkpoint_path:
+                hasher.update(row)
+                if row_idx <= skip_rows:
+                    # 已处理的行只核对哈希
+                    checkpoint.verify(hasher)
+                    continue
+
+            parser.feed(row)
+    finally:
+        rows.close()
+
+    if processed_rows < skip_rows:
+        raise CheckpointMismatch(f"工作表只有 {processed_rows} 行，少于检查点记录的 {skip_rows} 行")
+
+    if checkpoint:
+        log(f"新增 {processed_rows - skip_rows} 行")
+
+    matrix = parser.to_matrix()
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, input_path, hasher, parser,
+                        species_names.fingerprint if species_names is not None else '')
+    return matrix
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""工作表读取后端
+
+所有后端返回相同形式的结果：(总行数, 行迭代器)，每行为单元格取值的元组，
+取值与 openpyxl 只读模式 iter_rows(values_only=True) 一致（数字为 int/float，
+空单元格为 None，日期为 datetime）。
+
+- openpyxl: openpyxl 只读模式（streaming=False 时为完整模式），兼容性最好；
+- xml: 用 zipfile + xml.etree.iterparse 直接流式解析工作表 XML，不创建单元格对象，
+  只支持 .xlsx/.xlsm；
+- calamine: python-calamine（Rust 实现，需另行安装），整张工作表一次读入。
+  xlsx 中的数字一律读为 float，整数值转换为 int；
+- text: CSV/TSV 文本（可为 gzip 压缩），用 csv 模块逐行读取，内存占用与文件大小无关。
+  与用 Excel 打开时一样，整数/小数文本转换为 int/float，TRUE/FALSE 转换为 bool，空字段为 None。
+
+engine='auto' 时：文本文件（.csv/.tsv/.txt 及其 .gz）用 text；流式读取 .xlsx/.xlsm 时用 xml
+（内存占用与工作表大小无关）；其余情况（完整模式、.xls 等格式）已安装 python-calamine 时用 calamine，
+否则用 openpyxl。calamine 整张工作表一次读入，流式读取 .xlsx 时只在明确指定 engine='calamine' 时使用。
+"""
+import codecs
+import csv
+import gzip
+import importlib.util
+import os
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import XMLPullParser, fromstring, iterparse
+
+# Excel 工作簿的读取后端
+ENGINES = ('openpyxl', 'xml', 'calamine')
+
+TEXT_ENGINE = 'text'
+
+TEXT_EXTENSIONS = ('.csv', '.tsv', '.tab', '.txt')
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_DOC_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_ROW = _MAIN_NS + 'row'
+_CELL = _MAIN_NS + 'c'
+_VALUE = _MAIN_NS + 'v'
+_INLINE = _MAIN_NS + 'is'
+_TEXT = _MAIN_NS + 't'
+_RICH = _MAIN_NS + 'r'
+_STRING_ITEM = _MAIN_NS + 'si'
+_DIMENSION = _MAIN_NS + 'dimension'
+_SHEET_DATA = _MAIN_NS + 'sheetData'
+
+_READ_CHUNK = 1024 * 1024
+
+
+def calamine_available():
+    return importlib.util.find_spec('python_calamine') is not None
+
+
+def available_engines():
+    """当前环境中可用的后端"""
+    return [engine for engine in ENGINES if engine != 'calamine' or calamine_available()]
+
+
+def is_text_file(file_path):
+    """是否为 CSV/TSV 文本文件（按扩展名，可为 .gz 压缩）"""
+    name = file_path[:-3] if file_path.lower().endswith('.gz') else file_path
+    return os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS
+
+
+def select_engine(file_path, engine='auto', streaming=True):
+    """确定实际使用的后端"""
+    if engine not in ('auto', TEXT_ENGINE) + ENGINES:
+        raise ValueError(f"未知的读取后端: {engine}（可选: auto, {TEXT_ENGINE}, {', '.join(ENGINES)}）")
+    if engine != 'auto':
+        return engine
+    if is_text_file(file_path):
+        return TEXT_ENGINE
+    if streaming and is_xml_workbook(file_path):
+        return 'xml'
+    if calamine_available():
+        return 'calamine'
+    return 'openpyxl'
+
+
+def is_xml_workbook(file_path):
+    """是否为 zip 格式的 .xlsx/.xlsm 工作簿（xml 后端只支持这种格式）"""
+    return os.path.splitext(file_path)[1].lower() in ('.xlsx', '.xlsm') and zipfile.is_zipfile(file_path)
+
+
+def list_sheet_names(file_path, engine='auto'):
+    """工作簿中所有工作表的名称（按顺序）"""
+    engine = select_engine(file_path, engine)
+    if engine == TEXT_ENGINE:
+        # 文本文件只有一张"工作表"
+        return [text_sheet_name(file_path)]
+    if engine == 'openpyxl':
+        import openpyxl
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+    if engine == 'calamine' and not is_xml_workbook(file_path):
+        # .xls/.xlsb/.ods 没有 workbook.xml
+        from python_calamine import CalamineWorkbook
+        return list(CalamineWorkbook.from_path(file_path).sheet_names)
+    with XmlWorkbook(file_path) as wb:
+        return wb.sheet_names()
+
+
+def open_sheet_rows(file_path, sheet_name=None, engine='auto', streaming=True):
+    """打开工作表，返回 (总行数, 行迭代器)；迭代结束（或 close()）后自动关闭文件
+
+    sheet_name 为空时读取活动工作表，为整数时按下标读取。
+    总行数取自文件记录的表格尺寸，没有记录时为0。
+    """
+    engine = select_engine(file_path, engine, streaming)
+    if engine == TEXT_ENGINE:
+        return _open_text_rows(file_path)
+    if engine == 'xml':
+        return _open_xml_rows(file_path, sheet_name)
+    if engine == 'calamine':
+        return _open_calamine_rows(file_path, sheet_name)
+    return _open_openpyxl_rows(file_path, sheet_name, streaming)
+
+
+def _open_openpyxl_rows(file_path, sheet_name, streaming):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=streaming, data_only=True)
+    if sheet_name is None:
+        sheet = wb.active
+    elif isinstance(sheet_name, int):
+        sheet = wb.worksheets[sheet_name]
+    else:
+        sheet = wb[sheet_name]
+
+    total_rows = sheet.max_row or 0
+    if streaming:
+        # 只读模式只读取记录的表格尺寸以内的单元格，而很多非 Excel 程序写出的尺寸不准确
+        # （如 ref="A1"）：与 pandas 相同，忽略记录的尺寸读取全部数据，尺寸只用于显示进度
+        sheet.reset_dimensions()
+
+    def rows():
+        try:
+            yield from sheet.iter_rows(values_only=True)
+        finally:
+            # 关闭工作簿（只读模式下释放文件句柄）
+            wb.close()
+
+    return total_rows, rows()
+
+
+def _open_xml_rows(file_path, sheet_name):
+    wb = XmlWorkbook(file_path)
+    try:
+        sheet_path = wb.sheet_path(sheet_name)
+        dimensions = wb.dimensions(sheet_path)
+        shared_strings = wb.shared_strings()
+        date_styles = wb.date_styles()
+    except BaseException:
+        wb.close()
+        raise
+
+    def rows():
+        try:
+            yield from _iter_xml_rows(wb.archive, sheet_path, shared_strings, date_styles, wb.epoch)
+        finally:
+            wb.close()
+
+    return (dimensions[1] if dimensions else 0), rows()
+
+
+def _open_calamine_rows(file_path, sheet_name):
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(file_path)
+    if sheet_name is None:
+        sheet_name = _active_sheet_index(file_path)
+    if isinstance(sheet_name, int):
+        sheet = wb.get_sheet_by_index(sheet_name)
+    else:
+        sheet = wb.get_sheet_by_name(sheet_name)
+    # 不跳过左上方的空白区域，使行列位置与 openpyxl 一致
+    data = sheet.to_python(skip_empty_area=False)
+
+    def rows():
+        for row in data:
+            yield tuple(_calamine_value(value) for value in row)
+
+    return len(data), rows()
+
+
+def _active_sheet_index(file_path):
+    # calamine 不提供活动工作表：.xlsx/.xlsm 从 workbook.xml 中读取，
+    # 其他格式（.xls/.xlsb/.ods）无法读取，使用第一张工作表
+    if not is_xml_workbook(file_path):
+        return 0
+    with XmlWorkbook(file_path) as wb:
+        return wb.active_index
+
+
+def _calamine_value(value):
+    if value == '':
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def text_sheet_name(file_path):
+    """文本文件作为工作表时的名称：去掉扩展名（及 .gz）的文件名"""
+    name = os.path.basename(file_path)
+    if name.lower().endswith('.gz'):
+        name = name[:-3]
+    return os.path.splitext(name)[0]
+
+
+# 与 Excel 一样转换为数字的文本
+_INT_TEXT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_TEXT_RE = re.compile(r'[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?')
+
+_SNIFF_BYTES = 64 * 1024
+
+
+def _open_text_rows(file_path, encoding=None, delimiter=None):
+    """逐行读取 CSV/TSV 文本，总行数未知（为0）
+
+    encoding 为空时自动判断：UTF-8（可带 BOM），否则按 GB18030（中文 Windows 导出的文本）；
+    delimiter 为空时 .csv 为逗号，.tsv/.tab 为制表符，其余取文件开头制表符和逗号中较多的一个。
+    """
+    opener = gzip.open if file_path.lower().endswith('.gz') else open
+    with opener(file_path, 'rb') as f:
+        head = f.read(_SNIFF_BYTES)
+
+    if encoding is None:
+        try:
+            # 开头的片段可能截断在多字节字符中间，用增量解码器判断
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            encoding = 'utf-8-sig'
+        except UnicodeDecodeError:
+            encoding = 'gb18030'
+
+    if delimiter is None:
+        extension = os.path.splitext(file_path[:-3] if file_path.lower().endswith('.gz') else file_path)[1].lower()
+        if extension == '.csv':
+            delimiter = ','
+        elif extension in ('.tsv', '.tab'):
+            delimiter = '\t'
+        else:
+            delimiter = '\t' if head.count(b'\t') >= head.count(b',') else ','
+
+    stream = opener(file_path, 'rt', encoding=encoding, newline='')
+
+    def rows():
+        try:
+            for fields in csv.reader(stream, delimiter=delimiter):
+                yield tuple(_text_value(field) for field in fields)
+        finally:
+            stream.close()
+
+    return 0, rows()
+
+
+_BOOL_TEXT = {'TRUE': True, 'FALSE': False}
+
+
+def _text_value(field):
+    if not field:
+        return None
+    if _INT_TEXT_RE.fullmatch(field):
+        return int(field)
+    if _FLOAT_TEXT_RE.fullmatch(field):
+        return float(field)
+    return _BOOL_TEXT.get(field.upper(), field) if len(field) <= 5 else field
+
+
+class XmlWorkbook:
+    """直接读取 xlsx 压缩包中的工作簿结构（工作表列表、共享字符串、日期样式）"""
+
+    def __init__(self, file_path):
+        self.archive = zipfile.ZipFile(file_path)
+        try:
+            self._read_workbook()
+        except BaseException:
+            self.archive.close()
+            raise
+
+    def _read_workbook(self):
+        package_rels = _read_rels(self.archive, '_rels/.rels')
+        self.workbook_path = next(target for rel_type, target in package_rels.values()
+                                  if rel_type.endswith('/officeDocument'))
+        workbook = fromstring(self.archive.read(self.workbook_path))
+        rels = _read_rels(self.archive, _rels_path(self.workbook_path), base=self.workbook_path)
+
+        self.sheets = []
+        for sheet in workbook.iter(_MAIN_NS + 'sheet'):
+            _, target = rels[sheet.get(_DOC_REL_NS + 'id')]
+            self.sheets.append((sheet.get('name'), target))
+
+        view = workbook.find(f'{_MAIN_NS}bookViews/{_MAIN_NS}workbookView')
+        self.active_index = int(view.get('activeTab', 0)) if view is not None else 0
+        if not 0 <= self.active_index < len(self.sheets):
+            self.active_index = 0
+
+        properties = workbook.find(_MAIN_NS + 'workbookPr')
+        date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        self._shared_strings_path = next((target for rel_type, target in rels.values()
+                                          if rel_type.endswith('/sharedStrings')), None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    def sheet_names(self):
+        return [name for name, _ in self.sheets]
+
+    def sheet_path(self, sheet_name=None):
+        if sheet_name is None:
+            return self.sheets[self.active_index][1]
+        if isinstance(sheet_name, int):
+            return self.sheets[sheet_name][1]
+        for name, path in self.sheets:
+            if name == sheet_name:
+                return path
+        raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+    def dimensions(self, sheet_path):
+        """工作表记录的尺寸 (最大列, 最大行)，没有记录时返回 None"""
+        from openpyxl.utils.cell import range_boundaries
+
+        # <dimension> 位于 <sheetData> 之前，读到 <sheetData> 开始即可停止
+        with self.archive.open(sheet_path) as source:
+            for _, element in iterparse(source, events=('start',)):
+                if element.tag == _DIMENSION:
+                    _, _, max_col, max_row = range_boundaries(element.get('ref'))
+                    return max_col, max_row
+                if element.tag == _SHEET_DATA:
+                    return None
+        return None
+
+    def shared_strings(self):
+        """共享字符串表（与 openpyxl 相同：富文本只取文字，忽略注音）"""
+        if not self._shared_strings_path or self._shared_strings_path not in self.archive.namelist():
+            return []
+
+        strings = []
+        with self.archive.open(self._shared_strings_path) as source:
+            for _, element in iterparse(source):
+                if element.tag == _STRING_ITEM:
+                    strings.append(_item_text(element).replace('x005F_', ''))
+                    element.clear()
+        return strings
+
+    def date_styles(self):
+        """数字格式为日期/时长的单元格样式编号：(日期样式集合, 时长样式集合)"""
+        if 'xl/styles.xml' not in self.archive.namelist():
+            return set(), set()
+
+        from openpyxl.styles.stylesheet import Stylesheet
+
+        stylesheet = Stylesheet.from_tree(fromstring(self.archive.read('xl/styles.xml')))
+        if not stylesheet.cell_styles:
+            return set(), set()
+        return stylesheet.date_formats, stylesheet.timedelta_formats
+
+
+def _rels_path(part_path):
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, '_rels', name + '.rels')
+
+
+def _read_rels(archive, rels_path, base=''):
+    """关系文件 -> {Id: (类型, 压缩包内路径)}"""
+    rels = {}
+    for rel in fromstring(archive.read(rels_path)).iter(_PKG_REL_NS + 'Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+        rels[rel.get('Id')] = (rel.get('Type', ''), target)
+    return rels
+
+
+def _item_text(element):
+    """<si>/<is> 元素的文字：直接的 <t> 加上各富文本段 <r><t>"""
+    snippets = []
+    for child in element:
+        if child.tag == _TEXT:
+            snippets.append(child.text or '')
+        elif child.tag == _RICH:
+            text = child.find(_TEXT)
+            if text is not None:
+                snippets.append(text.text or '')
+    return ''.join(snippets)
+
+
+_column_cache = {}
+
+
+def _column_index(reference):
+    """"AB12" -> 28"""
+    letters = reference.rstrip('0123456789')
+    column = _column_cache.get(letters)
+    if column is None:
+        column = 0
+        for letter in letters:
+            column = column * 26 + ord(letter) - 64
+        _column_cache[letters] = column
+    return column
+
+
+def _cell_value(cell, shared_strings, date_styles, epoch):
+    data_type = cell.get('t', 'n')
+    if data_type == 'inlineStr':
+        inline = cell.find(_INLINE)
+        return _item_text(inline) if inline is not None else None
+
+    value = cell.findtext(_VALUE) or None
+    if value is None:
+        return None
+    if data_type == 'n':
+        number = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+        style = cell.get('s')
+        date_formats, timedelta_formats = date_styles
+        if style and int(style) in date_formats:
+            from openpyxl.utils.datetime import from_excel
+            try:
+                return from_excel(number, epoch, timedelta=int(style) in timedelta_formats)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return number
+    if data_type == 's':
+        return shared_strings[int(value)]
+    if data_type == 'b':
+        return bool(int(value))
+    if data_type == 'd':
+        from openpyxl.utils.datetime import from_ISO8601
+        return from_ISO8601(value)
+    # str（公式结果文本）、e（错误值）
+    return value
+
+
+def _iter_xml_rows(archive, sheet_path, shared_strings, date_styles, epoch):
+    """逐行解析工作表 XML，与 openpyxl 只读模式 reset_dimensions() 后的结果一致
+
+    文件记录的表格尺寸常常不准确（很多非 Excel 程序写出 ref="A1"），不用于限制读取范围：
+    读取全部行，每行到最后一个有记录的单元格为止，缺失的行输出为空行。
+    """
+    date_formats = date_styles[0]
+
+    counter = 1
+    row_number = 0
+    parser = XMLPullParser(events=('end',))
+    with archive.open(sheet_path) as source:
+        for chunk in iter(lambda: source.read(_READ_CHUNK), b''):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag != _ROW:
+                    continue
+
+                reference = element.get('r')
+                row_number = int(float(reference)) if reference else row_number + 1
+
+                cells = []
+                column = 0
+                for cell in element:
+                    reference = cell.get('r')
+                    column = _column_index(reference) if reference else column + 1
+                    data_type = cell.get('t')
+                    # 最常见的共享字符串和（非日期样式的）数字单独处理
+                    if data_type == 's':
+                        value = cell.findtext(_VALUE)
+                        cells.append((column, shared_strings[int(value)] if value else None))
+                    elif data_type is None and not (date_formats and cell.get('s')):
+                        value = cell.findtext(_VALUE)
+                        if value:
+                            value = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+                        else:
+                            value = None
+                        cells.append((column, value))
+                    else:
+                        cells.append((column, _cell_value(cell, shared_strings, date_styles, epoch)))
+                # 与 openpyxl 相同：解析后清空行元素，只保留空的行节点
+                element.clear()
+
+                while counter < row_number:
+                    counter += 1
+                    yield ()
+
+                if counter <= row_number:
+                    counter += 1
+                    if not cells:
+                        yield ()
+                        continue
+                    row = [None] * cells[-1][0]
+                    for column, value in cells:
+                        row[column - 1] = value
+                    yield tuple(row)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""样地行识别（预编译，所有入口共用）
+
+样地行以"物种名称"开头，样地编号优先取 1-1-1 格式，其次 1-1，最后单个数字，
+都在第一列中查找；找不到时由调用方退回第二列。
+"""
+import re
+
+PLOT_HEADER_KEYWORD = "物种名称"
+
+# 三种样地编号格式合并为一个正则：按 1-1-1、1-1、1 的优先级各自取最左边的匹配，
+# 一次 match 调用即可得到结果，命中的格式由 lastgroup 给出
+PLOT_ID_RE = re.compile(
+    r'(?s)(?=.*?(?P<triple>[0-9]+-[0-9]+-[0-9]+))'
+    r'|(?=.*?(?P<pair>[0-9]+-[0-9]+))'
+    r'|(?=.*?(?P<single>[0-9]+))'
+)
+
+
+def is_plot_header(cell):
+    """第一列是否为样地行（包含"物种名称"的字符串）"""
+    return isinstance(cell, str) and PLOT_HEADER_KEYWORD in cell
+
+
+def find_plot_id(text):
+    """从样地行文本中取出样地编号，找不到时返回 None"""
+    match = PLOT_ID_RE.match(text)
+    if match:
+        return match.group(match.lastgroup)
+    return None
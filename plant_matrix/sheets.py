@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""多工作表并行处理：每个工作表（如每个样区一个）在独立进程中解析，结果合并为一个矩阵
+
+sheet_prefix=True 时样地编号加工作表名前缀（"<工作表>:<样地>"），不同工作表中
+编号相同的样地分别成列；否则编号相同的样地合并为一列（物种×样地数据数量相加，
+子表格合并以第一个包含该样方的工作表为准）。
+"""
+from functools import partial
+
+from .errors import DataFormatError
+from .readers import list_sheet_names
+from .sparse import combine_matrices
+from .tasks import ignore, run_tasks, worker_count
+
+
+def parse_plot_sheet(input_path, sheet_name, streaming=True, engine='auto', species_names=None):
+    """解析一个"物种名称 <样地>"格式的工作表（在工作进程中执行）"""
+    from .plots import PlotSpeciesParser, iter_sheet_rows
+
+    _, rows = iter_sheet_rows(input_path, streaming=streaming, sheet_name=sheet_name, engine=engine)
+    parser = PlotSpeciesParser(species_names=species_names)
+    try:
+        for row in rows:
+            parser.feed(row)
+    finally:
+        rows.close()
+    return parser.to_matrix(), 0
+
+
+def merge_table_sheet(file_path, sheet_name, engine='auto', species_names=None):
+    """合并一个工作表中的所有"物种"子表格（在工作进程中执行），返回 (矩阵, 表格数量)"""
+    from .tables import merge_tables_sparse, read_quadrat_tables, read_sheet
+
+    all_tables_data = read_quadrat_tables(read_sheet(file_path, sheet_name=sheet_name, engine=engine),
+                                          species_names=species_names)
+    return merge_tables_sparse(all_tables_data), len(all_tables_data)
+
+
+def process_sheets(file_path, parse_sheet, sheets=None, workers=None, log=None, progress=None, should_stop=None):
+    """用进程池并行执行 parse_sheet(file_path, 工作表名)，按工作表顺序返回 [(工作表名, 矩阵, 表格数量)]
+
+    没有可识别数据的工作表记录日志后跳过；全部工作表都没有数据时抛出 DataFormatError。
+    workers 默认为CPU核数；workers=1 时在当前进程中顺序执行。
+    """
+    log = log or ignore
+    progress = progress or ignore
+    sheets = sheets or list_sheet_names(file_path)
+    workers = worker_count(workers, len(sheets))
+    log(f"共 {len(sheets)} 个工作表，使用 {workers} 个进程")
+
+    results = {}
+    tasks = run_tasks(partial(parse_sheet, file_path), sheets, workers, should_stop, errors=DataFormatError)
+    for done, (k, outcome) in enumerate(tasks, 1):
+        sheet_name = sheets[k]
+        if isinstance(outcome, DataFormatError):
+            log(f"跳过工作表 {sheet_name}: {outcome}")
+        else:
+            matrix, n_tables = outcome
+            results[sheet_name] = outcome
+            log(f"工作表 {sheet_name}: {len(matrix.species)} 个物种, {len(matrix.plots)} 个样地")
+        progress(10 + int(70 * done / len(sheets)), f"已处理 {done}/{len(sheets)} 个工作表")
+
+    if not results:
+        raise DataFormatError("所有工作表中都未找到可识别的数据！请检查文件格式")
+    return [(sheet_name, *results[sheet_name]) for sheet_name in sheets if sheet_name in results]
+
+
+def build_species_plot_matrix_sheets(input_path, sheets=None, sheet_prefix=False, workers=None, streaming=True,
+                                     log=None, progress=None, should_stop=None, engine='auto', species_names=None):
+    """并行解析所有（或指定的）工作表并合并为一个物种×样地矩阵（species_names 为同义名表）"""
+    from .plots import plot_key
+
+    log = log or ignore
+    parse_sheet = partial(parse_plot_sheet, streaming=streaming, engine=engine, species_names=species_names)
+    parsed = process_sheets(input_path, parse_sheet, sheets=sheets, workers=workers, log=log, progress=progress,
+                            should_stop=should_stop)
+
+    matrix = combine_matrices([matrix for _, matrix, _ in parsed],
+                              labels=[sheet_name for sheet_name, _, _ in parsed] if sheet_prefix else None,
+                              plot_sort_key=plot_key)
+    log(f"发现 {len(matrix.species)} 个唯一物种")
+    log(f"发现 {matrix.plot_counter} 个样地")
+    log(f"处理了 {matrix.species_counter} 条物种记录")
+    return matrix
+
+
+def build_merged_matrix_sheets(file_path, sheets=None, sheet_prefix=False, workers=None, log=None, engine='auto',
+                               species_names=None):
+    """并行合并所有（或指定的）工作表中的子表格，返回 (矩阵, 表格总数)（species_names 为同义名表）"""
+    from .tables import natural_sort_key
+
+    parsed = process_sheets(file_path, partial(merge_table_sheet, engine=engine, species_names=species_names),
+                            sheets=sheets, workers=workers, log=log)
+
+    matrix = combine_matrices([matrix for _, matrix, _ in parsed],
+                              labels=[sheet_name for sheet_name, _, _ in parsed] if sheet_prefix else None,
+                              plot_sort_key=natural_sort_key, keep_first=True)
+    return matrix, sum(n_tables for _, _, n_tables in parsed)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""物种×样地稀疏矩阵
+
+野外调查矩阵通常 95% 以上为0。解析阶段只记录出现过的 (物种, 样地, 数量) 记录：
+物种和样地编码为整数，数量存入紧凑的数组（COO 三元组），
+直到导出时才按需生成稠密的行或 DataFrame。
+"""
+from array import array
+
+import numpy as np
+
+# 单元格数值类型：合并后只要有一条为 float 即为 float；只有一条 bool 记录时保留 bool，
+# 与直接用 Python 数值累加的结果类型一致
+KIND_INT = 0
+KIND_FLOAT = 1
+KIND_BOOL = 2
+
+
+class CodeBook:
+    """名称 <-> 整数编码，按首次出现的顺序编码"""
+
+    def __init__(self):
+        self.index = {}
+        self.names = []
+
+    def code(self, name):
+        code = self.index.get(name)
+        if code is None:
+            code = self.index[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+
+class SparseAccumulator:
+    """逐条追加 (物种, 样地, 数量) 记录的累加器，相同物种/样地的数量在生成矩阵时合并"""
+
+    def __init__(self):
+        self.species = CodeBook()
+        self.plots = CodeBook()
+        self._species_codes = array('q')
+        self._plot_codes = array('q')
+        self._values = array('d')
+        self._kinds = array('b')
+
+    def add(self, species, plot, value):
+        self._species_codes.append(self.species.code(species))
+        self._plot_codes.append(self.plots.code(plot))
+        self._values.append(value)
+        self._kinds.append(value_kind(value))
+
+    def extend(self, species, plots, values, kinds):
+        """批量追加记录：values 为 float 数组，kinds 为对应的数值类型数组"""
+        self._species_codes.extend(map(self.species.code, species))
+        self._plot_codes.extend(map(self.plots.code, plots))
+        self._values.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        self._kinds.frombytes(np.ascontiguousarray(kinds, dtype=np.int8).tobytes())
+
+    def __len__(self):
+        return len(self._values)
+
+    def arrays(self):
+        """所有记录的 (物种编码, 样地编码, 数量, 数值类型) 数组（副本）"""
+        return (np.array(self._species_codes, dtype=np.int64), np.array(self._plot_codes, dtype=np.int64),
+                np.array(self._values, dtype=np.float64), np.array(self._kinds, dtype=np.int8))
+
+    @classmethod
+    def from_arrays(cls, species, plots, species_codes, plot_codes, values, kinds):
+        """由 arrays() 的结果及编码对应的名称列表恢复累加器"""
+        accumulator = cls()
+        for name in species:
+            accumulator.species.code(name)
+        for name in plots:
+            accumulator.plots.code(name)
+        accumulator._species_codes.frombytes(np.ascontiguousarray(species_codes, dtype=np.int64).tobytes())
+        accumulator._plot_codes.frombytes(np.ascontiguousarray(plot_codes, dtype=np.int64).tobytes())
+        accumulator._values.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        accumulator._kinds.frombytes(np.ascontiguousarray(kinds, dtype=np.int8).tobytes())
+        return accumulator
+
+    def to_matrix(self, plot_sort_key=None, **stats):
+        """合并重复记录，按物种名称和样地排序键排序后生成 SpeciesPlotMatrix"""
+        species_order = sorted(range(len(self.species)), key=self.species.names.__getitem__)
+        plot_order = sorted(range(len(self.plots)),
+                            key=lambda code: (plot_sort_key or _identity)(self.plots.names[code]))
+
+        return SpeciesPlotMatrix.from_coo(
+            species=[self.species.names[code] for code in species_order],
+            plots=[self.plots.names[code] for code in plot_order],
+            rows=_ranks(species_order)[np.frombuffer(self._species_codes, dtype=np.int64)],
+            cols=_ranks(plot_order)[np.frombuffer(self._plot_codes, dtype=np.int64)],
+            values=np.frombuffer(self._values, dtype=np.float64),
+            kinds=np.frombuffer(self._kinds, dtype=np.int8),
+            **stats
+        )
+
+
+def value_kind(value):
+    """数值的输出类型；文本等其他类型转换为数值后为 float"""
+    if isinstance(value, (bool, np.bool_)):
+        return KIND_BOOL
+    if value is None or isinstance(value, (int, np.integer)):
+        return KIND_INT
+    return KIND_FLOAT
+
+
+def _identity(value):
+    return value
+
+
+def _ranks(order):
+    """order[k] 为排第 k 位的编码，返回 编码 -> 排名 的数组"""
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[np.asarray(order, dtype=np.int64)] = np.arange(len(order), dtype=np.int64)
+    return ranks
+
+
+class SpeciesPlotMatrix:
+    """物种×样地矩阵（物种为行，样地为列），以按 (行, 列) 排序的 COO 三元组存储
+
+    rows/cols 为 species/plots 列表中的下标，values 为数量（float64），
+    kinds 为该格输出时的数值类型（KIND_INT/KIND_FLOAT/KIND_BOOL）。
+    """
+
+    def __init__(self, species, plots, rows, cols, values, kinds, plot_counter=0, species_counter=0):
+        self.species = species
+        self.plots = plots
+        self.row_idx = rows
+        self.col_idx = cols
+        self.values = values
+        self.kinds = kinds
+        self.plot_counter = plot_counter
+        self.species_counter = species_counter
+
+    @classmethod
+    def from_coo(cls, species, plots, rows, cols, values, kinds, **stats):
+        """由可能含重复 (行, 列) 的三元组构造矩阵，重复记录的数量按出现顺序相加"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        keys = rows * max(len(plots), 1) + cols
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=values, minlength=len(unique_keys))
+
+        kinds = np.asarray(kinds, dtype=np.int8)
+        records = np.bincount(inverse, minlength=len(unique_keys))
+        any_float = np.bincount(inverse, weights=kinds == KIND_FLOAT, minlength=len(unique_keys)) > 0
+        merged_kinds = np.full(len(unique_keys), KIND_INT, dtype=np.int8)
+        single = np.flatnonzero(records[inverse] == 1)
+        merged_kinds[inverse[single]] = kinds[single]
+        merged_kinds[any_float] = KIND_FLOAT
+
+        n_cols = max(len(plots), 1)
+        return cls(species, plots, unique_keys // n_cols, unique_keys % n_cols, summed, merged_kinds, **stats)
+
+    @classmethod
+    def from_dict(cls, plot_data, plot_sort_key=None, **stats):
+        """由 {样地: {物种: 数量}} 构造矩阵"""
+        accumulator = SparseAccumulator()
+        for plot, species_counts in plot_data.items():
+            for species, count in species_counts.items():
+                accumulator.add(species, plot, count)
+        return accumulator.to_matrix(plot_sort_key=plot_sort_key, **stats)
+
+    @property
+    def nnz(self):
+        return len(self.values)
+
+    @property
+    def density(self):
+        cells = len(self.species) * len(self.plots)
+        return self.nnz / cells if cells else 0.0
+
+    def cell_values(self):
+        """所有记录的数量，按 kinds 转换为 Python 的 float、int 或 bool"""
+        cells = self.values.astype(object)
+        integral = self.kinds == KIND_INT
+        cells[integral] = self.values[integral].astype(np.int64).astype(object)
+        flags = self.kinds == KIND_BOOL
+        cells[flags] = self.values[flags].astype(bool).astype(object)
+        return cells.tolist()
+
+    def header(self):
+        return ['物种'] + self.plots
+
+    def rows(self):
+        """逐行生成 [物种, 各样地数量...]，只在导出时生成稠密行"""
+        n_plots = len(self.plots)
+        indptr = np.searchsorted(self.row_idx, np.arange(len(self.species) + 1))
+        cols = self.col_idx.tolist()
+        cells = self.cell_values()
+        for row, species in enumerate(self.species):
+            dense = [0] * n_plots
+            for k in range(indptr[row], indptr[row + 1]):
+                dense[cols[k]] = cells[k]
+            yield [species] + dense
+
+    def triplets(self):
+        """逐条生成 (物种, 样地, 数量)，只包含有记录的格子（长表格式）"""
+        for row, col, cell in zip(self.row_idx.tolist(), self.col_idx.tolist(), self.cell_values()):
+            yield self.species[row], self.plots[col], cell
+
+    def column_text_lengths(self):
+        """每列（含表头）最长的文本长度，用于设置列宽，只遍历有记录的格子"""
+        n_plots = len(self.plots)
+        lengths = [max([len('物种')] + [len(species) for species in self.species])]
+        lengths += [len(str(plot)) for plot in self.plots]
+
+        for col, cell in zip(self.col_idx.tolist(), self.cell_values()):
+            lengths[col + 1] = max(lengths[col + 1], len(str(cell)))
+
+        # 有物种未记录的列会输出0
+        recorded = np.bincount(self.col_idx, minlength=n_plots)
+        for col in np.flatnonzero(recorded < len(self.species)).tolist():
+            lengths[col + 1] = max(lengths[col + 1], 1)
+        return lengths
+
+    def to_dense(self):
+        """稠密的 float64 数组（物种×样地）"""
+        dense = np.zeros((len(self.species), len(self.plots)), dtype=np.float64)
+        dense[self.row_idx, self.col_idx] = self.values
+        return dense
+
+    def to_dataframe(self):
+        """稠密的 DataFrame：第一列为物种，其余为各样地；没有 float 记录的列为 int64"""
+        import pandas as pd
+
+        float_columns = np.zeros(len(self.plots), dtype=bool)
+        float_columns[self.col_idx[self.kinds == KIND_FLOAT]] = True
+
+        values_df = pd.DataFrame(self.to_dense(), columns=self.plots)
+        int_columns = [plot for plot, is_float in zip(self.plots, float_columns) if not is_float]
+        if int_columns:
+            values_df = values_df.astype({plot: np.int64 for plot in int_columns})
+
+        return pd.concat([pd.DataFrame({'物种': self.species}), values_df], axis=1)
+
+    def save_npz(self, path):
+        """保存为压缩的 npz：稀疏三元组 rows/cols/values/kinds 及物种/样地名称 species/plots"""
+        np.savez_compressed(
+            path,
+            species=np.array(self.species, dtype=str),
+            plots=np.array(self.plots, dtype=str),
+            rows=self.row_idx,
+            cols=self.col_idx,
+            values=self.values,
+            kinds=self.kinds,
+        )
+
+    @classmethod
+    def load_npz(cls, path):
+        """读取 save_npz 保存的矩阵"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                species=data['species'].tolist(),
+                plots=data['plots'].tolist(),
+                rows=data['rows'],
+                cols=data['cols'],
+                values=data['values'],
+                kinds=data['kinds'],
+            )
+
+    def to_scipy(self):
+        """转换为 scipy.sparse.csr_matrix（需要安装 scipy）"""
+        from scipy import sparse
+
+        return sparse.csr_matrix((self.values, (self.row_idx, self.col_idx)),
+                                 shape=(len(self.species), len(self.plots)))
+
+
+def combine_matrices(matrices, labels=None, plot_sort_key=None, keep_first=False):
+    """合并多个矩阵（如每个工作表一个），物种取并集
+
+    labels 不为空时样地编号加前缀 "<label>:<样地>"，各矩阵的样地按矩阵顺序排列、互不合并；
+    否则相同编号的样地合并为一列：keep_first=True 时以第一个包含该样地的矩阵为准，
+    否则数量相加（与把各矩阵的数据依次首尾相接后解析的结果一致）。
+    """
+    species = sorted(set().union(*(matrix.species for matrix in matrices)))
+    species_index = {name: row for row, name in enumerate(species)}
+
+    if labels:
+        plots = [f"{label}:{plot}" for label, matrix in zip(labels, matrices) for plot in matrix.plots]
+        offsets = np.cumsum([0] + [len(matrix.plots) for matrix in matrices])
+        col_maps = [np.arange(len(matrix.plots), dtype=np.int64) + offset
+                    for matrix, offset in zip(matrices, offsets)]
+        plot_owner = None
+    else:
+        plot_owner = {}
+        for k, matrix in enumerate(matrices):
+            for plot in matrix.plots:
+                plot_owner.setdefault(plot, k)
+        plots = sorted(plot_owner, key=plot_sort_key)
+        plot_index = {plot: col for col, plot in enumerate(plots)}
+        col_maps = [np.array([plot_index[plot] for plot in matrix.plots], dtype=np.int64) for matrix in matrices]
+
+    rows, cols, values, kinds = [], [], [], []
+    for k, (matrix, col_map) in enumerate(zip(matrices, col_maps)):
+        row_map = np.array([species_index[name] for name in matrix.species], dtype=np.int64)
+        keep = np.ones(matrix.nnz, dtype=bool)
+        if keep_first and plot_owner is not None:
+            owned = np.array([plot_owner[plot] == k for plot in matrix.plots], dtype=bool)
+            keep = owned[matrix.col_idx]
+        rows.append(row_map[matrix.row_idx[keep]])
+        cols.append(col_map[matrix.col_idx[keep]])
+        values.append(matrix.values[keep])
+        kinds.append(matrix.kinds[keep])
+
+    return SpeciesPlotMatrix.from_coo(
+        species=species,
+        plots=plots,
+        rows=np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+        cols=np.concatenate(cols) if cols else np.empty(0, dtype=np.int64),
+        values=np.concatenate(values) if values else np.empty(0),
+        kinds=np.concatenate(kinds) if kinds else np.empty(0, dtype=np.int8),
+        plot_counter=sum(matrix.plot_counter for matrix in matrices),
+        species_counter=sum(matrix.species_counter for matrix in matrices),
+    )
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""多个"物种"子表格 -> 物种×样方矩阵
+
+不依赖任何界面库，可直接作为库或命令行使用。
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .errors import DataFormatError
+from .numeric import coerce_numbers
+from .plotid import PlotId
+from .readers import open_sheet_rows, select_engine
+from .sparse import KIND_FLOAT, KIND_INT, CodeBook, SpeciesPlotMatrix
+from .tasks import ignore
+from .taxonomy import DEFAULT_NAMES, cache_kind
+
+
+def natural_sort_key(s):
+    """自然排序键函数，用于正确排序数字（解析结果缓存在 PlotId 中）"""
+    return PlotId(s).sort_key
+
+
+def locate_species_tables(df):
+    """一次性向量化扫描，定位所有"物种"表头及其表格边界
+
+    返回按行优先顺序排列的 (起始行, 起始列, 结束行) 列表，
+    结束行为下一个表格的起始行（不含），最后一个表格到数据末尾。
+    """
+    n_rows, n_cols = df.shape
+    if n_rows == 0 or n_cols == 0:
+        return []
+
+    # 对底层对象数组做一次哈希编码，只需对去重后的取值判断是否为表头
+    codes, uniques = pd.factorize(df.to_numpy(dtype=object).ravel())
+    header_codes = [code for code, value in enumerate(uniques)
+                    if isinstance(value, str) and value.strip() == '物种']
+    if not header_codes:
+        return []
+
+    flat_positions = np.flatnonzero(np.isin(codes, header_codes))
+    start_rows = flat_positions // n_cols
+    start_cols = flat_positions % n_cols
+
+    # 确定表格的结束位置（下一个表格开始或数据结束）
+    end_rows = np.append(start_rows[1:], n_rows)
+
+    return [(int(r), int(c), int(e)) for r, c, e in zip(start_rows, start_cols, end_rows)]
+
+
+def _read_table_block(df, start_row, start_col, end_row, species_names=None):
+    """一次切片读取单个子表格，返回 (表头列表, 物种名称列表, float64 数量数组)
+
+    物种列为空的行视为空行，整体用掩码剔除；数值区域一次性转换为数字，无法识别的单元格记为0。
+    物种名称经 species_names（taxonomy.SpeciesNames，默认只做规范化）去掉名称后的数量并转换为接受名。
+    """
+    # 提取表头（遇到第一个空单元格为止）
+    headers = []
+    for value in df.iloc[start_row, start_col:]:
+        cell_val = str(value)
+        if pd.isna(value) or cell_val == 'nan' or not cell_val.strip():
+            break
+        # 第一列为物种列，其余为样方编号（解析一次后驻留）
+        headers.append(PlotId(cell_val) if headers else cell_val)
+
+    # 物种列：空白单元格所在行直接丢弃
+    n_values = len(headers) - 1  # 减去物种列
+    # 提取物种名称（去除可能的数值，规范化后转换为接受名；相同的单元格只转换一次）
+    table_cell = (species_names or DEFAULT_NAMES).table_cell
+    names = [table_cell(cell) if cell != 'nan' else '' for cell in map(str, df.iloc[start_row + 1:end_row, start_col])]
+    keep = np.array([bool(name) for name in names], dtype=bool)
+    if not keep.any():
+        return headers, [], np.zeros((0, max(n_values, 0)))
+    names = [name for name in names if name]
+
+    # 数值区域整体切片，一次性向量化转换
+    block = df.iloc[start_row + 1:end_row, start_col + 1:start_col + 1 + n_values].to_numpy(dtype=object)[keep]
+    numbers, _ = coerce_numbers(block.ravel(), extract=False)
+    numbers = numbers.reshape(block.shape)
+
+    # 表格超出数据范围的列补0
+    if numbers.shape[1] < n_values:
+        numbers = np.pad(numbers, ((0, 0), (0, n_values - numbers.shape[1])))
+    return headers, names, numbers
+
+
+def _integral(numbers):
+    """可以输出为 int 的数量"""
+    return np.isfinite(numbers) & (numbers == np.floor(numbers)) & (np.abs(numbers) < 2 ** 63)
+
+
+def extract_table_block(df, start_row, start_col, end_row, species_names=None):
+    """一次切片提取单个子表格，返回 (表头列表, {物种名称: 数值列表})
+
+    物种列为空的行视为空行，整体用掩码剔除；数值区域一次性转换为数字，
+    无法识别的单元格记为0，整数值保留为 int。
+    """
+    headers, names, numbers = _read_table_block(df, start_row, start_col, end_row, species_names)
+    if not names:
+        return headers, {}
+
+    # 整数值输出为 int，其余保留 float
+    values = numbers.astype(object)
+    integral = _integral(numbers)
+    values[integral] = numbers[integral].astype(np.int64).astype(object)
+
+    return headers, dict(zip(names, values.tolist()))
+
+
+def encode_table_block(df, start_row, start_col, end_row, species, species_names=None):
+    """提取单个子表格，物种名称在读取时编码为物种字典 species（CodeBook）中的整数
+
+    返回 {'headers': 表头列表, 'species': 物种编码数组, 'values': 物种×样方 float64 数量数组,
+    'kinds': 对应的数值类型数组, 'species_names': 编码 -> 名称}；
+    同一表格中重复的物种与 extract_table_block 一致，以最后一行为准。
+    """
+    headers, names, numbers = _read_table_block(df, start_row, start_col, end_row, species_names)
+    codes = np.fromiter(map(species.code, names), dtype=np.int64, count=len(names))
+
+    unique_codes, last = np.unique(codes[::-1], return_index=True)
+    if len(unique_codes) < len(codes):
+        rows = np.sort(len(codes) - 1 - last)
+        codes, numbers = codes[rows], numbers[rows]
+
+    return {
+        'headers': headers,
+        'species': codes,
+        'values': numbers,
+        'kinds': np.where(_integral(numbers), KIND_INT, KIND_FLOAT).astype(np.int8),
+        'species_names': species.names,
+    }
+
+
+def merge_tables_sparse(all_tables_data):
+    """将所有子表格（encode_table_block 的结果）合并为稀疏的物种×样方矩阵（SpeciesPlotMatrix）
+
+    同一样方编号出现在多个表格中时，以第一个包含该样方的表格为准
+    （即使该表格中没有某个物种，也记为0）。只记录非零的数量。
+    合并只在整数编码上进行，物种名称只在排序时比较一次。
+    """
+    # 各表格的物种编码 -> 合并后的编码（同一次读取的表格共用一个物种字典）
+    species = CodeBook()
+    code_maps = {}
+    for table_info in all_tables_data.values():
+        names = table_info['species_names']
+        if id(names) not in code_maps:
+            code_maps[id(names)] = np.array([species.code(name) for name in names], dtype=np.int64)
+    table_codes = {table_key: code_maps[id(table_info['species_names'])][table_info['species']]
+                   for table_key, table_info in all_tables_data.items()}
+
+    # 按名称排序出现过的物种，建立 编码 -> 行号 映射
+    used = np.unique(np.concatenate(list(table_codes.values()))) if table_codes else np.empty(0, dtype=np.int64)
+    species_order = sorted(used.tolist(), key=species.names.__getitem__)
+    sorted_species = [species.names[code] for code in species_order]
+    species_rows = np.full(len(species), -1, dtype=np.int64)
+    species_rows[np.asarray(species_order, dtype=np.int64)] = np.arange(len(species_order), dtype=np.int64)
+
+    # 建立 样方编号 -> (表格, 列号) 索引，只保留第一次出现的位置
+    quadrat_owner = {}
+    for table_key, table_info in all_tables_data.items():
+        # 跳过物种列
+        for col, quadrat in enumerate(table_info['headers'][1:]):
+            quadrat_owner.setdefault(quadrat, (table_key, col))
+
+    # 按照自然顺序排序样方编号
+    sorted_quadrats = sorted(quadrat_owner, key=natural_sort_key)
+
+    # 按表格分组：每个表格负责写入的 (输出列, 表格列)
+    owned_columns = {}
+    for position, quadrat in enumerate(sorted_quadrats):
+        table_key, col = quadrat_owner[quadrat]
+        positions, cols = owned_columns.setdefault(table_key, ([], []))
+        positions.append(position)
+        cols.append(col)
+
+    # 每个表格只取一次整块，保留其中的非零记录
+    all_rows, all_cols, all_values, all_kinds = [], [], [], []
+    for table_key, (positions, cols) in owned_columns.items():
+        table_info = all_tables_data[table_key]
+        numbers = table_info['values'][:, cols]
+        kinds = table_info['kinds'][:, cols]
+
+        block_rows, block_cols = np.nonzero(numbers)
+        rows = species_rows[table_codes[table_key]]
+        all_rows.append(rows[block_rows])
+        all_cols.append(np.asarray(positions, dtype=np.int64)[block_cols])
+        all_values.append(numbers[block_rows, block_cols])
+        all_kinds.append(kinds[block_rows, block_cols])
+
+    return SpeciesPlotMatrix.from_coo(
+        species=sorted_species,
+        plots=sorted_quadrats,
+        rows=np.concatenate(all_rows) if all_rows else np.empty(0, dtype=np.int64),
+        cols=np.concatenate(all_cols) if all_cols else np.empty(0, dtype=np.int64),
+        values=np.concatenate(all_values) if all_values else np.empty(0),
+        kinds=np.concatenate(all_kinds) if all_kinds else np.empty(0, dtype=np.int8),
+    )
+
+
+def merge_tables(all_tables_data):
+    """将所有子表格合并为物种×样方矩阵，返回 (DataFrame, 排序后的样方编号)
+
+    合并在稀疏矩阵上完成，只在这里生成稠密的 DataFrame。
+    """
+    matrix = merge_tables_sparse(all_tables_data)
+    return matrix.to_dataframe(), matrix.plots
+
+
+def read_quadrat_tables(df, log=None, species_names=None):
+    """识别工作表中的所有子表格，返回 {'Table_N': 子表格}（见 encode_table_block）
+
+    所有子表格共用一个物种字典：每个不同的物种名称只保存一次，表格中只保存整数编码。
+    species_names 为 taxonomy.SpeciesNames（同义名表），物种名称读取时转换为接受名。
+    """
+    log = log or ignore
+
+    # 查找所有"物种"表头，这些是表格的起始位置
+    table_blocks = locate_species_tables(df)
+    species_positions = [(start_row, start_col) for start_row, start_col, _ in table_blocks]
+
+    log(f"找到 {len(species_positions)} 个表格起始位置: {species_positions}")
+
+    if not species_positions:
+        raise DataFormatError("未找到包含'物种'的表头，请检查文件格式")
+
+    # 处理每个表格
+    all_tables_data = {}
+    species = CodeBook()
+
+    for idx, (start_row, start_col, end_row) in enumerate(table_blocks):
+        log(f"处理表格 {idx + 1}, 起始位置: ({start_row}, {start_col})")
+
+        # 按块提取表头和数据
+        table_info = encode_table_block(df, start_row, start_col, end_row, species, species_names)
+
+        log(f"表格 {idx + 1} 表头: {table_info['headers']}")
+
+        # 存储表格数据
+        if len(table_info['species']):
+            all_tables_data[f'Table_{idx + 1}'] = table_info
+
+    if not all_tables_data:
+        raise DataFormatError("未能提取到有效数据")
+
+    return all_tables_data
+
+
+def read_sheet(file_path, sheet_name=0, engine='auto'):
+    """读取Excel文件的一个工作表（默认第一个，不带表头）
+
+    engine 见 readers 模块：openpyxl/calamine 由 pandas 读取；xml（直接解析工作表 XML）
+    和 text（CSV/TSV 文本）逐行读取后，按 pandas 读取 Excel 的规则生成相同的 DataFrame。
+    """
+    engine = select_engine(file_path, engine)
+    if engine not in ('xml', 'text'):
+        return pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
+
+    _, rows = open_sheet_rows(file_path, sheet_name=sheet_name, engine=engine)
+    try:
+        return frame_from_rows(rows)
+    finally:
+        rows.close()
+
+
+def frame_from_rows(rows):
+    """逐行的单元格取值 -> DataFrame（不带表头），与 pd.read_excel(header=None) 的结果一致
+
+    与 pandas 的 openpyxl 读取方式相同：空单元格记为 ""，整数值的数字转换为 int，
+    去掉行尾的空单元格和末尾的空行，各行补齐到相同宽度后交给 TextParser 推断列类型。
+    """
+    from pandas.io.parsers import TextParser
+
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(rows):
+        converted_row = [_convert_cell(value) for value in row]
+        while converted_row and converted_row[-1] == "":
+            converted_row.pop()
+        if converted_row:
+            last_row_with_data = row_number
+        data.append(converted_row)
+    data = data[:last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+
+    max_width = max(len(row) for row in data)
+    data = [row + [""] * (max_width - len(row)) for row in data]
+    return TextParser(data, header=None, skip_blank_lines=False).read()
+
+
+def _convert_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.startswith('#') and value in _EXCEL_ERRORS:
+        return np.nan
+    return value
+
+
+# Excel 错误值（pandas 读取为 NaN）
+_EXCEL_ERRORS = {'#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'}
+
+
+def build_merged_matrix(file_path, log=None, cache=None, engine='auto', species_names=None):
+    """读取Excel文件并将所有子表格合并为稀疏矩阵，返回 (矩阵, 表格数量)
+
+    cache 为 ParseCache 时，同一文件再次处理直接使用缓存的合并结果；
+    engine 为读取后端（见 readers 模块）；species_names 为同义名表（taxonomy.SpeciesNames）。
+    """
+    log = log or ignore
+
+    kind = cache_kind('tables', species_names)
+    cached = cache.load(file_path, kind) if cache is not None else None
+    if cached:
+        matrix, meta = cached
+        log("使用缓存的解析结果，跳过读取Excel")
+        return matrix, meta['tables']
+
+    df = read_sheet(file_path, engine=engine)
+    log(f"原始数据形状: {df.shape}")
+
+    all_tables_data = read_quadrat_tables(df, log=log, species_names=species_names)
+    matrix = merge_tables_sparse(all_tables_data)
+    log(f"排序后的样方编号: {matrix.plots}")
+
+    if cache is not None:
+        cache.store(file_path, kind, matrix, {'tables': len(all_tables_data)})
+    return matrix, len(all_tables_data)
+
+
+def merge_quadrat_tables(file_path, log=None, cache=None, engine='auto', species_names=None):
+    """读取Excel文件并将其中所有子表格合并为物种×样方矩阵 DataFrame"""
+    matrix, _ = build_merged_matrix(file_path, log=log, cache=cache, engine=engine, species_names=species_names)
+    return matrix.to_dataframe()
+
+
+def default_output_path(file_path, suffix="_植物矩阵", extension=".xlsx"):
+    """生成 "<原文件名>_植物矩阵.xlsx" 输出路径，已存在时追加序号避免覆盖
+
+    extension 为输出格式的扩展名（如 .parquet，见 writers.COLUMNAR_FORMATS）。
+    """
+    output_path = os.path.splitext(file_path)[0] + suffix + extension
+
+    counter = 1
+    original_output = output_path
+    while os.path.exists(output_path):
+        output_path = f"{os.path.splitext(original_output)[0]}_{counter}{extension}"
+        counter += 1
+    return output_path
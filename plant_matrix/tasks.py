@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""各处理流程共用的工具：未提供回调时的空函数，进程池并行执行任务"""
+import os
+
+from .errors import ProcessingCancelled
+
+
+def ignore(*args, **kwargs):
+    """未提供 log/progress 回调时使用"""
+
+
+def worker_count(workers, n_tasks):
+    """实际使用的进程数：workers 为空时为CPU核数，不超过任务数（至少为1）"""
+    return min(workers or os.cpu_count() or 1, max(n_tasks, 1))
+
+
+def run_tasks(func, items, workers=1, should_stop=None, errors=()):
+    """对每个 item 执行 func(item)，按完成顺序生成 (下标, 结果)
+
+    workers=1 时在当前进程中依次执行，否则用进程池并行执行；
+    should_stop() 返回 True 时取消尚未开始的任务并抛出 ProcessingCancelled；
+    errors 中的异常类型作为结果返回，不中断其余任务。
+    """
+    if workers == 1:
+        for index, item in enumerate(items):
+            if should_stop and should_stop():
+                raise ProcessingCancelled()
+            try:
+                outcome = func(item)
+            except errors as e:
+                outcome = e
+            yield index, outcome
+        return
+
+    # 只在并行执行时导入（plots/writers 等模块也从这里导入 ignore）
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            if should_stop and should_stop():
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise ProcessingCancelled()
+            try:
+                outcome = future.result()
+            except errors as e:
+                outcome = e
+            yield futures[future], outcome
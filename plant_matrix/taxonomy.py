@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""物种名称规范化与本地同义名表
+
+读取时每个物种名称单元格都经过 SpeciesNames.canonical：
+
+1. Unicode NFKC 规范化（全角字母/数字/空格转为半角），删除零宽字符；
+2. 连续空白（含全角空格、制表符、换行）合并为一个空格，去除首尾空白；
+3. 加载了同义名表时，拆分"代码 名称"：第一个词含数字（如 "CAR001 Carex tristachya"）
+   且后面还有名称时，代码只用于查找同义名表，结果中只保留名称；
+4. 按同义名表查找接受名：先查代码，再查名称（不区分大小写、忽略 "."），
+   找不到时使用规范化后的名称。
+
+没有同义名表时只做第1、2步，不拆分代码："A1 白茅" 与 "白茅" 仍是不同的物种，
+除空白和全角字符外与原来的处理方式（只去除首尾空白）结果相同。
+
+结果按原始字符串记忆（LRU）：同一文件中重复出现的名称只规范化一次，
+百万行数据中每个不同的原始写法只处理一次，其余都是一次字典查找。
+
+同义名表为本地的 Excel/CSV/TSV 文件（见 SpeciesNames.load）：每行第一列为接受名，
+其余各列为该物种的其他写法或代码，例如
+
+    接受名              同义名/代码
+    Carex tristachya    Carex tristachya Thunb.    CARTRI    大披针薹草
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from functools import lru_cache
+
+from .errors import DataFormatError
+
+# 记忆的不同原始写法数上限
+MEMO_SIZE = 1 << 16
+
+# 同义名表第一行的第一个单元格为以下之一时视为表头
+HEADER_CELLS = {'接受名', '物种', '物种名称', 'accepted', 'accepted name', 'accepted_name', 'name'}
+
+# 零宽空格/连接符、字节顺序标记（从网页或 Word 复制时常见）
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff'))
+
+_CODE = re.compile(r'[A-Za-z0-9._-]*\d[A-Za-z0-9._-]*')
+_NUMBER = re.compile(r'[+-]?\d+(\.\d+)?')
+
+
+def normalize_text(text):
+    """NFKC 规范化、删除零宽字符、合并空白"""
+    return ' '.join(unicodedata.normalize('NFKC', str(text)).translate(_ZERO_WIDTH).split())
+
+
+def lookup_key(text):
+    """同义名表的查找键：不区分大小写，忽略 "." """
+    return text.casefold().replace('.', '')
+
+
+def split_code(text):
+    """拆分已规范化的 "代码 名称"，返回 (代码, 名称)；没有代码时代码为空"""
+    code, _, name = text.partition(' ')
+    if name and _CODE.fullmatch(code):
+        return code, name
+    return '', text
+
+
+def strip_counts(text):
+    """去掉已规范化名称末尾的数值（子表格的物种列中名称后可能跟着数量）"""
+    words = text.split(' ')
+    while len(words) > 1 and _NUMBER.fullmatch(words[-1]):
+        words.pop()
+    return ' '.join(words)
+
+
+class SpeciesNames:
+    """物种名称规范化（带记忆）和同义名 -> 接受名 的查找
+
+    synonyms: {查找键(lookup_key): 接受名}，通常由 load() 从同义名表读取；
+              为空时只做规范化（不拆分代码、不查表）。
+    fingerprint: 同义名表内容的短哈希，用于区分缓存/检查点（没有同义名时为空字符串）。
+    canonical(raw) 用于单独一列的物种名称；table_cell(raw) 用于子表格的物种列，
+    先去掉名称后的数量。两者都按原始字符串记忆结果。
+    """
+
+    def __init__(self, synonyms=None):
+        self.synonyms = dict(synonyms or {})
+        self.fingerprint = _fingerprint(self.synonyms)
+        self.canonical = lru_cache(maxsize=MEMO_SIZE)(self._canonical)
+        self.table_cell = lru_cache(maxsize=MEMO_SIZE)(self._table_cell)
+
+    def __reduce__(self):
+        # 传给工作进程时只传同义名表，记忆在各进程中重新建立
+        return SpeciesNames, (self.synonyms,)
+
+    @classmethod
+    def load(cls, path):
+        """读取同义名表（Excel/CSV/TSV，格式见模块说明）
+
+        同一写法对应多个不同的接受名时抛出 DataFormatError。
+        """
+        from .readers import open_sheet_rows
+
+        synonyms = {}
+        _, rows = open_sheet_rows(path)
+        try:
+            for row_number, row in enumerate(rows, 1):
+                cells = [normalize_text(_cell_text(cell)) for cell in row if cell is not None]
+                cells = [cell for cell in cells if cell]
+                if not cells or (row_number == 1 and cells[0].casefold() in HEADER_CELLS):
+                    continue
+
+                accepted = cells[0]
+                for variant in cells:
+                    key = lookup_key(variant)
+                    if synonyms.setdefault(key, accepted) != accepted:
+                        raise DataFormatError(
+                            f"同义名表第 {row_number} 行: '{variant}' 已对应接受名 '{synonyms[key]}'，"
+                            f"不能再对应 '{accepted}'"
+                        )
+        finally:
+            rows.close()
+        return cls(synonyms)
+
+    def _canonical(self, raw):
+        return self._resolve(normalize_text(raw))
+
+    def _table_cell(self, raw):
+        return self._resolve(strip_counts(normalize_text(raw)))
+
+    def _resolve(self, text):
+        if not self.synonyms:
+            return text
+        code, name = split_code(text)
+        if code and lookup_key(code) in self.synonyms:
+            return self.synonyms[lookup_key(code)]
+        return self.synonyms.get(lookup_key(name), name)
+
+
+def _fingerprint(synonyms):
+    # 同义名表内容的短哈希（用于区分缓存/检查点），没有同义名时为空字符串
+    if not synonyms:
+        return ''
+    data = json.dumps(sorted(synonyms.items()), ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _cell_text(cell):
+    # 代码列读取为数字时（如 1001.0）按整数写法查找
+    if isinstance(cell, float) and cell.is_integer():
+        return str(int(cell))
+    return str(cell)
+
+
+# 未指定同义名表时共用的规范化器（只做规范化、不拆分代码，记忆在同一进程内的所有文件间共享）
+DEFAULT_NAMES = SpeciesNames()
+
+
+def cache_kind(kind, species_names):
+    """缓存项的类型：使用同义名表时附加其指纹，不同的同义名表分别缓存"""
+    if species_names is not None and species_names.fingerprint:
+        return f"{kind}-{species_names.fingerprint}"
+    return kind
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""矩阵结果输出"""
+import csv
+import importlib.util
+import os
+
+import numpy as np
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from .errors import ProcessingCancelled
+from .sparse import KIND_FLOAT
+from .tasks import ignore
+
+
+def write_species_plot_matrix(matrix, output_path, log=None, progress=None, should_stop=None, auto_width=True,
+                              streaming=False):
+    """将物种×样地矩阵保存为Excel文件
+
+    auto_width=True 时按每列最长的文本长度设置列宽，列数很多时可关闭以节省时间。
+    streaming=True 时使用 openpyxl 只写模式逐行写出，内存占用与矩阵大小无关。
+    输出文件扩展名为 .csv 时逐行写出 CSV 宽表（UTF-8 带 BOM），其余选项不起作用。
+    """
+    log = log or ignore
+    progress = progress or ignore
+
+    if is_csv_output(output_path):
+        log(f"保存结果到: {output_path}")
+        progress(95, "正在保存文件...")
+        _write_csv(output_path, matrix.header(), matrix.rows(), should_stop)
+        return
+
+    if streaming:
+        output_wb, output_sheet = _create_write_only_sheet("物种样地矩阵")
+        # 只写模式下列宽必须在写入数据前设置，直接由矩阵数据计算
+        if auto_width:
+            apply_column_widths(output_sheet, matrix.column_text_lengths())
+    else:
+        # 创建新的工作簿
+        output_wb = openpyxl.Workbook()
+        output_sheet = output_wb.active
+        output_sheet.title = "物种样地矩阵"
+
+    # 写入表头（样地为列）
+    header = matrix.header()
+    output_sheet.append(header)
+    max_lengths = [len(str(value)) for value in header]
+    track_widths = auto_width and not streaming
+
+    # 写入数据（物种为行）
+    for row in matrix.rows():
+        if should_stop and should_stop():
+            raise ProcessingCancelled()
+        output_sheet.append(row)
+        if track_widths:
+            # 写入的同时记录每列最长的文本长度
+            max_lengths = list(map(max, max_lengths, [len(str(value)) for value in row]))
+
+    # 自动调整列宽
+    if track_widths:
+        log("优化表格格式...")
+        apply_column_widths(output_sheet, max_lengths)
+
+    # 保存结果
+    log(f"保存结果到: {output_path}")
+    progress(95, "正在保存文件...")
+    output_wb.save(output_path)
+
+
+def write_dataframe(df, output_path, streaming=False):
+    """将 DataFrame（不含索引）保存为Excel文件
+
+    streaming=True 时使用 openpyxl 只写模式逐行写出，不为整张表构建单元格对象。
+    """
+    if not streaming:
+        df.to_excel(output_path, index=False, engine='openpyxl')
+        return
+
+    output_wb, output_sheet = _create_write_only_sheet("Sheet1")
+    output_sheet.append(_bold_header(output_sheet, df.columns))
+    for row in df.itertuples(index=False, name=None):
+        output_sheet.append(row)
+
+    output_wb.save(output_path)
+
+
+def write_quadrat_matrix(matrix, output_path, streaming=False):
+    """将物种×样方矩阵保存为Excel文件（样方表格整合工具的输出，格式与 write_dataframe 相同）
+
+    streaming=True 时使用 openpyxl 只写模式直接逐行写出矩阵，不生成稠密 DataFrame，
+    内存占用与矩阵大小无关；否则经 DataFrame 用 pandas 写出。
+    输出文件扩展名为 .csv 时逐行写出 CSV 宽表（UTF-8 带 BOM）。
+    """
+    if is_csv_output(output_path):
+        _write_csv(output_path, matrix.header(), matrix.rows())
+        return
+
+    if not streaming:
+        write_dataframe(matrix.to_dataframe(), output_path)
+        return
+
+    output_wb, output_sheet = _create_write_only_sheet("Sheet1")
+    output_sheet.append(_bold_header(output_sheet, matrix.header()))
+    for row in matrix.rows():
+        output_sheet.append(row)
+
+    output_wb.save(output_path)
+
+
+def write_long_format(matrix, output_path, log=None):
+    """将稀疏矩阵按长表（物种, 样地, 数量）输出，只写出有记录的格子
+
+    输出文件扩展名为 .csv 时写出 CSV（UTF-8 带 BOM，Excel 可直接打开），否则用只写模式写出Excel。
+    """
+    log = log or ignore
+    header = ['物种', '样地', '数量']
+
+    log(f"保存长表结果到: {output_path}（{matrix.nnz} 条记录）")
+    if is_csv_output(output_path):
+        _write_csv(output_path, header, matrix.triplets())
+        return
+
+    output_wb, output_sheet = _create_write_only_sheet("长表")
+    output_sheet.append(header)
+    for triplet in matrix.triplets():
+        output_sheet.append(triplet)
+    output_wb.save(output_path)
+
+
+# 按输出文件扩展名选择的列式格式（不受 Excel 16384 列的限制）
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.npz': 'npz',
+}
+
+
+def is_csv_output(output_path):
+    return os.path.splitext(output_path)[1].lower() == '.csv'
+
+
+def is_columnar_output(output_path):
+    return os.path.splitext(output_path)[1].lower() in COLUMNAR_FORMATS
+
+
+def write_columnar(matrix, output_path, long_format=False, log=None):
+    """按扩展名将矩阵保存为 Parquet、Feather（Arrow IPC）或压缩的 NPZ
+
+    Parquet/Feather 默认为宽表（物种 + 各样地列），long_format=True 时为长表
+    （物种, 样地, 数量，物种和样地为字典编码），需要安装 pyarrow；
+    NPZ 保存稀疏三元组及物种/样地名称（见 SpeciesPlotMatrix.save_npz），不需要额外依赖。
+    """
+    log = log or ignore
+    output_format = COLUMNAR_FORMATS[os.path.splitext(output_path)[1].lower()]
+
+    log(f"保存结果到: {output_path}")
+    if output_format == 'npz':
+        matrix.save_npz(output_path)
+        return
+
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError("输出 Parquet/Feather 文件需要安装 pyarrow（pip install pyarrow）")
+
+    if long_format:
+        df = long_dataframe(matrix)
+    else:
+        df = matrix.to_dataframe()
+        # Arrow 要求列名为字符串（合并工具的样方编号可能是整数）
+        df.columns = [str(column) for column in df.columns]
+    if output_format == 'parquet':
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_feather(output_path)
+
+
+def long_dataframe(matrix):
+    """长表 DataFrame（物种, 样地, 数量），只包含有记录的格子；物种/样地为分类类型"""
+    import pandas as pd
+
+    values = matrix.values
+    if not (matrix.kinds == KIND_FLOAT).any():
+        values = values.astype(np.int64)
+    return pd.DataFrame({
+        '物种': pd.Categorical.from_codes(matrix.row_idx, categories=matrix.species),
+        '样地': pd.Categorical.from_codes(matrix.col_idx, categories=[str(plot) for plot in matrix.plots]),
+        '数量': values,
+    })
+
+
+def _write_csv(output_path, header, rows, should_stop=None):
+    # UTF-8 带 BOM，Excel 可直接打开
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            if should_stop and should_stop():
+                raise ProcessingCancelled()
+            writer.writerow(row)
+
+
+def _bold_header(sheet, names):
+    # 只写模式下的加粗表头，与 pandas 默认输出保持一致
+    header = []
+    for name in names:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    return header
+
+
+def _create_write_only_sheet(title):
+    output_wb = openpyxl.Workbook(write_only=True)
+    output_sheet = output_wb.create_sheet(title)
+    return output_wb, output_sheet
+
+
+def apply_column_widths(sheet, max_lengths):
+    """按每列最长文本长度设置列宽"""
+    for col_idx, max_length in enumerate(max_lengths, 1):
+        sheet.column_dimensions[get_column_letter(col_idx)].width = (max_length + 2) * 1.2
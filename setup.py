@@ -7,13 +7,23 @@ setup(
     description='物种数据整理工具',
     author='Your Name',
     author_email='your.email@example.com',
-    packages=find_packages(),
+    packages=find_packages(include=['plant_matrix', 'plant_matrix.*']),
+    py_modules=['species_processor', 'plant_matrix_tool'],
     install_requires=[
         'openpyxl>=3.0.10',
+        'pandas',
+        'numpy',
     ],
+    extras_require={
+        # 可选的快速读取后端（--engine calamine）
+        'calamine': ['python-calamine'],
+        # 可选的列式输出格式（.parquet / .feather）
+        'parquet': ['pyarrow'],
+    },
     entry_points={
         'console_scripts': [
             'species-processor=species_processor:main',
+            'plant-matrix=plant_matrix.cli:main',
         ],
     },
     classifiers=[
@@ -21,5 +31,5 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.9',
 )
\ No newline at end of file
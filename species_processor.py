@@ -1,22 +1,96 @@
 # -*- coding: utf-8 -*-
+import multiprocessing
 import os
-import re
+import queue
 import sys
 import threading
 import tkinter as tk
-from collections import defaultdict
 from tkinter import ttk, filedialog, messagebox
 
-import openpyxl
-from openpyxl.utils import get_column_letter
+# 解析/写出模块依赖 numpy、openpyxl，在工作线程中第一次处理时才导入，窗口可以立即显示
+from plant_matrix import DataFormatError, ProcessingCancelled
+from plant_matrix.cache import describe_cache
+
+
+class UiMessageBus:
+    """工作线程 -> 界面线程的日志/进度通道
+
+    任意线程只向队列投递消息；界面线程按固定帧率用 root.after 取出，
+    同一帧内的日志合并为一次插入，进度只保留最新值，其他界面操作在界面线程执行。
+    """
+
+    FRAME_MS = 50  # 刷新间隔（约20帧/秒）
+    MAX_LOG_LINES = 5000  # 日志窗口保留的最大行数
+
+    def __init__(self, root, log_text, progress, progress_label):
+        self.root = root
+        self.log_text = log_text
+        self.progress = progress
+        self.progress_label = progress_label
+        self.queue = queue.SimpleQueue()
+        self.root.after(self.FRAME_MS, self.drain)
+
+    def log(self, message):
+        self.queue.put(('log', message))
+
+    def set_progress(self, value, message=None):
+        self.queue.put(('progress', value, message))
+
+    def call(self, func, *args, **kwargs):
+        """在界面线程中执行 func(*args, **kwargs)"""
+        self.queue.put(('call', func, args, kwargs))
+
+    def drain(self):
+        lines = []
+        latest_progress = None
+        try:
+            while True:
+                item = self.queue.get_nowait()
+                if item[0] == 'log':
+                    lines.append(item[1])
+                elif item[0] == 'progress':
+                    latest_progress = item[1:]
+                else:
+                    # 界面操作前先输出已收到的日志，保证顺序
+                    self._flush(lines, latest_progress)
+                    lines, latest_progress = [], None
+                    func, args, kwargs = item[1:]
+                    func(*args, **kwargs)
+        except queue.Empty:
+            pass
+
+        self._flush(lines, latest_progress)
+        self.root.after(self.FRAME_MS, self.drain)
+
+    def _flush(self, lines, latest_progress):
+        if lines:
+            skipped = len(lines) - self.MAX_LOG_LINES
+            if skipped > 0:
+                lines = [f"...（省略 {skipped} 条日志）"] + lines[skipped:]
+
+            self.log_text.configure(state=tk.NORMAL)
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            # 只保留最近的日志，避免文本控件无限增长
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > self.MAX_LOG_LINES:
+                self.log_text.delete('1.0', f'{line_count - self.MAX_LOG_LINES}.0')
+            self.log_text.see(tk.END)
+            self.log_text.configure(state=tk.DISABLED)
+
+        if latest_progress:
+            value, message = latest_progress
+            self.progress['value'] = value
+            if message:
+                self.progress_label.config(text=message)
 
 
 class SpeciesProcessorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("物种数据整理工具")
-        self.root.geometry("800x600")
+        self.root.geometry("900x710")
         self.setup_ui()
+        self.bus = UiMessageBus(self.root, self.log_text, self.progress, self.progress_label)
         self.running = False  # 添加运行状态标志
 
     def setup_ui(self):
@@ -43,7 +117,7 @@ class SpeciesProcessorApp:
             pady=10
         )
         description.insert(tk.END, "使用说明：\n")
-        description.insert(tk.END, "1. 输入文件应为Excel格式，包含原始物种数据\n")
+        description.insert(tk.END, "1. 输入文件为Excel格式，或制表符/逗号分隔的文本（.tsv/.csv/.txt，可为.gz压缩）\n")
         description.insert(tk.END, "2. 数据格式要求：每个样地以'物种名称\\t样地编号'开头，后跟物种列表\n")
         description.insert(tk.END, "3. 程序会自动合并相同物种的数量，并生成物种-样地矩阵\n")
         description.insert(tk.END, "4. 植物名称和代码在同一列，样地为列标题\n")
@@ -78,6 +152,113 @@ class SpeciesProcessorApp:
             command=self.browse_output_file
         ).pack(side=tk.RIGHT)
 
+        # 同义名表（可选）：物种名称读取时转换为接受名
+        synonyms_frame = ttk.Frame(main_frame)
+        synonyms_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(synonyms_frame, text="同义名表(可选):").pack(side=tk.LEFT, padx=(0, 10))
+        self.synonyms_entry = ttk.Entry(synonyms_frame, width=50)
+        self.synonyms_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+
+        ttk.Button(
+            synonyms_frame,
+            text="浏览...",
+            command=self.browse_synonyms_file
+        ).pack(side=tk.RIGHT)
+
+        # 读取/解析选项
+        option_frame = ttk.Frame(main_frame)
+        option_frame.pack(fill=tk.X)
+
+        self.streaming_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            option_frame,
+            text="流式读取（逐行读取，适合大文件，内存占用低）",
+            variable=self.streaming_var
+        ).pack(side=tk.LEFT)
+
+        self.cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            option_frame,
+            text=f"使用解析缓存（{describe_cache()}）",
+            variable=self.cache_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            option_frame,
+            text="增量处理（只解析新增的行）",
+            variable=self.incremental_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        self.verbose_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            option_frame,
+            text="详细日志（逐条记录物种）",
+            variable=self.verbose_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        # 多工作表选项
+        sheet_option_frame = ttk.Frame(main_frame)
+        sheet_option_frame.pack(fill=tk.X, pady=(5, 0))
+
+        self.all_sheets_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            sheet_option_frame,
+            text="处理所有工作表（每个工作表并行解析后合并）",
+            variable=self.all_sheets_var
+        ).pack(side=tk.LEFT)
+
+        self.sheet_prefix_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            sheet_option_frame,
+            text="样地编号加工作表名前缀",
+            variable=self.sheet_prefix_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        self.chunked_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            sheet_option_frame,
+            text="大文件分块并行解析",
+            variable=self.chunked_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        # 读取后端：auto 时流式读取 .xlsx 直接解析工作表XML，其余已安装 python-calamine 时用 calamine
+        ttk.Label(sheet_option_frame, text="读取引擎:").pack(side=tk.LEFT, padx=(20, 5))
+        self.engine_var = tk.StringVar(value="auto")
+        ttk.Combobox(
+            sheet_option_frame,
+            textvariable=self.engine_var,
+            values=("auto", "openpyxl", "xml", "calamine"),
+            state="readonly",
+            width=9
+        ).pack(side=tk.LEFT)
+
+        # 输出选项
+        output_option_frame = ttk.Frame(main_frame)
+        output_option_frame.pack(fill=tk.X, pady=(5, 0))
+
+        self.auto_width_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            output_option_frame,
+            text="自动调整列宽",
+            variable=self.auto_width_var
+        ).pack(side=tk.LEFT)
+
+        self.streaming_output_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            output_option_frame,
+            text="流式写出（低内存）",
+            variable=self.streaming_output_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        self.long_format_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            output_option_frame,
+            text="输出长表（物种, 样地, 数量）",
+            variable=self.long_format_var
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
         # 处理按钮
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(pady=20)
@@ -146,7 +327,11 @@ class SpeciesProcessorApp:
     def browse_input_file(self):
         file_path = filedialog.askopenfilename(
             title="选择输入文件",
-            filetypes=[("Excel文件", "*.xlsx *.xls"), ("所有文件", "*.*")]
+            filetypes=[
+                ("Excel文件", "*.xlsx *.xls"),
+                ("文本文件", "*.csv *.tsv *.txt *.csv.gz *.tsv.gz *.txt.gz"),
+                ("所有文件", "*.*")
+            ]
         )
         if file_path:
             self.input_entry.delete(0, tk.END)
@@ -154,6 +339,8 @@ class SpeciesProcessorApp:
 
             # 自动生成输出文件名
             dir_name, file_name = os.path.split(file_path)
+            if file_name.lower().endswith(".gz"):
+                file_name = file_name[:-3]
             base_name = os.path.splitext(file_name)[0]
             output_path = os.path.join(dir_name, f"{base_name}_矩阵.xlsx")
             self.output_entry.delete(0, tk.END)
@@ -162,25 +349,37 @@ class SpeciesProcessorApp:
     def browse_output_file(self):
         file_path = filedialog.asksaveasfilename(
             title="保存输出文件",
-            filetypes=[("Excel文件", "*.xlsx"), ("所有文件", "*.*")],
+            filetypes=[("Excel文件", "*.xlsx"), ("CSV文件", "*.csv"), ("Parquet文件", "*.parquet"),
+                       ("Feather文件", "*.feather"), ("NumPy稀疏矩阵", "*.npz"), ("所有文件", "*.*")],
             defaultextension=".xlsx"
         )
         if file_path:
             self.output_entry.delete(0, tk.END)
             self.output_entry.insert(0, file_path)
 
+    def browse_synonyms_file(self):
+        # 每行第一列为接受名，其余各列为同义名或代码
+        file_path = filedialog.askopenfilename(
+            title="选择同义名表",
+            filetypes=[("Excel/CSV文件", "*.xlsx *.csv *.tsv *.txt"), ("所有文件", "*.*")]
+        )
+        if file_path:
+            self.synonyms_entry.delete(0, tk.END)
+            self.synonyms_entry.insert(0, file_path)
+
     def log_message(self, message):
-        self.log_text.configure(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state=tk.DISABLED)
-        self.root.update()
+        # 可在任意线程调用，只投递到队列，由界面线程批量显示
+        self.bus.log(message)
 
     def update_progress(self, value, message=None):
-        self.progress['value'] = value
-        if message:
-            self.progress_label.config(text=message)
-        self.root.update()
+        self.bus.set_progress(value, message)
+
+    def finish_processing(self, status):
+        """处理结束后恢复界面状态（在界面线程执行）"""
+        if status:
+            self.status_var.set(status)
+        self.process_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
 
     def stop_processing(self):
         self.running = False
@@ -222,6 +421,20 @@ class SpeciesProcessorApp:
             thread = threading.Thread(
                 target=self.process_data_thread,
                 args=(input_path, output_path),
+                kwargs=dict(
+                    streaming=self.streaming_var.get(),
+                    verbose=self.verbose_var.get(),
+                    auto_width=self.auto_width_var.get(),
+                    streaming_output=self.streaming_output_var.get(),
+                    long_format=self.long_format_var.get(),
+                    use_cache=self.cache_var.get(),
+                    incremental=self.incremental_var.get(),
+                    all_sheets=self.all_sheets_var.get(),
+                    sheet_prefix=self.sheet_prefix_var.get(),
+                    chunked=self.chunked_var.get(),
+                    engine=self.engine_var.get(),
+                    synonyms_path=self.synonyms_entry.get(),
+                ),
                 daemon=True
             )
             thread.start()
@@ -234,225 +447,110 @@ class SpeciesProcessorApp:
             self.stop_btn.config(state=tk.DISABLED)
             self.running = False
 
-    def process_data_thread(self, input_path, output_path):
+    def process_data_thread(self, input_path, output_path, streaming=True, verbose=False, auto_width=True,
+                            streaming_output=False, long_format=False, use_cache=False, incremental=False,
+                            all_sheets=False, sheet_prefix=False, chunked=False, engine="auto", synonyms_path=""):
+        # 工作线程不直接操作界面，所有输出都经由 self.bus
+        status = None
         try:
-            # 读取原始数据
-            self.log_message("读取Excel文件...")
-            self.update_progress(5, "正在读取文件...")
-
-            # 使用openpyxl读取Excel
-            wb = openpyxl.load_workbook(input_path, data_only=True)
-            sheet = wb.active
-
-            # 数据预处理
-            self.log_message("解析数据...")
-            self.update_progress(10, "正在解析数据...")
-            current_plot = None
-            plot_data = defaultdict(dict)  # 存储每个样地的物种数据
-            all_species = set()  # 所有唯一物种集合
-            plot_counter = 0  # 样地计数器
-            species_counter = 0  # 物种记录计数器
-
-            total_rows = sheet.max_row
-            processed_rows = 0
-            last_progress = 0
-
-            # 样地识别模式
-            plot_patterns = [
-                r'[0-9]+-[0-9]+-[0-9]+',  # 1-1-1 格式
-                r'[0-9]+-[0-9]+',  # 1-1 格式
-                r'[0-9]+'  # 1 格式
-            ]
+            from plant_matrix.cache import ParseCache
+            from plant_matrix.incremental import checkpoint_path_for
+            from plant_matrix.plots import build_species_plot_matrix
+            from plant_matrix.sheets import build_species_plot_matrix_sheets
+            from plant_matrix.taxonomy import SpeciesNames
+            from plant_matrix.writers import (
+                is_columnar_output,
+                write_columnar,
+                write_long_format,
+                write_species_plot_matrix,
+            )
 
-            for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
-                if not self.running:
-                    self.log_message("处理已中断")
-                    return
-
-                # 跳过空行
-                if not row or all(cell is None for cell in row):
-                    processed_rows += 1
-                    continue
-
-                # 更新进度（每10行或10%更新一次）
-                processed_rows += 1
-                current_progress = 10 + int(70 * processed_rows / total_rows)
-                if current_progress > last_progress + 5 or row_idx == total_rows:
-                    self.update_progress(
-                        current_progress,
-                        f"处理中: {processed_rows}/{total_rows} 行"
-                    )
-                    last_progress = current_progress
-
-                # 检查是否为样地行
-                is_plot_row = False
-                if row[0] and isinstance(row[0], str) and "物种名称" in row[0]:
-                    # 尝试匹配多种样地编号格式
-                    for pattern in plot_patterns:
-                        plot_match = re.search(pattern, str(row[0]))
-                        if plot_match:
-                            current_plot = plot_match.group()
-                            self.log_message(f"发现样地: {current_plot}")
-                            plot_counter += 1
-                            is_plot_row = True
-                            break
-
-                    # 如果第一列包含"物种名称"关键词
-                    if not is_plot_row and len(row) > 1 and row[1]:
-                        # 尝试从第二列获取样地编号
-                        current_plot = str(row[1]).strip()
-                        self.log_message(f"发现样地: {current_plot}")
-                        plot_counter += 1
-                        is_plot_row = True
-
-                if is_plot_row:
-                    continue
-
-                # 处理物种数据行
-                if current_plot and row[0] and isinstance(row[0], str):
-                    species_name = str(row[0]).strip()
-
-                    if not species_name or "物种名称" in species_name:
-                        continue
-
-                    # 获取数量值
-                    count = 0
-                    if len(row) > 1 and row[1] is not None:
-                        # 尝试直接转换为数字
-                        if isinstance(row[1], (int, float)):
-                            count = row[1]
-                        else:
-                            try:
-                                # 尝试转换字符串为数字
-                                count = float(str(row[1]))
-                            except (ValueError, TypeError):
-                                # 从字符串中提取数字
-                                num_str = re.search(r'[\d.]+', str(row[1]))
-                                if num_str:
-                                    try:
-                                        count = float(num_str.group())
-                                    except:
-                                        count = 0
-                                else:
-                                    count = 0
-                    elif len(row) > 1 and row[1] is not None and isinstance(row[1], (int, float)):
-                        # 如果第二列是数字，可能是数量值
-                        count = row[1]
-
-                    # 统计原始数据行数
-                    species_counter += 1
-
-                    # 累加相同物种的数量
-                    if species_name in plot_data[current_plot]:
-                        # 如果物种已存在，累加数量
-                        plot_data[current_plot][species_name] += count
-                        self.log_message(
-                            f"  累加物种: {species_name} + {count} = {plot_data[current_plot][species_name]}")
-                    else:
-                        # 如果物种不存在，添加新记录
-                        plot_data[current_plot][species_name] = count
-                        self.log_message(f"  添加物种: {species_name} = {count}")
-
-                    # 添加到总物种集合
-                    all_species.add(species_name)
-
-            if not current_plot:
-                messagebox.showerror("错误", "未找到样地数据！请检查文件格式")
-                return
-
-            # 创建唯一物种列表并排序
-            unique_species = sorted(all_species)
-            self.log_message(f"发现 {len(unique_species)} 个唯一物种")
-            self.log_message(f"发现 {plot_counter} 个样地")
-            self.log_message(f"处理了 {species_counter} 条物种记录")
+            species_names = None
+            if synonyms_path:
+                species_names = SpeciesNames.load(synonyms_path)
+                self.log_message(f"同义名表: {len(species_names.synonyms)} 个写法 -> "
+                                 f"{len(set(species_names.synonyms.values()))} 个接受名")
+
+            # 读取并解析原始数据
+            if all_sheets:
+                # 每个工作表在独立进程中解析后合并
+                matrix = build_species_plot_matrix_sheets(
+                    input_path,
+                    sheet_prefix=sheet_prefix,
+                    streaming=streaming,
+                    engine=engine,
+                    species_names=species_names,
+                    log=self.log_message,
+                    progress=self.update_progress,
+                    should_stop=lambda: not self.running
+                )
+            else:
+                matrix = build_species_plot_matrix(
+                    input_path,
+                    streaming=streaming,
+                    log=self.log_message,
+                    progress=self.update_progress,
+                    should_stop=lambda: not self.running,
+                    verbose=verbose,
+                    cache=ParseCache() if use_cache else None,
+                    checkpoint_path=checkpoint_path_for(output_path) if incremental else None,
+                    # 分块并行解析：在样地边界处切分，使用全部CPU核
+                    workers=None if chunked else 1,
+                    engine=engine,
+                    species_names=species_names
+                )
 
             # 创建矩阵数据结构
             self.log_message("创建物种-样地矩阵...")
             self.update_progress(85, "正在生成矩阵...")
-
-            # 对样地排序（按数字顺序）
-            def plot_key(plot):
-                parts = plot.split('-')
-                try:
-                    return tuple(int(part) for part in parts)
-                except ValueError:
-                    return tuple(part for part in parts)
-
-            sorted_plots = sorted(plot_data.keys(), key=plot_key)
-
-            # 创建新的工作簿
-            output_wb = openpyxl.Workbook()
-            output_sheet = output_wb.active
-            output_sheet.title = "物种样地矩阵"
-
-            # 写入表头（样地为列）
-            header = ['物种'] + sorted_plots
-            output_sheet.append(header)
-
-            # 写入数据（物种为行）
-            for species in unique_species:
-                if not self.running:
-                    self.log_message("处理已中断")
-                    return
-
-                row = [species]
-                for plot in sorted_plots:
-                    # 获取该物种在该样地的总数量
-                    count = plot_data[plot].get(species, 0)
-                    row.append(count)
-                output_sheet.append(row)
-
-            # 自动调整列宽
-            self.log_message("优化表格格式...")
-            for col_idx, _ in enumerate(header, 1):
-                col_letter = get_column_letter(col_idx)
-                max_length = 0
-                for row in output_sheet.iter_rows(min_row=1, max_row=output_sheet.max_row, min_col=col_idx,
-                                                  max_col=col_idx):
-                    for cell in row:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                adjusted_width = (max_length + 2) * 1.2
-                output_sheet.column_dimensions[col_letter].width = adjusted_width
-
-            # 保存结果
-            self.log_message(f"保存结果到: {output_path}")
-            self.update_progress(95, "正在保存文件...")
-            output_wb.save(output_path)
+            if is_columnar_output(output_path):
+                write_columnar(matrix, output_path, long_format=long_format, log=self.log_message)
+            elif long_format:
+                # 长表直接由稀疏记录写出，不生成稠密矩阵
+                write_long_format(matrix, output_path, log=self.log_message)
+            else:
+                write_species_plot_matrix(
+                    matrix,
+                    output_path,
+                    log=self.log_message,
+                    progress=self.update_progress,
+                    should_stop=lambda: not self.running,
+                    auto_width=auto_width,
+                    streaming=streaming_output
+                )
 
             # 完成
             self.log_message("数据处理完成!")
-            self.log_message(f"包含物种数量: {len(unique_species)}")
-            self.log_message(f"包含样地数量: {len(plot_data)}")
-            self.log_message(f"原始物种记录数: {species_counter}")
+            self.log_message(f"包含物种数量: {len(matrix.species)}")
+            self.log_message(f"包含样地数量: {len(matrix.plots)}")
+            self.log_message(f"原始物种记录数: {matrix.species_counter}")
             self.update_progress(100, "处理完成!")
 
-            messagebox.showinfo("完成", f"数据处理完成!\n结果已保存到: {output_path}")
-            self.status_var.set("处理完成")
+            self.bus.call(messagebox.showinfo, "完成", f"数据处理完成!\n结果已保存到: {output_path}")
+            status = "处理完成"
+
+        except ProcessingCancelled:
+            self.log_message("处理已中断")
+
+        except DataFormatError as e:
+            self.bus.call(messagebox.showerror, "错误", str(e))
 
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             self.log_message(f"处理过程中发生错误: {str(e)}")
             self.log_message("详细错误信息:")
-            self.log_text.configure(state=tk.NORMAL)
-            self.log_text.insert(tk.END, error_trace)
-            self.log_text.configure(state=tk.DISABLED)
-            self.log_text.see(tk.END)
+            self.log_message(error_trace)
 
-            messagebox.showerror("处理错误", f"处理过程中发生错误:\n{str(e)}")
-            self.status_var.set("处理失败")
+            self.bus.call(messagebox.showerror, "处理错误", f"处理过程中发生错误:\n{str(e)}")
+            status = "处理失败"
 
         finally:
-            self.process_btn.config(state=tk.NORMAL)
-            self.stop_btn.config(state=tk.DISABLED)
             self.running = False
+            self.bus.call(self.finish_processing, status)
 
 
-if __name__ == "__main__":
+def main():
     # 创建主窗口
     root = tk.Tk()
 
@@ -468,5 +566,17 @@ if __name__ == "__main__":
     # 创建应用实例
     app = SpeciesProcessorApp(root)
 
+    # 测量启动时间（build.py）：窗口第一次绘制完成后立即退出
+    if os.environ.get("PLANT_MATRIX_EXIT_AFTER_START"):
+        root.update()
+        root.destroy()
+        return
+
     # 启动主循环
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    # 打包后多进程解析工作表所需
+    multiprocessing.freeze_support()
+    main()
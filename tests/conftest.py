@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""测试共用的小规模合成工作簿（benchmarks/synthetic.py）和矩阵比较"""
+import re
+import zipfile
+
+import numpy as np
+import pytest
+
+from synthetic import make_workbook
+
+# 物种数, 样地数, 密度：几秒内完成所有测试
+SMALL_SCALE = (60, 300, 0.05)
+
+
+def assert_same_matrix(expected, actual):
+    """两个 SpeciesPlotMatrix 的物种、样地、记录和计数完全一致"""
+    assert expected.species == actual.species
+    assert expected.plots == actual.plots
+    for name in ('row_idx', 'col_idx', 'values', 'kinds'):
+        assert np.array_equal(getattr(expected, name), getattr(actual, name)), name
+    assert (expected.plot_counter, expected.species_counter) == (actual.plot_counter, actual.species_counter)
+
+
+def set_dimension(path, ref):
+    """改写工作簿中所有工作表记录的表格尺寸 <dimension ref=...>（模拟非 Excel 程序写出的不准确尺寸）"""
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in parts.items():
+            if name.startswith('xl/worksheets/sheet'):
+                data = re.sub(rb'<dimension [^>]*/>', b'', data)
+                anchor = b'<sheetViews' if b'<sheetViews' in data else b'<sheetData'
+                data = data.replace(anchor, b'<dimension ref="' + ref.encode() + b'"/>' + anchor, 1)
+            archive.writestr(name, data)
+
+
+@pytest.fixture(scope='session')
+def blocks_workbook(tmp_path_factory):
+    """"物种名称 <样地>" 格式的工作簿"""
+    path = tmp_path_factory.mktemp('workbooks') / 'blocks.xlsx'
+    make_workbook(str(path), 'blocks', *SMALL_SCALE)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def tables_workbook(tmp_path_factory):
+    """多个"物种"子表格的工作簿"""
+    path = tmp_path_factory.mktemp('workbooks') / 'tables.xlsx'
+    make_workbook(str(path), 'tables', *SMALL_SCALE)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def stale_blocks_workbook(tmp_path_factory):
+    """记录的尺寸为 ref="A1" 的"物种名称 <样地>"工作簿"""
+    path = tmp_path_factory.mktemp('workbooks') / 'stale_blocks.xlsx'
+    make_workbook(str(path), 'blocks', *SMALL_SCALE)
+    set_dimension(str(path), 'A1')
+    return str(path)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""解析缓存：命中缓存的结果与直接解析一致，损坏的缓存按未命中处理，超过上限时淘汰最旧的缓存项"""
+import os
+
+from conftest import assert_same_matrix
+from plant_matrix.cache import ParseCache
+from plant_matrix.plots import build_species_plot_matrix
+from plant_matrix.tables import build_merged_matrix
+
+
+def test_plots_cache_hit_matches_direct_parse(blocks_workbook, tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    expected = build_species_plot_matrix(blocks_workbook)
+
+    first = build_species_plot_matrix(blocks_workbook, cache=cache)
+    logs = []
+    second = build_species_plot_matrix(blocks_workbook, cache=cache, log=logs.append)
+
+    assert any("使用缓存" in message for message in logs)
+    assert_same_matrix(expected, first)
+    assert_same_matrix(expected, second)
+
+
+def test_tables_cache_hit_matches_direct_merge(tables_workbook, tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    expected, n_tables = build_merged_matrix(tables_workbook)
+
+    build_merged_matrix(tables_workbook, cache=cache)
+    cached, cached_tables = build_merged_matrix(tables_workbook, cache=cache)
+
+    assert cached_tables == n_tables
+    assert_same_matrix(expected, cached)
+
+
+def test_corrupt_entry_is_a_miss(blocks_workbook, tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    matrix = build_species_plot_matrix(blocks_workbook, cache=cache)
+    entry_path = cache.entry_path(blocks_workbook, 'plots')
+    with open(entry_path, 'wb') as f:
+        f.write(b'not an npz file')
+
+    assert cache.load(blocks_workbook, 'plots') is None
+    assert not os.path.exists(entry_path)
+    assert_same_matrix(matrix, build_species_plot_matrix(blocks_workbook, cache=cache))
+
+
+def test_evicts_least_recently_used(blocks_workbook, tables_workbook, tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    build_species_plot_matrix(blocks_workbook, cache=cache)
+    build_merged_matrix(tables_workbook, cache=cache)
+    plots_entry = cache.entry_path(blocks_workbook, 'plots')
+    os.utime(plots_entry, (0, 0))
+
+    # 超出上限1字节：只需淘汰最久未使用的一项
+    cache.max_bytes = cache.total_bytes() - 1
+    cache.evict()
+
+    assert not os.path.exists(plots_entry)
+    assert os.path.exists(cache.entry_path(tables_workbook, 'tables'))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""分块并行解析：各种分块大小和进程数下结果与顺序解析完全一致"""
+import pytest
+
+from conftest import assert_same_matrix
+from plant_matrix.chunked import parse_rows_chunked, split_blocks
+from plant_matrix.plots import PlotSpeciesParser, build_species_plot_matrix
+from plant_matrix.readers import open_sheet_rows
+
+
+def sequential(rows):
+    parser = PlotSpeciesParser()
+    for row in rows:
+        parser.feed(row)
+    return parser.to_matrix()
+
+
+def sheet_rows(path):
+    _, rows = open_sheet_rows(path)
+    try:
+        return list(rows)
+    finally:
+        rows.close()
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 100, 10 ** 6])
+def test_chunk_sizes_match_sequential(blocks_workbook, chunk_rows):
+    rows = sheet_rows(blocks_workbook)
+    assert_same_matrix(sequential(rows), parse_rows_chunked(rows, workers=1, chunk_rows=chunk_rows))
+
+
+def test_worker_processes_match_sequential(blocks_workbook):
+    expected = build_species_plot_matrix(blocks_workbook, workers=1)
+    assert_same_matrix(expected, build_species_plot_matrix(blocks_workbook, workers=2))
+
+
+def test_header_without_plot_id_stays_in_previous_block():
+    # 取不到样地编号的"物种名称"行不切换样地，其后的物种（和重复记录）仍属于上一个样地
+    rows = [
+        ("物种名称", "1-1"), ("狗尾草", 2), ("白茅", "3株"),
+        ("物种名称", None), ("狗尾草", 1.5),
+        ("物种名称", "1-2"), ("白茅", None), ("狗尾草", "约4"),
+        ("物种名称 2-1", None), ("狗尾草", 1),
+    ]
+    expected = sequential(rows)
+    for chunk_rows in (1, 2, 5):
+        assert_same_matrix(expected, parse_rows_chunked(rows, workers=1, chunk_rows=chunk_rows))
+
+
+def test_split_blocks_cuts_at_plot_starts():
+    assert split_blocks([0, 3, 5, 9], 12, chunk_rows=4) == [(0, 5), (5, 9), (9, 12)]
+    assert split_blocks([2], 12, chunk_rows=4) == [(2, 12)]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""增量处理：从检查点继续解析追加的行，结果与完整处理一致"""
+import pytest
+
+from conftest import assert_same_matrix
+from plant_matrix.plots import build_species_plot_matrix
+from synthetic import make_survey
+
+
+def survey_lines(n_plots, seed=0):
+    """"物种名称 <样地>" 格式的 TSV 行"""
+    _, plots, records = make_survey(40, n_plots, density=0.1, seed=seed)
+    lines = []
+    for plot in plots:
+        lines.append(f"物种名称\t{plot}\n")
+        lines.extend(f"{name}\t{count}\n" for name, count in records[plot])
+    return lines
+
+
+@pytest.fixture
+def survey(tmp_path):
+    lines = survey_lines(120)
+    path = tmp_path / 'survey.tsv'
+    checkpoint_path = str(tmp_path / 'survey.checkpoint.npz')
+    return path, lines, checkpoint_path
+
+
+def test_resume_after_append_matches_full_parse(survey):
+    path, lines, checkpoint_path = survey
+    path.write_text(''.join(lines[:len(lines) // 2]), encoding='utf-8')
+    build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path)
+
+    # 追加剩余的行（断点恰好在某个样地中间）
+    path.write_text(''.join(lines), encoding='utf-8')
+    logs = []
+    resumed = build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path, log=logs.append)
+
+    assert any("从检查点继续" in message for message in logs)
+    assert_same_matrix(build_species_plot_matrix(str(path)), resumed)
+
+
+def test_modified_rows_trigger_full_rebuild(survey):
+    path, lines, checkpoint_path = survey
+    path.write_text(''.join(lines), encoding='utf-8')
+    build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path)
+
+    # 修改已处理部分的一个数量
+    lines[1] = lines[1].split('\t')[0] + "\t999\n"
+    path.write_text(''.join(lines), encoding='utf-8')
+    logs = []
+    rebuilt = build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path, log=logs.append)
+
+    assert any("重新完整处理" in message for message in logs)
+    assert_same_matrix(build_species_plot_matrix(str(path)), rebuilt)
+
+
+def test_verbose_resume_keeps_running_totals(tmp_path):
+    path = tmp_path / 'survey.tsv'
+    checkpoint_path = str(tmp_path / 'survey.checkpoint.npz')
+    path.write_text("物种名称\t1-1\n狗尾草\t2\n", encoding='utf-8')
+    build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path, verbose=True)
+
+    path.write_text("物种名称\t1-1\n狗尾草\t2\n狗尾草\t3\n白茅\t1\n", encoding='utf-8')
+    logs = []
+    build_species_plot_matrix(str(path), checkpoint_path=checkpoint_path, verbose=True, log=logs.append)
+
+    assert "  累加物种: 狗尾草 + 3 = 5" in logs
+    assert "  添加物种: 白茅 = 1" in logs
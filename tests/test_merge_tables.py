@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""子表格合并的回归测试：索引合并（merge_tables）与原 process_excel_file 中的合并步骤结果完全一致"""
+import re
+
+import pandas as pd
+import pytest
+
+from bench_merge_tables import encode_tables, make_tables
+from plant_matrix.tables import merge_tables
+
+
+def legacy_natural_sort_key(s):
+    """原 plant_matrix_tool 中的 natural_sort_key"""
+    return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', s)]
+
+
+def legacy_merge(all_tables_data):
+    """原 process_excel_file 中的合并步骤"""
+    all_species = set()
+    for table_info in all_tables_data.values():
+        all_species.update(table_info['data'].keys())
+
+    all_quadrats = set()
+    for table_info in all_tables_data.values():
+        for header in table_info['headers'][1:]:
+            all_quadrats.add(header)
+
+    sorted_quadrats = sorted(all_quadrats, key=legacy_natural_sort_key)
+
+    merged_data = []
+    for species in sorted(all_species):
+        row = {'物种': species}
+        for quadrat in sorted_quadrats:
+            found_value = 0
+            for table_info in all_tables_data.values():
+                headers = table_info['headers'][1:]
+                if quadrat in headers:
+                    quadrat_index = headers.index(quadrat)
+                    species_data = table_info['data'].get(species, [0] * len(headers))
+                    if quadrat_index < len(species_data):
+                        found_value = species_data[quadrat_index]
+                        break
+            row[quadrat] = found_value
+        merged_data.append(row)
+
+    result_df = pd.DataFrame(merged_data)
+    cols = ['物种'] + sorted_quadrats
+    return result_df[cols], sorted_quadrats
+
+
+@pytest.mark.parametrize('n_species, n_quadrats, n_tables', [(50, 100, 4), (200, 500, 10), (30, 300, 20)])
+def test_merge_matches_legacy(n_species, n_quadrats, n_tables):
+    tables = make_tables(n_species, n_quadrats, n_tables)
+
+    result_df, sorted_quadrats = merge_tables(encode_tables(tables))
+    expected_df, expected_quadrats = legacy_merge(tables)
+
+    assert sorted_quadrats == expected_quadrats
+    pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+def test_first_table_wins_for_shared_quadrat():
+    tables = {
+        'Table_1': {'headers': ['物种', '1-1-1', '1-1-2'], 'data': {'A': [1, 2]}},
+        'Table_2': {'headers': ['物种', '1-1-2', '1-1-10'], 'data': {'A': [9, 3], 'B': [0.5, 4]}},
+    }
+
+    result_df, sorted_quadrats = merge_tables(encode_tables(tables))
+
+    assert sorted_quadrats == ['1-1-1', '1-1-2', '1-1-10']
+    assert result_df.set_index('物种').loc['A'].tolist() == [1, 2, 3]
+    pd.testing.assert_frame_equal(result_df, legacy_merge(tables)[0])
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""数量单元格整列转换：与逐格解析（原实现 / coerce_cell）结果一致"""
+import random
+
+import numpy as np
+import pytest
+
+from bench_recognizers import COUNT_CORPUS, legacy_parse_count
+from plant_matrix.numeric import coerce_cell, coerce_numbers
+
+
+def mixed_column(n=2000, seed=0):
+    """大部分为数值、夹杂文本的列，顺序随机"""
+    rng = random.Random(seed)
+    return [rng.choice(COUNT_CORPUS) if rng.random() < 0.3 else rng.choice([1, 2.5, None, 0, 7])
+            for _ in range(n)]
+
+
+@pytest.mark.parametrize('column', [COUNT_CORPUS, mixed_column(), [1, 2.5, None, True]],
+                         ids=['corpus', 'mixed', 'plain'])
+def test_coerce_numbers_matches_legacy(column):
+    numbers, valid = coerce_numbers(column)
+
+    assert numbers.tolist() == [float(legacy_parse_count(value)) for value in column]
+    assert valid.tolist() == [coerce_cell(value) == coerce_cell(value) for value in column]
+
+
+@pytest.mark.parametrize('extract', [True, False])
+def test_object_array_input_matches_per_cell(extract):
+    column = np.array(mixed_column(seed=1), dtype=object)
+
+    numbers, valid = coerce_numbers(column, extract=extract)
+
+    expected = np.array([coerce_cell(value, extract) for value in column])
+    assert valid.tolist() == (~np.isnan(expected)).tolist()
+    assert numbers.tolist() == np.nan_to_num(expected, nan=0.0, posinf=np.inf).tolist()
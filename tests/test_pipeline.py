@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""分阶段流水线（benchmarks/bench_pipeline.py）的小规模测试：每个阶段的结果与生成的调查记录一致"""
+import openpyxl
+import pytest
+
+from bench_pipeline import PIPELINES, STAGES, compare, triplets
+from conftest import SMALL_SCALE
+from synthetic import make_survey
+
+
+@pytest.fixture(scope='module')
+def expected_totals():
+    """生成工作簿所用的调查记录，同一样地中的重复记录数量相加"""
+    _, _, records = make_survey(*SMALL_SCALE)
+    totals = {}
+    for plot, plot_records in records.items():
+        for name, count in plot_records:
+            totals[(name, plot)] = totals.get((name, plot), 0) + count
+    return totals
+
+
+def run_stages(layout, path, output_path):
+    return {stage: matrix for stage, matrix in PIPELINES[layout](path, output_path, 'auto')}
+
+
+@pytest.mark.parametrize('layout', list(PIPELINES))
+def test_stages_match_survey(request, tmp_path, expected_totals, layout):
+    path = request.getfixturevalue(f'{layout}_workbook')
+    output_path = tmp_path / 'matrix.xlsx'
+    results = run_stages(layout, path, str(output_path))
+
+    assert tuple(results) == STAGES
+    matrix = results['merge']
+    assert triplets(matrix) == {key: float(count) for key, count in expected_totals.items()}
+
+    # 写出的矩阵：表头为样地，每行一个物种，未出现的格子为0
+    rows = list(openpyxl.load_workbook(output_path, read_only=True).active.iter_rows(values_only=True))
+    assert [str(plot) for plot in rows[0][1:]] == [str(plot) for plot in matrix.plots]
+    written = {(row[0], str(plot)): value for row in rows[1:] for plot, value in zip(rows[0][1:], row[1:]) if value}
+    assert written == expected_totals
+
+
+def test_layouts_give_same_matrix(tmp_path, blocks_workbook, tables_workbook):
+    blocks = run_stages('blocks', blocks_workbook, str(tmp_path / 'blocks.xlsx'))['write']
+    tables = run_stages('tables', tables_workbook, str(tmp_path / 'tables.xlsx'))['write']
+    assert triplets(blocks) == triplets(tables)
+
+
+def test_compare_reports_slower_stages():
+    baseline = {'blocks/10x10x0.1': {'read': 1.0, 'parse': 1.0}}
+    results = {'blocks/10x10x0.1': {'read': 1.1, 'parse': 1.5, 'write': 9.0}, 'tables/10x10x0.1': {'read': 9.0}}
+    assert compare(results, baseline, 0.2) == [('blocks/10x10x0.1', 'parse', 1.0, 1.5)]
+
+
+def test_compare_ignores_timing_noise():
+    baseline = {'blocks/10x10x0.1': {'merge': 0.001, 'write': 1.0}}
+    results = {'blocks/10x10x0.1': {'merge': 0.003, 'write': 2.0}}
+    assert compare(results, baseline, 0.2, min_seconds=0.05) == [('blocks/10x10x0.1', 'write', 1.0, 2.0)]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""样地编号：驻留、排序键，以及不再使用的编号从驻留表中释放"""
+import gc
+import pickle
+
+from plant_matrix.plotid import PlotId, plot_sort_key
+
+
+def test_interned_and_equal_to_plain_string():
+    plot = PlotId("1-1-2")
+    assert PlotId(''.join(["1-1", "-2"])) is plot
+    assert plot == "1-1-2" and hash(plot) == hash("1-1-2")
+    assert plot.sort_key == ('', 1, '-', 1, '-', 2, '')
+    assert pickle.loads(pickle.dumps(plot)) is plot
+
+
+def test_sorts_mixed_ids_naturally():
+    plots = ["1-10", "A1", "1-2", "a-3", "2"]
+    assert sorted(plots, key=plot_sort_key) == ["1-2", "1-10", "2", "A1", "a-3"]
+
+
+def test_unused_ids_are_released():
+    text = "释放测试-1"
+    plot = PlotId(text)
+    assert text in PlotId._interned
+    del plot
+    gc.collect()
+    assert text not in PlotId._interned
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""读取后端：各后端读取同一工作簿得到相同的行，活动工作表的选择一致"""
+import gzip
+import shutil
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from conftest import assert_same_matrix, set_dimension
+from plant_matrix.plots import build_species_plot_matrix
+from plant_matrix import readers
+from plant_matrix.readers import _active_sheet_index, list_sheet_names, open_sheet_rows, select_engine
+from plant_matrix.tables import read_sheet
+
+
+def read_all(path, **kwargs):
+    _, rows = open_sheet_rows(path, **kwargs)
+    try:
+        return [tuple(row) for row in rows]
+    finally:
+        rows.close()
+
+
+def trim(rows):
+    # 各后端对行尾空单元格的处理不同，比较时去掉
+    trimmed = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] is None:
+            row.pop()
+        trimmed.append(tuple(row))
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+@pytest.fixture(scope='module')
+def two_sheet_workbook(tmp_path_factory):
+    """两张工作表，第二张为活动工作表"""
+    path = tmp_path_factory.mktemp('readers') / 'active.xlsx'
+    wb = openpyxl.Workbook()
+    wb.active.append(("物种名称", "1-1"))
+    second = wb.create_sheet('第二张')
+    second.append(("物种名称", "2-1"))
+    second.append(("狗尾草", 3))
+    second.append(("白茅", 1.5))
+    wb.active = 1
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize('workbook', ['blocks_workbook', 'tables_workbook'])
+def test_xml_engine_matches_openpyxl(request, workbook):
+    path = request.getfixturevalue(workbook)
+    assert trim(read_all(path, engine='xml')) == trim(read_all(path, engine='openpyxl'))
+
+
+def test_engines_read_active_sheet(two_sheet_workbook):
+    expected = [("物种名称", "2-1"), ("狗尾草", 3), ("白茅", 1.5)]
+    assert _active_sheet_index(two_sheet_workbook) == 1
+    assert list_sheet_names(two_sheet_workbook, engine='xml') == ['Sheet', '第二张']
+    for engine in ('xml', 'openpyxl'):
+        assert trim(read_all(two_sheet_workbook, engine=engine)) == expected
+        assert trim(read_all(two_sheet_workbook, sheet_name=0, engine=engine)) == [("物种名称", "1-1")]
+
+
+def test_active_sheet_of_non_zip_workbook_is_first(tmp_path):
+    # .xls（BIFF）等非 zip 格式无法读取 workbook.xml，不应抛出 BadZipFile
+    path = tmp_path / 'old.xls'
+    path.write_bytes(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + bytes(504))
+    assert _active_sheet_index(str(path)) == 0
+    assert select_engine(str(path)) in ('calamine', 'openpyxl')
+
+
+def test_calamine_matches_xml(blocks_workbook, two_sheet_workbook):
+    pytest.importorskip('python_calamine')
+    for path in (blocks_workbook, two_sheet_workbook):
+        assert trim(read_all(path, engine='calamine')) == trim(read_all(path, engine='xml'))
+
+
+def test_text_engine_converts_like_excel(tmp_path):
+    path = tmp_path / 'survey.tsv.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write("物种名称\t1-1\n狗尾草\t3\n白茅\t1.5\n针茅\t\n标记\tTRUE\n")
+    assert list_sheet_names(str(path)) == ['survey']
+    assert read_all(str(path)) == [("物种名称", "1-1"), ("狗尾草", 3), ("白茅", 1.5), ("针茅", None),
+                                   ("标记", True)]
+
+
+def test_text_engine_reads_gb18030(tmp_path):
+    path = tmp_path / 'survey.csv'
+    path.write_bytes("物种名称,1-1\n狗尾草,3株\n".encode('gb18030'))
+    assert read_all(str(path)) == [("物种名称", "1-1"), ("狗尾草", "3株")]
+
+
+def test_openpyxl_streaming_ignores_stale_dimension(blocks_workbook, stale_blocks_workbook):
+    # 记录的尺寸只有 A1 时仍读取全部数据（与完整模式和 pandas 一致）
+    expected = trim(read_all(blocks_workbook, engine='openpyxl', streaming=False))
+    assert trim(read_all(stale_blocks_workbook, engine='openpyxl')) == expected
+    assert trim(read_all(stale_blocks_workbook, engine='openpyxl', streaming=False)) == expected
+    assert_same_matrix(build_species_plot_matrix(blocks_workbook),
+                       build_species_plot_matrix(stale_blocks_workbook, engine='openpyxl'))
+
+
+@pytest.mark.parametrize('ref', ['A1', 'A1:B3'])
+def test_xml_engine_ignores_stale_dimension(blocks_workbook, tables_workbook, stale_blocks_workbook, tmp_path, ref):
+    # 记录的尺寸过小时仍读取全部行和列（与 pandas 的 reset_dimensions 一致）
+    for source in (blocks_workbook, tables_workbook):
+        path = str(tmp_path / 'stale.xlsx')
+        shutil.copy(source, path)
+        set_dimension(path, ref)
+        assert trim(read_all(path, engine='xml')) == trim(read_all(source, engine='openpyxl', streaming=False))
+
+    pd.testing.assert_frame_equal(read_sheet(path, engine='xml'), pd.read_excel(path, header=None))
+    assert_same_matrix(build_species_plot_matrix(blocks_workbook),
+                       build_species_plot_matrix(stale_blocks_workbook, engine='xml'))
+
+
+def test_auto_engine_keeps_streaming_xlsx_on_xml(blocks_workbook, tmp_path, monkeypatch):
+    # 安装 calamine（整张工作表一次读入）后，流式读取 .xlsx 仍使用内存占用有限的 xml 后端
+    monkeypatch.setattr(readers, 'calamine_available', lambda: True)
+    xls_path = tmp_path / 'old.xls'
+    xls_path.write_bytes(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + bytes(504))
+
+    assert select_engine(blocks_workbook) == 'xml'
+    assert select_engine(blocks_workbook, streaming=False) == 'calamine'
+    assert select_engine(str(xls_path)) == 'calamine'
+    assert select_engine(blocks_workbook, engine='calamine') == 'calamine'
+    assert select_engine('survey.tsv.gz') == 'text'
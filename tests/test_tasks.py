@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""进程池任务：顺序与并行执行的结果一致，指定的异常作为结果返回，可以取消"""
+import pytest
+
+from plant_matrix.errors import DataFormatError, ProcessingCancelled
+from plant_matrix.tasks import run_tasks, worker_count
+
+
+def square(value):
+    if value < 0:
+        raise DataFormatError(f"负数: {value}")
+    return value * value
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_results_by_index(workers):
+    items = [3, -1, 2, 5]
+    results = dict(run_tasks(square, items, workers, errors=DataFormatError))
+    assert sorted(results) == [0, 1, 2, 3]
+    assert [results[k] for k in (0, 2, 3)] == [9, 4, 25]
+    assert isinstance(results[1], DataFormatError)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_other_errors_propagate(workers):
+    with pytest.raises(DataFormatError):
+        list(run_tasks(square, [1, -1], workers))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_should_stop_cancels(workers):
+    with pytest.raises(ProcessingCancelled):
+        list(run_tasks(square, range(10), workers, should_stop=lambda: True))
+
+
+def test_worker_count():
+    assert worker_count(4, 2) == 2
+    assert worker_count(None, 0) == 1
+    assert worker_count(1, 10) == 1
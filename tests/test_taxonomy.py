@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""物种名称规范化：没有同义名表时与原处理方式一致，加载同义名表后合并同义名和代码"""
+import pickle
+
+import pandas as pd
+import pytest
+
+from plant_matrix.errors import DataFormatError
+from plant_matrix.plots import PlotSpeciesParser
+from plant_matrix.tables import read_quadrat_tables
+from plant_matrix.taxonomy import DEFAULT_NAMES, SpeciesNames
+
+# 原处理方式下的常见写法（只去除首尾空白）
+NAMES = ["Carex tristachya", " 白茅 ", "CAR001 Carex tristachya", "A1 白茅", "Poa sp.", "SP0001 物种1", "狗尾草\n"]
+
+
+def legacy_plot_name(cell):
+    # 原物种数据整理工具
+    return str(cell).strip()
+
+
+def legacy_table_name(cell):
+    # 原样方表格整合工具：物种名称后可能跟着数量
+    return cell.split()[0] if ' ' in cell else cell
+
+
+def test_default_matches_legacy_plot_names():
+    assert [DEFAULT_NAMES.canonical(cell) for cell in NAMES] == [legacy_plot_name(cell) for cell in NAMES]
+    # 只统一空白和全角字符
+    assert DEFAULT_NAMES.canonical("Carex　 tristachya") == "Carex tristachya"
+    assert DEFAULT_NAMES.canonical("ＣＡＲ００１") == "CAR001"
+
+
+def test_default_keeps_codes_in_parsed_matrix():
+    parser = PlotSpeciesParser()
+    for row in [("物种名称", "1-1"), ("CAR001 Carex", 2), ("Carex", 3), ("A1 白茅", 1), ("白茅", 4)]:
+        parser.feed(row)
+    assert sorted(parser.to_matrix().species) == sorted(["CAR001 Carex", "Carex", "A1 白茅", "白茅"])
+
+
+def test_default_table_cells_match_legacy():
+    cells = ["狗尾草 12", "白茅", "针茅 3 5", "A1"]
+    assert [DEFAULT_NAMES.table_cell(cell) for cell in cells] == [legacy_table_name(cell) for cell in cells]
+
+    # 去掉名称后的数量，但不拆分代码
+    df = pd.DataFrame([["物种", "1-1", "1-2"], ["狗尾草 12", 1, 2], ["A1 白茅", 3, None]])
+    table, = read_quadrat_tables(df).values()
+    assert [table['species_names'][code] for code in table['species']] == ["狗尾草", "A1 白茅"]
+
+
+def test_synonym_table_merges_spellings_and_codes():
+    names = SpeciesNames({"carex tristachya": "Carex tristachya", "car001": "Carex tristachya",
+                          "carex tristachya thunb": "Carex tristachya"})
+    for cell in ["Carex  tristachya", "CAR001 Carex", "car001 anything", "Carex tristachya Thunb.",
+                 "ＣＡＲＥＸ tristachya"]:
+        assert names.canonical(cell) == "Carex tristachya", cell
+    assert names.canonical("A1 白茅") == "白茅"
+    assert names.table_cell("CAR001 Carex 12") == "Carex tristachya"
+    assert names.fingerprint and not DEFAULT_NAMES.fingerprint
+
+
+def test_pickle_keeps_synonyms():
+    names = SpeciesNames({"car001": "Carex tristachya"})
+    restored = pickle.loads(pickle.dumps(names))
+    assert restored.synonyms == names.synonyms and restored.fingerprint == names.fingerprint
+    assert restored.canonical("CAR001 Carex") == "Carex tristachya"
+
+
+def test_load_table(tmp_path):
+    path = tmp_path / 'synonyms.csv'
+    path.write_text("接受名,同义名,代码\nCarex tristachya,Carex tristachya Thunb.,CAR001\n白茅,Imperata cylindrica,1001\n",
+                    encoding='utf-8')
+    names = SpeciesNames.load(str(path))
+    assert names.canonical("CAR001 大披针薹草") == "Carex tristachya"
+    assert names.canonical("1001 茅草") == "白茅"
+    assert names.canonical("imperata cylindrica") == "白茅"
+
+
+def test_load_conflicting_table(tmp_path):
+    path = tmp_path / 'synonyms.tsv'
+    path.write_text("Carex tristachya\tCARTRI\nCarex lanceolata\tCARTRI\n", encoding='utf-8')
+    with pytest.raises(DataFormatError):
+        SpeciesNames.load(str(path))
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""矩阵输出：流式写出与经 DataFrame 写出的结果一致，.csv 扩展名写出 CSV"""
+import pandas as pd
+
+from plant_matrix.plots import build_species_plot_matrix
+from plant_matrix.sparse import SpeciesPlotMatrix
+from plant_matrix.tables import merge_tables_sparse, read_quadrat_tables, read_sheet
+from plant_matrix.writers import write_quadrat_matrix, write_species_plot_matrix
+
+
+def test_streaming_quadrat_matrix_matches_dataframe(tables_workbook, tmp_path, monkeypatch):
+    matrix = merge_tables_sparse(read_quadrat_tables(read_sheet(tables_workbook)))
+    write_quadrat_matrix(matrix, str(tmp_path / 'full.xlsx'))
+
+    # 流式写出不生成稠密 DataFrame
+    def dense(self):
+        raise AssertionError("流式写出时生成了稠密 DataFrame")
+    monkeypatch.setattr(SpeciesPlotMatrix, 'to_dataframe', dense)
+    write_quadrat_matrix(matrix, str(tmp_path / 'streaming.xlsx'), streaming=True)
+
+    expected = pd.read_excel(tmp_path / 'full.xlsx', header=None)
+    actual = pd.read_excel(tmp_path / 'streaming.xlsx', header=None)
+    pd.testing.assert_frame_equal(expected, actual)
+
+
+def test_csv_extension_writes_csv(blocks_workbook, tables_workbook, tmp_path):
+    for matrix, write in ((build_species_plot_matrix(blocks_workbook), write_species_plot_matrix),
+                          (merge_tables_sparse(read_quadrat_tables(read_sheet(tables_workbook))), write_quadrat_matrix)):
+        path = tmp_path / 'matrix.csv'
+        write(matrix, str(path))
+        df = pd.read_csv(path, encoding='utf-8-sig', dtype={'物种': str})
+        assert list(df.columns) == [str(column) for column in matrix.header()]
+        assert df['物种'].tolist() == matrix.species
+        assert df.iloc[:, 1:].to_numpy().sum() == matrix.values.sum()